@@ -0,0 +1,197 @@
+"""
+Benchmark: latency of the hot read endpoints under concurrent clients,
+served from the threadpool (sync get_db) vs on the event loop (async get_async_db)
+
+Populates a temporary SQLite database file (performance profile) with one
+event, --players ATIVO players and --matches finished matches, then has
+--clients concurrent clients each send --requests GETs, cycling through:
+
+- GET /events/{id}
+- GET /players?event_id=
+- GET /matches?event_id=&limit=50&order=desc
+- GET /ranking?event_id=&limit=50
+
+"sync" serves them with the former sync handlers (one threadpool worker per
+request, default anyio limit of 40 threads); "async" with the routers' async
+handlers. Requests go through the ASGI stack in-process (httpx ASGITransport),
+so the numbers exclude the network but include FastAPI and serialization.
+Prints requests per second and the latency percentiles of the successful
+requests; failed ones (e.g. a connection pool timeout) are counted as errors.
+
+Usage (from backend/):
+    python benchmarks/bench_async_reads.py
+    python benchmarks/bench_async_reads.py --clients 500 --requests 4 --modes sync async
+    python benchmarks/bench_async_reads.py --modes sync --pool-size 600
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx  # noqa: E402
+from bench_sqlite_profile import populate  # noqa: E402
+from fastapi import Depends, FastAPI, HTTPException, Query, Response  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+import database  # noqa: E402
+from database import SQLITE_PROFILES, Base, configure_sqlite  # noqa: E402
+from models import Event, Match, Player  # noqa: E402
+from routers import events, matches, players, ranking  # noqa: E402
+from routers.matches import _match_page  # noqa: E402
+from routers.ranking import _get_ranking_page  # noqa: E402
+from schemas import EventRead, MatchOrderEnum, MatchRead, PlayerRead, RankingEntry, RankingSortEnum  # noqa: E402
+
+
+def sync_app(sessions) -> FastAPI:
+    """The hot reads as sync handlers on a sync session, as they were before the async stack"""
+    app = FastAPI()
+
+    def get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/events/{event_id}", response_model=EventRead)
+    def get_event(event_id: int, db: Session = Depends(get_db)):
+        event = db.query(Event).filter(Event.id == event_id).first()
+        if not event:
+            raise HTTPException(status_code=404, detail="Event not found")
+        return event
+
+    @app.get("/players", response_model=list[PlayerRead])
+    def list_players(event_id: int = Query(...), db: Session = Depends(get_db)):
+        if not db.query(Event).filter(Event.id == event_id).first():
+            raise HTTPException(status_code=404, detail="Event not found")
+        return db.query(Player).filter(Player.event_id == event_id, Player.active).all()
+
+    @app.get("/matches", response_model=list[MatchRead])
+    def list_matches(
+        response: Response,
+        event_id: int = Query(...),
+        limit: Optional[int] = Query(None),
+        order: MatchOrderEnum = Query(MatchOrderEnum.ASC),
+        db: Session = Depends(get_db),
+    ):
+        if not db.query(Event).filter(Event.id == event_id).first():
+            raise HTTPException(status_code=404, detail="Event not found")
+        return _match_page(db, response, [Match.event_id == event_id], None, limit, None, order)
+
+    @app.get("/ranking", response_model=list[RankingEntry])
+    def event_ranking(
+        response: Response,
+        event_id: int = Query(...),
+        limit: Optional[int] = Query(None),
+        db: Session = Depends(get_db),
+    ):
+        return _get_ranking_page(event_id, db, response, RankingSortEnum.WINS, limit, None, None)
+
+    return app
+
+
+def async_app(sessions) -> FastAPI:
+    """The routers' async handlers on the benchmark database"""
+    app = FastAPI()
+    for router in (events, players, matches, ranking):
+        app.include_router(router.router)
+
+    async def get_async_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[database.get_async_db] = get_async_db
+    return app
+
+
+async def run_clients(app, event_id, clients, requests):
+    """clients concurrent clients sending requests GETs each; returns latencies and errors"""
+    paths = [
+        f"/events/{event_id}",
+        f"/players?event_id={event_id}",
+        f"/matches?event_id={event_id}&limit=50&order=desc",
+        f"/ranking?event_id={event_id}&limit=50",
+    ]
+    latencies, errors = [], 0
+    start_gate = asyncio.Event()
+    limits = httpx.Limits(max_connections=None)
+
+    # Server errors (e.g. a connection pool timeout) are counted, not raised
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as http:
+        async def client(n):
+            nonlocal errors
+            await start_gate.wait()
+            for i in range(requests):
+                start = time.perf_counter()
+                response = await http.get(paths[(n + i) % len(paths)])
+                if response.status_code != 200:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        tasks = [asyncio.create_task(client(n)) for n in range(clients)]
+        started = time.perf_counter()
+        start_gate.set()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--matches", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=4, help="Requests per client")
+    parser.add_argument("--pool-size", type=int, default=50, help="Connection pool size of both engines")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        pragmas = SQLITE_PROFILES["performance"]
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False},
+                               pool_size=args.pool_size)
+        configure_sqlite(engine, pragmas)
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=args.pool_size)
+        configure_sqlite(async_engine.sync_engine, pragmas)
+        Base.metadata.create_all(bind=engine)
+        event_id, _ = populate(engine, args.players, args.matches)
+
+        apps = {
+            "sync": sync_app(sessionmaker(autoflush=False, bind=engine)),
+            "async": async_app(async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)),
+        }
+
+        async def run_all():
+            results = []
+            for mode in args.modes:
+                # Warm-up: open the pooled connections and the page cache
+                await run_clients(apps[mode], event_id, 50, 1)
+                results.append((mode, *await run_clients(apps[mode], event_id, args.clients, args.requests)))
+            await async_engine.dispose()
+            return results
+
+        results = asyncio.run(run_all())
+        engine.dispose()
+
+    print(f"{args.clients} clients x {args.requests} requests")
+    print(f"{'mode':>6} {'req/s':>8} {'p50 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10} {'errors':>7}")
+    for mode, latencies, errors, elapsed in results:
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(f"{mode:>6} {len(latencies) / elapsed:>8.0f} {quantiles[49] * 1000:>10.1f} "
+              f"{quantiles[98] * 1000:>10.1f} {max(latencies) * 1000:>10.1f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: scalar vs vectorized Elo functions
+
+Times calculate_win_probability and calculate_match_outcome called in a Python
+loop against their NumPy batch counterparts on the same random matches, and
+checks that both paths give identical results. Also times the event win matrix
+(every pair of --players players) both ways.
+
+Usage (from backend/):
+    python benchmarks/bench_elo.py
+    python benchmarks/bench_elo.py --sizes 1000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from functools import partial
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from elo import (  # noqa: E402
+    calculate_match_outcome,
+    calculate_match_outcome_batch,
+    calculate_win_probability,
+    calculate_win_probability_batch,
+    win_probability_matrix,
+)
+
+
+def timed(fn):
+    """Return (result, wall time in milliseconds)"""
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100_000, 1_000_000])
+    parser.add_argument("--players", type=int, nargs="+", default=[100, 500, 1000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'matches':>9} {'function':<24} {'scalar (ms)':>12} {'batch (ms)':>11} {'speedup':>8}")
+    for size in args.sizes:
+        p1_ratings = rng.uniform(800, 2600, size)
+        p2_ratings = rng.uniform(800, 2600, size)
+        p1_ids = np.arange(1, size + 1)
+        p2_ids = p1_ids + size
+        winners = np.where(rng.random(size) < 0.5, p1_ids, p2_ids)
+        p1_counts = rng.integers(0, 12, size)
+        p2_counts = rng.integers(0, 12, size)
+        # Scalar path gets plain Python values, as the endpoints do
+        rows = list(zip(p1_ratings.tolist(), p2_ratings.tolist(), winners.tolist(),
+                        p1_ids.tolist(), p2_ids.tolist(), p1_counts.tolist(), p2_counts.tolist()))
+
+        scalar_prob, scalar_ms = timed(lambda rows=rows: [calculate_win_probability(r[0], r[1]) for r in rows])
+        batch_prob, batch_ms = timed(partial(calculate_win_probability_batch, p1_ratings, p2_ratings))
+        assert np.array_equal(batch_prob[0], [p[0] for p in scalar_prob])
+        print(f"{size:>9} {'win_probability':<24} {scalar_ms:12.1f} {batch_ms:11.1f} {scalar_ms / batch_ms:7.0f}x")
+
+        scalar_out, scalar_ms = timed(lambda rows=rows: [
+            calculate_match_outcome(r[0], r[1], r[2], r[3], r[4],
+                                    player1_match_count=r[5], player2_match_count=r[6])
+            for r in rows
+        ])
+        batch_out, batch_ms = timed(partial(
+            calculate_match_outcome_batch, p1_ratings, p2_ratings, winners, p1_ids, p2_ids,
+            player1_match_counts=p1_counts, player2_match_counts=p2_counts
+        ))
+        for key in batch_out:
+            assert np.array_equal(batch_out[key], [o[key] for o in scalar_out]), key
+        print(f"{size:>9} {'match_outcome':<24} {scalar_ms:12.1f} {batch_ms:11.1f} {scalar_ms / batch_ms:7.0f}x")
+
+    print(f"\n{'players':>9} {'function':<24} {'scalar (ms)':>12} {'batch (ms)':>11} {'speedup':>8}")
+    for size in args.players:
+        ratings = rng.uniform(800, 2600, size)
+        values = ratings.tolist()
+        scalar_matrix, scalar_ms = timed(lambda values=values: [
+            [calculate_win_probability(a, b)[0] for b in values] for a in values
+        ])
+        batch_matrix, batch_ms = timed(partial(win_probability_matrix, ratings))
+        assert np.array_equal(batch_matrix, scalar_matrix)
+        print(f"{size:>9} {'win_probability_matrix':<24} {scalar_ms:12.1f} {batch_ms:11.1f} {scalar_ms / batch_ms:7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
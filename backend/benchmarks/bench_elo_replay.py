@@ -0,0 +1,102 @@
+"""
+Benchmark: chronological Elo replay of one event
+
+Populates a temporary SQLite database with one event, --players players and
+--matches finished matches, then times replay_event_ratings (read history,
+replay in memory, write ratings back and rating checkpoints), and compares
+point-in-time rankings (?as_of=, served from checkpoints) with current ones.
+
+Usage (from backend/):
+    python benchmarks/bench_elo_replay.py
+    python benchmarks/bench_elo_replay.py --players 2000 --matches 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database import Base  # noqa: E402
+from models import Event, Match, Player  # noqa: E402
+from routers.ranking import _get_ranking_as_of, _get_ranking_data  # noqa: E402
+from utils.elo_replay import replay_event_ratings  # noqa: E402
+
+
+def populate(engine, num_players, num_matches):
+    """Create one event with random finished matches between its players"""
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        event_id = conn.execute(
+            insert(Event).values(name="Bench", date="2025-01-01", time="19:00")
+        ).inserted_primary_key[0]
+        conn.execute(insert(Player), [
+            {"name": f"Player {i}", "event_id": event_id, "elo_rating": 1200.0, "score": 0,
+             "ranking": 0, "active": True}
+            for i in range(num_players)
+        ])
+        ids = [row[0] for row in conn.exec_driver_sql(
+            "SELECT id FROM players WHERE event_id = ?", (event_id,))]
+        matches = []
+        start = datetime(2025, 1, 1, 19, 0)
+        for i in range(num_matches):
+            p1, p2 = rng.sample(ids, 2)
+            matches.append({
+                "event_id": event_id, "player1_id": p1, "player2_id": p2,
+                "winner_id": rng.choice((p1, p2)), "finished": True, "best_of": 5,
+                "player1_games": 0, "player2_games": 0, "finished_at": start + timedelta(seconds=i),
+            })
+        conn.execute(insert(Match), matches)
+    return event_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--matches", type=int, default=1_000_000)
+    parser.add_argument("--as-of-samples", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        print(f"Populating {args.players} players / {args.matches} matches...")
+        event_id = populate(engine, args.players, args.matches)
+
+        session = sessionmaker(bind=engine)()
+        try:
+            start = time.perf_counter()
+            result = replay_event_ratings(session, event_id)
+            session.commit()
+            elapsed = time.perf_counter() - start
+            print(f"Replayed {result['matches_replayed']} matches for {result['players_updated']} players "
+                  f"in {elapsed:.2f}s ({result['matches_replayed'] / elapsed:,.0f} matches/s)")
+
+            start = time.perf_counter()
+            _get_ranking_data(event_id, session)
+            current_ms = (time.perf_counter() - start) * 1000
+            rng = random.Random(7)
+            match_ids = [row[0] for row in session.execute(
+                select(Match.id).where(Match.event_id == event_id)).all()]
+            as_of_ms = []
+            for match_id in rng.sample(match_ids, min(args.as_of_samples, len(match_ids))):
+                start = time.perf_counter()
+                _get_ranking_as_of(event_id, session, str(match_id))
+                as_of_ms.append((time.perf_counter() - start) * 1000)
+            as_of_ms.sort()
+            print(f"Current ranking: {current_ms:.1f} ms; as_of ranking: median "
+                  f"{as_of_ms[len(as_of_ms) // 2]:.1f} ms, max {as_of_ms[-1]:.1f} ms")
+        finally:
+            session.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: ranking latency (legacy N+1 queries vs current ranking read)
+
+Populates a temporary SQLite database with one event, N players and
+MATCHES_PER_PLAYER finished matches per player, builds player_event_stats,
+then times both ranking implementations.
+
+Usage (from backend/):
+    python benchmarks/bench_ranking.py
+    python benchmarks/bench_ranking.py --sizes 100 1000 10000 --legacy-max 1000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, func, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database import Base  # noqa: E402
+from models import Event, Match, Player  # noqa: E402
+from routers.ranking import _get_ranking_data  # noqa: E402
+from utils.player_stats import rebuild_player_stats  # noqa: E402
+
+MATCHES_PER_PLAYER = 5
+
+
+def legacy_ranking(event_id, db):
+    """Previous implementation: two COUNT queries per active player"""
+    players = db.query(Player).filter(Player.event_id == event_id, Player.active).all()
+    ranking_data = []
+    for player in players:
+        wins = db.query(func.count(Match.id)).filter(
+            Match.event_id == event_id,
+            Match.winner_id == player.id,
+            Match.finished
+        ).scalar() or 0
+        losses = db.query(func.count(Match.id)).filter(
+            Match.event_id == event_id,
+            ((Match.player1_id == player.id) | (Match.player2_id == player.id)),
+            Match.finished,
+            Match.winner_id != player.id
+        ).scalar() or 0
+        total = wins + losses
+        ranking_data.append((player.id, wins, losses, round(wins / total, 2) if total else 0.0))
+    ranking_data.sort(key=lambda x: (x[1], x[3]), reverse=True)
+    return ranking_data
+
+
+def populate(engine, num_players):
+    """Create one event with num_players players and random finished matches"""
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        event_id = conn.execute(
+            insert(Event).values(name="Bench", date="2025-01-01", time="19:00")
+        ).inserted_primary_key[0]
+        conn.execute(insert(Player), [
+            {"name": f"Player {i}", "event_id": event_id, "elo_rating": 1200.0, "score": 0,
+             "ranking": 0, "active": True}
+            for i in range(num_players)
+        ])
+        ids = [row[0] for row in conn.exec_driver_sql(
+            "SELECT id FROM players WHERE event_id = ?", (event_id,))]
+        matches = []
+        for _ in range(num_players * MATCHES_PER_PLAYER // 2):
+            p1, p2 = rng.sample(ids, 2)
+            matches.append({
+                "event_id": event_id, "player1_id": p1, "player2_id": p2,
+                "winner_id": rng.choice((p1, p2)), "finished": True, "best_of": 5,
+                "player1_games": 0, "player2_games": 0,
+            })
+        conn.execute(insert(Match), matches)
+    return event_id
+
+
+def timed(fn, repeat):
+    """Return the best wall time of `repeat` runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--legacy-max", type=int, default=1000,
+                        help="skip the legacy implementation above this many players")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'players':>8} {'matches':>8} {'legacy (ms)':>12} {'current (ms)':>16}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            Base.metadata.create_all(bind=engine)
+            event_id = populate(engine, size)
+            session = sessionmaker(bind=engine)()
+            rebuild_player_stats(session, event_id)
+            session.commit()
+            try:
+                new_ms = timed(
+                    lambda event_id=event_id, session=session: _get_ranking_data(event_id, session)[0], args.repeat
+                )
+                if size <= args.legacy_max:
+                    legacy_ms = timed(
+                        lambda event_id=event_id, session=session: legacy_ranking(event_id, session), args.repeat
+                    )
+                    legacy = f"{legacy_ms:12.1f}"
+                else:
+                    legacy = f"{'skipped':>12}"
+            finally:
+                session.close()
+                engine.dispose()
+        print(f"{size:>8} {size * MATCHES_PER_PLAYER // 2:>8} {legacy} {new_ms:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Benchmark: POST /matches latency under concurrent load (legacy vs current)
+
+Populates a temporary SQLite database with one event and --players ATIVO
+players, then reports match results from --threads concurrent workers, each
+with its own session (as the API does per request), calling either the
+previous register_match implementation (separate event, player and membership
+queries, commit then refresh) or the current one (one joined validation query
+and INSERT ... RETURNING). Prints latency percentiles and throughput.
+
+Usage (from backend/):
+    python benchmarks/bench_register_match.py
+    python benchmarks/bench_register_match.py --threads 1 4 16 --requests 500
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database import Base  # noqa: E402
+from models import Event, Match, Membership, MembershipStatus, Player  # noqa: E402
+from routers.matches import _apply_elo_result, register_match  # noqa: E402
+from schemas import MatchCreate  # noqa: E402
+from utils.concurrency import retry_on_conflict  # noqa: E402
+from utils.player_stats import apply_match_stats  # noqa: E402
+
+
+def legacy_validate_player_can_play(player_id, event_id, db):
+    """Previous membership check: one query per player"""
+    membership = db.query(Membership).filter(
+        Membership.player_id == player_id,
+        Membership.event_id == event_id
+    ).first()
+    if not membership or membership.status != MembershipStatus.ATIVO:
+        raise HTTPException(status_code=403, detail="Player can't play")
+
+
+def legacy_register_match(match_data, db):
+    """
+    Previous implementation: five validation queries, ORM insert, commit then
+    refresh. Players now carry a version, so it is retried on conflicts like
+    the endpoint is.
+    """
+    match = retry_on_conflict(db, lambda: _legacy_register_match(match_data, db))
+    db.refresh(match)
+    return match
+
+
+def _legacy_register_match(match_data, db):
+    event = db.query(Event).filter(Event.id == match_data.event_id).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    player1 = db.query(Player).filter(
+        Player.id == match_data.player1_id, Player.event_id == match_data.event_id, Player.active
+    ).first()
+    player2 = db.query(Player).filter(
+        Player.id == match_data.player2_id, Player.event_id == match_data.event_id, Player.active
+    ).first()
+    if not player1 or not player2:
+        raise HTTPException(status_code=400, detail="Player not found in event")
+    legacy_validate_player_can_play(player1.id, match_data.event_id, db)
+    legacy_validate_player_can_play(player2.id, match_data.event_id, db)
+
+    match = Match(
+        event_id=match_data.event_id,
+        player1_id=match_data.player1_id,
+        player2_id=match_data.player2_id,
+        player1_games=match_data.player1_games or 0,
+        player2_games=match_data.player2_games or 0,
+        games_score=match_data.games_score,
+        winner_id=match_data.winner_id,
+        best_of=match_data.best_of,
+        finished=(match_data.winner_id is not None),
+        finished_at=datetime.now(timezone.utc) if match_data.winner_id is not None else None
+    )
+    db.add(match)
+    if match_data.winner_id is not None:
+        _apply_elo_result(db, match, player1, player2, match_data.winner_id)
+        apply_match_stats(db, match)
+    return match
+
+
+IMPLEMENTATIONS = {"legacy": legacy_register_match, "current": register_match}
+
+
+def populate(engine, num_players):
+    """Create one event with num_players ATIVO players"""
+    with engine.begin() as conn:
+        event_id = conn.execute(
+            insert(Event).values(name="Bench", date="2025-01-01", time="19:00")
+        ).inserted_primary_key[0]
+        conn.execute(insert(Player), [
+            {"name": f"Player {i}", "event_id": event_id, "elo_rating": 1200.0, "score": 0,
+             "ranking": 1, "active": True}
+            for i in range(num_players)
+        ])
+        ids = [row[0] for row in conn.exec_driver_sql(
+            "SELECT id FROM players WHERE event_id = ?", (event_id,))]
+        conn.execute(insert(Membership), [
+            {"event_id": event_id, "player_id": player_id, "status": MembershipStatus.ATIVO}
+            for player_id in ids
+        ])
+    return event_id, ids
+
+
+def run(implementation, num_threads, num_requests, num_players, with_result):
+    """Report num_requests matches from num_threads workers on a fresh database"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            connect_args={"check_same_thread": False, "timeout": 60},
+            pool_size=num_threads,
+        )
+        Base.metadata.create_all(bind=engine)
+        event_id, ids = populate(engine, num_players)
+        sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        statements = 0
+        counter = threading.Lock()
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count(*args):
+            nonlocal statements
+            with counter:
+                statements += 1
+
+        rng = random.Random(42)
+        payloads = []
+        for _ in range(num_requests):
+            p1, p2 = rng.sample(ids, 2)
+            payloads.append(MatchCreate(
+                event_id=event_id, player1_id=p1, player2_id=p2,
+                winner_id=rng.choice((p1, p2)) if with_result else None,
+            ))
+
+        def report(payload):
+            db = sessions()
+            try:
+                start = time.perf_counter()
+                implementation(payload, db)
+                return time.perf_counter() - start
+            finally:
+                db.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=num_threads) as pool:
+            latencies = sorted(pool.map(report, payloads))
+        elapsed = time.perf_counter() - started
+        engine.dispose()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "p50": quantiles[49] * 1000,
+        "p99": quantiles[98] * 1000,
+        "throughput": num_requests / elapsed,
+        "statements": statements / num_requests,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--no-result", action="store_true", help="register matches without a winner")
+    args = parser.parse_args()
+
+    print(f"{'impl':>8} {'threads':>8} {'stmts/req':>10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'req/s':>8}")
+    for num_threads in args.threads:
+        for name, implementation in IMPLEMENTATIONS.items():
+            result = run(implementation, num_threads, args.requests, args.players, not args.no_result)
+            print(f"{name:>8} {num_threads:>8} {result['statements']:>10.1f} {result['p50']:>10.2f} "
+                  f"{result['p99']:>10.2f} {result['throughput']:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Benchmark: read/write throughput per SQLite profile (database.SQLITE_PROFILES)
+
+For each profile, populates a temporary SQLite database file with one event,
+--players ATIVO players and --matches finished matches, then runs for
+--seconds each:
+
+- write: --writers threads reporting match results (register_match)
+- read: --readers threads reading the ranking and the latest matches
+- mixed: --readers readers while one writer reports results
+
+Each worker has its own session, as the API does per request. Prints
+operations per second and latency percentiles.
+
+Usage (from backend/):
+    python benchmarks/bench_sqlite_profile.py
+    python benchmarks/bench_sqlite_profile.py --profiles default performance --readers 8 --seconds 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database import SQLITE_PROFILES, Base, configure_sqlite  # noqa: E402
+from models import Event, Match, Membership, MembershipStatus, Player  # noqa: E402
+from routers.matches import register_match  # noqa: E402
+from routers.ranking import _get_ranking_data  # noqa: E402
+from schemas import MatchCreate  # noqa: E402
+from utils.player_stats import rebuild_player_stats  # noqa: E402
+
+
+def populate(engine, num_players, num_matches):
+    """Create one event with num_players ATIVO players and num_matches finished matches"""
+    rng = random.Random(42)
+    with engine.begin() as conn:
+        event_id = conn.execute(
+            insert(Event).values(name="Bench", date="2025-01-01", time="19:00")
+        ).inserted_primary_key[0]
+        conn.execute(insert(Player), [
+            {"name": f"Player {i}", "event_id": event_id, "elo_rating": 1200.0, "score": 0,
+             "ranking": 0, "active": True, "version": 1}
+            for i in range(num_players)
+        ])
+        ids = [row[0] for row in conn.exec_driver_sql(
+            "SELECT id FROM players WHERE event_id = ?", (event_id,))]
+        conn.execute(insert(Membership), [
+            {"event_id": event_id, "player_id": player_id, "status": MembershipStatus.ATIVO}
+            for player_id in ids
+        ])
+        matches = []
+        for _ in range(num_matches):
+            p1, p2 = rng.sample(ids, 2)
+            matches.append({
+                "event_id": event_id, "player1_id": p1, "player2_id": p2,
+                "winner_id": rng.choice((p1, p2)), "finished": True, "best_of": 5,
+                "player1_games": 0, "player2_games": 0,
+            })
+        conn.execute(insert(Match), matches)
+    with sessionmaker(bind=engine)() as session:
+        rebuild_player_stats(session, event_id)
+        session.commit()
+    return event_id, ids
+
+
+def write_once(sessions, event_id, ids, rng):
+    p1, p2 = rng.sample(ids, 2)
+    with sessions() as db:
+        register_match(MatchCreate(event_id=event_id, player1_id=p1, player2_id=p2, winner_id=p1), db)
+
+
+def read_once(sessions, event_id):
+    with sessions() as db:
+        _get_ranking_data(event_id, db)
+        db.scalars(select(Match).where(Match.event_id == event_id).order_by(Match.id.desc()).limit(50)).all()
+
+
+def run_workers(workers, seconds):
+    """Run (kind, operation) workers until the deadline; returns latencies and errors by kind"""
+    deadline = time.perf_counter() + seconds
+    latencies = {kind: [] for kind, _ in workers}
+    errors = {kind: 0 for kind, _ in workers}
+    lock = threading.Lock()
+
+    def loop(kind, operation):
+        mine, failed = [], 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                operation()
+            except Exception:
+                failed += 1
+                continue
+            mine.append(time.perf_counter() - start)
+        with lock:
+            latencies[kind].extend(mine)
+            errors[kind] += failed
+
+    threads = [threading.Thread(target=loop, args=worker) for worker in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def summarize(latencies, seconds):
+    if len(latencies) < 2:
+        return len(latencies) / seconds, float("nan"), float("nan")
+    quantiles = statistics.quantiles(latencies, n=100)
+    return len(latencies) / seconds, quantiles[49] * 1000, quantiles[98] * 1000
+
+
+def run_profile(profile, args):
+    """All workloads on a fresh database with the profile's PRAGMAs"""
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            connect_args={"check_same_thread": False},
+            pool_size=max(args.writers, args.readers) + 1,
+        )
+        configure_sqlite(engine, SQLITE_PROFILES[profile])
+        Base.metadata.create_all(bind=engine)
+        event_id, ids = populate(engine, args.players, args.matches)
+        sessions = sessionmaker(autoflush=False, bind=engine)
+
+        def writer(seed):
+            rng = random.Random(seed)
+            return ("write", lambda: write_once(sessions, event_id, ids, rng))
+
+        reader = ("read", lambda: read_once(sessions, event_id))
+        workloads = {
+            "write": [writer(n) for n in range(args.writers)],
+            "read": [reader] * args.readers,
+            "mixed": [reader] * args.readers + [writer(0)],
+        }
+        for name, workers in workloads.items():
+            latencies, errors = run_workers(workers, args.seconds)
+            for kind in sorted(latencies):
+                results.append((name, kind, *summarize(latencies[kind], args.seconds), errors[kind]))
+        engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="+", default=list(SQLITE_PROFILES), choices=list(SQLITE_PROFILES))
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--matches", type=int, default=20000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+
+    print(f"{'profile':>12} {'workload':>9} {'ops':>6} {'ops/s':>8} {'p50 (ms)':>10} {'p99 (ms)':>10} {'errors':>7}")
+    for profile in args.profiles:
+        for workload, kind, throughput, p50, p99, errors in run_profile(profile, args):
+            print(f"{profile:>12} {workload:>9} {kind:>6} {throughput:>8.0f} {p50:>10.2f} {p99:>10.2f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
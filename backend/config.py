@@ -2,6 +2,8 @@
 Configuração centralizada do aplicativo Ping Champions
 """
 
+import os
+
 # Limites de requisição
 MAX_REQUEST_BODY_SIZE = 100 * 1024 * 1024  # 100MB (padrão é ~2.5MB)
 MAX_UPLOAD_SIZE = 100 * 1024 * 1024  # 100MB para uploads
@@ -22,5 +24,21 @@ HOST = "127.0.0.1"
 PORT = 8000
 RELOAD = False
 
+# Fila de resultados (POST /matches/queue): um único escritor aplica os resultados em lotes
+MATCH_QUEUE_BATCH_SIZE = int(os.getenv("MATCH_QUEUE_BATCH_SIZE", "100"))  # resultados por transação
+MATCH_QUEUE_BATCH_WAIT = float(os.getenv("MATCH_QUEUE_BATCH_WAIT", "0.01"))  # segundos esperando completar um lote
+MATCH_QUEUE_MAX_DEPTH = int(os.getenv("MATCH_QUEUE_MAX_DEPTH", "10000"))  # acima disso: 503
+MATCH_QUEUE_TICKET_RETENTION = 10000  # tickets finalizados mantidos para consulta
+
+# Stream de atividade (GET /events/{id}/stream)
+EVENT_STREAM_KEEPALIVE = float(os.getenv("EVENT_STREAM_KEEPALIVE", "15"))  # segundos entre comentários keep-alive
+
+# Placar ao vivo (WS /matches/{id}/live): só conexões de árbitro (?role=umpire) marcam pontos
+LIVE_UMPIRE_TOKEN = os.getenv("LIVE_UMPIRE_TOKEN", "")  # se definido, o árbitro envia ?token=<valor>
+
+# Idempotency-Key: respostas guardadas para reenvios do mesmo pedido
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", str(24 * 60 * 60)))  # segundos
+IDEMPOTENCY_EVICT_INTERVAL = 60  # segundos entre limpezas das chaves expiradas
+
 # Outras configurações
 DEBUG = True
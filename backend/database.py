@@ -1,12 +1,100 @@
+
+
 import os
 
-from sqlalchemy import create_engine
-from sqlalchemy import orm
+from fastapi import Request
+from sqlalchemy import create_engine, event, orm
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'pingchampions.db')}"
+# Same database through aiosqlite, for the async read endpoints
+ASYNC_DATABASE_URL = f"sqlite+aiosqlite:///{os.path.join(BASE_DIR, 'pingchampions.db')}"
+
+# PRAGMAs applied to every new SQLite connection, by profile (SQLITE_PROFILE)
+SQLITE_PROFILES = {
+    # SQLite's own defaults: rollback journal, synchronous=FULL, no busy timeout
+    "default": {},
+    # WAL lets readers run during a write; synchronous=NORMAL is safe in WAL
+    # mode (a power loss can only lose the last commits, never corrupt the file)
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,  # ms to wait for the write lock instead of failing with "database is locked"
+        "cache_size": -65536,  # negative: KiB (64 MiB page cache per connection)
+        "mmap_size": 268435456,  # 256 MiB of the file read through memory mapping
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+}
+
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance")
+
+
+def sqlite_pragmas(profile: str = SQLITE_PROFILE) -> dict:
+    """PRAGMAs of a profile; SQLITE_<PRAGMA> environment variables override single values"""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile {profile!r} (expected one of {', '.join(SQLITE_PROFILES)})")
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for name in pragmas:
+        override = os.getenv(f"SQLITE_{name.upper()}")
+        if override is not None:
+            pragmas[name] = override
+    return pragmas
+
+
+def configure_sqlite(engine, pragmas: dict) -> None:
+    """Apply the PRAGMAs to each connection the engine opens (for an AsyncEngine, pass its sync_engine)"""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
 
+
+# Methods served by the read-only pool
+READ_METHODS = ("GET", "HEAD")
+
+# Write pool
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+configure_sqlite(engine, sqlite_pragmas())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Read pool: its own connections, so a long read (ranking, export) never holds
+# one that a write needs; query_only turns an accidental write into an error.
+# In WAL mode these reads run while a match result is being written.
+read_engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+configure_sqlite(read_engine, {**sqlite_pragmas(), "query_only": "ON"})
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Async endpoints await their queries on the event loop instead of taking a threadpool worker
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+configure_sqlite(async_engine.sync_engine, sqlite_pragmas())
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+async_read_engine = create_async_engine(ASYNC_DATABASE_URL)
+configure_sqlite(async_read_engine.sync_engine, {**sqlite_pragmas(), "query_only": "ON"})
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
 Base = orm.declarative_base()
+
+
+def get_db(request: Request):
+    """Session of a request: GET/HEAD on the read-only pool, other methods on the write pool"""
+    db = (ReadSessionLocal if request.method in READ_METHODS else SessionLocal)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db(request: Request):
+    """Async session of a request, routed like get_db"""
+    async with (AsyncReadSessionLocal if request.method in READ_METHODS else AsyncSessionLocal)() as db:
+        yield db
@@ -9,6 +9,8 @@ Reference: https://en.wikipedia.org/wiki/Elo_rating_system
 
 import math
 
+import numpy as np
+
 # Standard Elo parameters
 K_FACTOR = 32  # Controls the maximum rating change per game (default, per-player adjusted in get_k_factor)
 INITIAL_RATING = 1200  # Initial rating for new players (from REFINAMENTO_FEATURE_1.md)
@@ -268,3 +270,153 @@ def calculate_match_outcome(
         'player2_k_factor': k_factor_p2
     }
 
+
+# ============ Batch (vectorized) API ============
+#
+# NumPy versions of the functions above, for bulk recomputes, simulations and
+# imports. Each element is computed with the same float64 operations as the
+# scalar path, so results are identical to calling the scalar functions in a loop.
+# np.float_power is used rather than np.power: the SIMD implementation of
+# np.power may differ from math.pow in the last bit. Rating changes are rounded
+# with _round_change, since np.round and round() disagree on some halves.
+
+
+def _round_change(changes: np.ndarray) -> np.ndarray:
+    """
+    round(change, 1) for every element.
+
+    np.round(x, 1) computes rint(x * 10) / 10: near a half (0.35 is stored as
+    0.34999...) the scaling can round up where round() rounds down. Those few
+    elements are rounded with round() itself.
+    """
+    rounded = np.round(changes, 1)
+    scaled = changes * 10
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for index in np.flatnonzero(near_half):
+        rounded.flat[index] = round(float(changes.flat[index]), 1)
+    return rounded
+
+
+def calculate_win_probability_batch(ratings_a, ratings_b) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized calculate_win_probability.
+
+    Args:
+        ratings_a: Array of player A ratings
+        ratings_b: Array of player B ratings (broadcastable against ratings_a)
+
+    Returns:
+        Tuple of arrays (probability_a_wins, probability_b_wins)
+
+    Examples:
+        >>> prob_a, prob_b = calculate_win_probability_batch([1600, 1700], [1600, 1600])
+        >>> bool(abs(prob_a[0] - 0.5) < 0.001)
+        True
+    """
+    rating_diff = np.asarray(ratings_b, dtype=np.float64) - np.asarray(ratings_a, dtype=np.float64)
+    expected_a = 1 / (1 + np.float_power(10.0, rating_diff / RATING_MULTIPLIER))
+    expected_b = 1 - expected_a
+
+    return expected_a, expected_b
+
+
+def get_k_factor_batch(ratings, match_counts=0) -> np.ndarray:
+    """
+    Vectorized get_k_factor.
+
+    Args:
+        ratings: Array of current ratings
+        match_counts: Array (or scalar) of matches played
+
+    Returns:
+        Array of K-factors (int)
+    """
+    ratings = np.asarray(ratings, dtype=np.float64)
+    match_counts = np.asarray(match_counts)
+    return np.where(match_counts < 5, 32, np.where(ratings >= 2200, 16, 24))
+
+
+def calculate_match_outcome_batch(
+    player1_ratings,
+    player2_ratings,
+    winner_ids,
+    player1_ids,
+    player2_ids,
+    k_factor: int = None,
+    player1_match_counts=0,
+    player2_match_counts=0
+) -> dict:
+    """
+    Vectorized calculate_match_outcome: one element per (independent) match.
+
+    Every match is computed from the ratings given, so this is for matches that
+    don't depend on each other (e.g. one round, or what-if simulations). A
+    chronological history must be applied in order (see utils.elo_replay).
+
+    Args:
+        player1_ratings: Array of player 1 ratings before each match
+        player2_ratings: Array of player 2 ratings before each match
+        winner_ids: Array of winning player IDs
+        player1_ids: Array of player 1 IDs
+        player2_ids: Array of player 2 IDs
+        k_factor: K-factor (if None, calculated dynamically per player)
+        player1_match_counts: Array (or scalar) of matches player 1 played
+        player2_match_counts: Array (or scalar) of matches player 2 played
+
+    Returns:
+        Dictionary of arrays with the same keys as calculate_match_outcome:
+            - player1_new_rating, player2_new_rating
+            - player1_change, player2_change (rounded to 1 decimal)
+            - player1_k_factor, player2_k_factor
+    """
+    player1_ratings = np.asarray(player1_ratings, dtype=np.float64)
+    player2_ratings = np.asarray(player2_ratings, dtype=np.float64)
+    winner_ids = np.asarray(winner_ids)
+
+    # Calculate K-factors if not provided
+    if k_factor is None:
+        k_factor_p1 = get_k_factor_batch(player1_ratings, player1_match_counts)
+        k_factor_p2 = get_k_factor_batch(player2_ratings, player2_match_counts)
+        # Use player1's k_factor for consistency (same as the scalar path)
+        k_factor_to_use = k_factor_p1
+    else:
+        k_factor_p1 = np.full(player1_ratings.shape, k_factor)
+        k_factor_p2 = np.full(player2_ratings.shape, k_factor)
+        k_factor_to_use = k_factor_p1
+
+    expected_p1, expected_p2 = calculate_win_probability_batch(player1_ratings, player2_ratings)
+    p1_result = (winner_ids == np.asarray(player1_ids)).astype(np.int64)
+    p2_result = (winner_ids == np.asarray(player2_ids)).astype(np.int64)
+
+    new_rating_p1 = player1_ratings + k_factor_to_use * (p1_result - expected_p1)
+    new_rating_p2 = player2_ratings + k_factor_to_use * (p2_result - expected_p2)
+
+    return {
+        'player1_new_rating': new_rating_p1,
+        'player2_new_rating': new_rating_p2,
+        'player1_change': _round_change(new_rating_p1 - player1_ratings),
+        'player2_change': _round_change(new_rating_p2 - player2_ratings),
+        'player1_k_factor': k_factor_p1,
+        'player2_k_factor': k_factor_p2
+    }
+
+
+def win_probability_matrix(ratings) -> np.ndarray:
+    """
+    Pairwise win probabilities for a vector of ratings, as one outer operation.
+
+    Args:
+        ratings: Array of N ratings
+
+    Returns:
+        N x N array where entry [i, j] is calculate_win_probability(ratings[i], ratings[j])[0]
+        (0.5 on the diagonal)
+
+    Examples:
+        >>> matrix = win_probability_matrix([1600, 1700])
+        >>> bool(matrix[1, 0] > 0.5) and bool(abs(matrix[0, 1] + matrix[1, 0] - 1) < 1e-12)
+        True
+    """
+    ratings = np.asarray(ratings, dtype=np.float64)
+    expected, _ = calculate_win_probability_batch(ratings[:, np.newaxis], ratings[np.newaxis, :])
+    return expected
@@ -1,13 +1,27 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from database import Base, engine
-from routers import events, matches, players, ranking, i18n, membership, tournament
+from routers import events, i18n, matches, membership, players, ranking, tournament
+from utils.idempotency import IdempotencyMiddleware, IdempotentReplayError, replay_response
 
 # Cria as tabelas no banco de dados
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Apply the match results still waiting in the write-behind queue
+    matches.match_queue.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Respostas guardadas para pedidos com Idempotency-Key
+app.add_middleware(IdempotencyMiddleware)
+app.add_exception_handler(IdempotentReplayError, replay_response)
 
 # Adiciona o middleware de CORS
 app.add_middleware(
@@ -20,6 +34,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
 
 # Inclui as rotas
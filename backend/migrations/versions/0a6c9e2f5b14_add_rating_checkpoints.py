@@ -0,0 +1,45 @@
+"""Add rating_checkpoints for point-in-time rankings
+
+Revision ID: 0a6c9e2f5b14
+Revises: f1b7d3e9a824
+Create Date: 2026-10-18 15:20:44.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6c9e2f5b14'
+down_revision: Union[str, Sequence[str], None] = 'f1b7d3e9a824'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Add replay checkpoints and the chronological match index."""
+    op.create_table(
+        'rating_checkpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('match_count', sa.Integer(), nullable=False),
+        sa.Column('last_finished_at', sa.DateTime(), nullable=True),
+        sa.Column('last_match_id', sa.Integer(), nullable=False),
+        sa.Column('state', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('event_id', 'match_count', name='uq_rating_checkpoints_event_count'),
+    )
+    op.create_index('ix_rating_checkpoints_event_key', 'rating_checkpoints',
+                    ['event_id', 'last_finished_at', 'last_match_id'])
+    # Checkpoints are created lazily (by replays and as_of queries): nothing to backfill
+    op.create_index('ix_matches_event_finished_at', 'matches', ['event_id', 'finished_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema - Remove replay checkpoints."""
+    op.drop_index('ix_matches_event_finished_at', table_name='matches')
+    op.drop_index('ix_rating_checkpoints_event_key', table_name='rating_checkpoints')
+    op.drop_table('rating_checkpoints')
@@ -0,0 +1,32 @@
+"""Add match listing indexes for keyset pagination
+
+Revision ID: 3e7b1d9c4f62
+Revises: 0a6c9e2f5b14
+Create Date: 2026-10-18 16:05:12.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3e7b1d9c4f62'
+down_revision: Union[str, Sequence[str], None] = '0a6c9e2f5b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Index the match listing filters (entries are in id order per key)."""
+    op.create_index('ix_matches_event_id', 'matches', ['event_id'], unique=False)
+    op.create_index('ix_matches_player1_id', 'matches', ['player1_id'], unique=False)
+    op.create_index('ix_matches_player2_id', 'matches', ['player2_id'], unique=False)
+    op.create_index('ix_matches_tournament_id', 'matches', ['tournament_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - Drop the match listing indexes."""
+    op.drop_index('ix_matches_tournament_id', table_name='matches')
+    op.drop_index('ix_matches_player2_id', table_name='matches')
+    op.drop_index('ix_matches_player1_id', table_name='matches')
+    op.drop_index('ix_matches_event_id', table_name='matches')
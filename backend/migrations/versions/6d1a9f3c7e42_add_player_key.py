@@ -0,0 +1,76 @@
+"""Add players.player_key, the cross-event identity of the global leaderboard
+
+Revision ID: 6d1a9f3c7e42
+Revises: 5b9e3d7f1a26
+Create Date: 2026-10-18 21:12:44.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '6d1a9f3c7e42'
+down_revision: Union[str, Sequence[str], None] = '5b9e3d7f1a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = ('wins', 'losses', 'games_won', 'games_lost', 'matches_played')
+
+
+def _normalize(name):
+    # same normalization as models.player.player_key
+    return " ".join(name.split()).casefold()
+
+
+def _rebuild_global_stats(key_column, active_only):
+    """Recompute global_player_stats from player_event_stats, grouped by key_column"""
+    bind = op.get_bind()
+    per_player = bind.execute(sa.text(
+        f"""
+        SELECT {key_column} AS player_key, p.name, s.wins, s.losses, s.games_won, s.games_lost, s.matches_played
+        FROM players p JOIN player_event_stats s ON s.player_id = p.id
+        WHERE s.matches_played > 0 {'AND p.active = 1' if active_only else ''}
+        ORDER BY p.id
+        """
+    )).mappings()
+    totals = {}
+    for row in per_player:
+        key = row['player_key'] if active_only else _normalize(row['name'])
+        entry = totals.setdefault(key, {'player_key': key, 'name': row['name'], 'win_rate': 0.0,
+                                        **{c: 0 for c in COUNTERS}})
+        for column in COUNTERS:
+            entry[column] += row[column]
+
+    table = sa.table('global_player_stats', sa.column('player_key'), sa.column('name'), sa.column('win_rate'),
+                     *(sa.column(c) for c in COUNTERS))
+    op.execute(table.delete())
+    if totals:
+        op.bulk_insert(table, list(totals.values()))
+        op.execute(sa.text(
+            """
+            UPDATE global_player_stats SET win_rate =
+                CASE WHEN wins + losses > 0 THEN round(wins * 1.0 / (wins + losses), 2) ELSE 0.0 END
+            """
+        ))
+
+
+def upgrade() -> None:
+    """Upgrade schema - Add players.player_key (backfilled from the names), count only active players globally."""
+    op.add_column('players', sa.Column('player_key', sa.String(length=100), nullable=False, server_default=''))
+    bind = op.get_bind()
+    players = bind.execute(sa.text("SELECT id, name FROM players")).all()
+    if players:
+        bind.execute(
+            sa.text("UPDATE players SET player_key = :player_key WHERE id = :id"),
+            [{'id': player_id, 'player_key': _normalize(name)} for player_id, name in players],
+        )
+    _rebuild_global_stats('p.player_key', active_only=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema - Remove players.player_key, group the global totals by name again."""
+    _rebuild_global_stats('p.name', active_only=False)
+    with op.batch_alter_table('players') as batch_op:
+        batch_op.drop_column('player_key')
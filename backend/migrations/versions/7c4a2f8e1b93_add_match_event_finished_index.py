@@ -0,0 +1,26 @@
+"""Add composite (event_id, finished) index on matches
+
+Revision ID: 7c4a2f8e1b93
+Revises: 3e7b1d9c4f62
+Create Date: 2026-10-18 16:40:31.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4a2f8e1b93'
+down_revision: Union[str, Sequence[str], None] = '3e7b1d9c4f62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Index an event's finished (or pending) matches."""
+    op.create_index('ix_matches_event_finished', 'matches', ['event_id', 'finished'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema - Drop the (event_id, finished) index."""
+    op.drop_index('ix_matches_event_finished', table_name='matches')
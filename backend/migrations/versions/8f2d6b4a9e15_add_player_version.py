@@ -0,0 +1,28 @@
+"""Add players.version for optimistic concurrency
+
+Revision ID: 8f2d6b4a9e15
+Revises: 7c4a2f8e1b93
+Create Date: 2026-10-18 17:12:48.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2d6b4a9e15'
+down_revision: Union[str, Sequence[str], None] = '7c4a2f8e1b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Add the player version counter (existing players start at 1)."""
+    op.add_column('players', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    """Downgrade schema - Remove the player version counter."""
+    with op.batch_alter_table('players') as batch_op:
+        batch_op.drop_column('version')
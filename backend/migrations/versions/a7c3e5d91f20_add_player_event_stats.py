@@ -0,0 +1,79 @@
+"""Add player_event_stats table and matches.finished_at
+
+Revision ID: a7c3e5d91f20
+Revises: 9c1f8e3a2b1c
+Create Date: 2026-10-18 09:12:41.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5d91f20'
+down_revision: Union[str, Sequence[str], None] = '9c1f8e3a2b1c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Add materialized per-event player statistics."""
+    op.add_column('matches', sa.Column('finished_at', sa.DateTime(), nullable=True))
+
+    op.create_table(
+        'player_event_stats',
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('losses', sa.Integer(), nullable=False),
+        sa.Column('win_rate', sa.Float(), nullable=False),
+        sa.Column('games_won', sa.Integer(), nullable=False),
+        sa.Column('games_lost', sa.Integer(), nullable=False),
+        sa.Column('matches_played', sa.Integer(), nullable=False),
+        sa.Column('last_played_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('player_id'),
+    )
+    op.create_index('ix_player_event_stats_event_id', 'player_event_stats', ['event_id'])
+
+    # Backfill from existing finished matches (same aggregation as rebuild_player_stats.py)
+    op.execute("""
+    INSERT INTO player_event_stats
+        (player_id, event_id, wins, losses, win_rate, games_won, games_lost, matches_played, last_played_at)
+    SELECT p.id, p.event_id,
+           COALESCE(t.wins, 0), COALESCE(t.losses, 0),
+           CASE WHEN COALESCE(t.wins, 0) + COALESCE(t.losses, 0) > 0
+                THEN ROUND(t.wins * 1.0 / (t.wins + t.losses), 2) ELSE 0.0 END,
+           COALESCE(t.games_won, 0), COALESCE(t.games_lost, 0),
+           COALESCE(t.matches_played, 0), t.last_played_at
+    FROM players p
+    LEFT JOIN (
+        SELECT player_id,
+               SUM(CASE WHEN winner_id = player_id THEN 1 ELSE 0 END) AS wins,
+               SUM(CASE WHEN winner_id != player_id THEN 1 ELSE 0 END) AS losses,
+               SUM(games_won) AS games_won,
+               SUM(games_lost) AS games_lost,
+               COUNT(*) AS matches_played,
+               MAX(finished_at) AS last_played_at
+        FROM (
+            SELECT player1_id AS player_id, winner_id, COALESCE(player1_games, 0) AS games_won,
+                   COALESCE(player2_games, 0) AS games_lost, finished_at
+            FROM matches WHERE finished AND winner_id IS NOT NULL
+            UNION ALL
+            SELECT player2_id, winner_id, COALESCE(player2_games, 0),
+                   COALESCE(player1_games, 0), finished_at
+            FROM matches WHERE finished AND winner_id IS NOT NULL
+        )
+        GROUP BY player_id
+    ) t ON t.player_id = p.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - Remove materialized per-event player statistics."""
+    op.drop_index('ix_player_event_stats_event_id', table_name='player_event_stats')
+    op.drop_table('player_event_stats')
+    with op.batch_alter_table('matches') as batch_op:
+        batch_op.drop_column('finished_at')
@@ -0,0 +1,46 @@
+"""Add rating_history ledger table
+
+Revision ID: b4e81f0c6a37
+Revises: a7c3e5d91f20
+Create Date: 2026-10-18 11:40:05.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e81f0c6a37'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e5d91f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Add append-only rating history ledger."""
+    op.create_table(
+        'rating_history',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('match_id', sa.Integer(), nullable=True),
+        sa.Column('reason', sa.String(length=10), nullable=False),
+        sa.Column('rating_before', sa.Float(), nullable=False),
+        sa.Column('rating_after', sa.Float(), nullable=False),
+        sa.Column('delta', sa.Float(), nullable=False),
+        sa.Column('k_factor', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_rating_history_id', 'rating_history', ['id'])
+    op.create_index('ix_rating_history_player_id_id', 'rating_history', ['player_id', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema - Remove rating history ledger."""
+    op.drop_index('ix_rating_history_player_id_id', table_name='rating_history')
+    op.drop_index('ix_rating_history_id', table_name='rating_history')
+    op.drop_table('rating_history')
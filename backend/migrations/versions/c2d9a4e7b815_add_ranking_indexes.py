@@ -0,0 +1,43 @@
+"""Add composite indexes for paginated rankings
+
+Revision ID: c2d9a4e7b815
+Revises: b4e81f0c6a37
+Create Date: 2026-10-18 12:25:40.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2d9a4e7b815'
+down_revision: Union[str, Sequence[str], None] = 'b4e81f0c6a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Index ranking sort orders, ensure every player has a stats row."""
+    op.create_index('ix_players_event_active_elo', 'players', ['event_id', 'active', 'elo_rating'])
+    op.drop_index('ix_player_event_stats_event_id', table_name='player_event_stats')
+    op.create_index('ix_player_event_stats_event_wins', 'player_event_stats', ['event_id', 'wins', 'win_rate'])
+    op.create_index('ix_player_event_stats_event_win_rate', 'player_event_stats', ['event_id', 'win_rate', 'wins'])
+
+    # Rankings inner-join the stats table: add zeroed rows for players created without one
+    op.execute(sa.text(
+        """
+        INSERT INTO player_event_stats
+            (player_id, event_id, wins, losses, win_rate, games_won, games_lost, matches_played)
+        SELECT id, event_id, 0, 0, 0.0, 0, 0, 0 FROM players
+        WHERE id NOT IN (SELECT player_id FROM player_event_stats)
+        """
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema - Restore the single event_id index."""
+    op.drop_index('ix_player_event_stats_event_win_rate', table_name='player_event_stats')
+    op.drop_index('ix_player_event_stats_event_wins', table_name='player_event_stats')
+    op.create_index('ix_player_event_stats_event_id', 'player_event_stats', ['event_id'])
+    op.drop_index('ix_players_event_active_elo', table_name='players')
@@ -0,0 +1,37 @@
+"""Backfill players.ranking with dense ranks by Elo rating
+
+Revision ID: d5f3b8a1c962
+Revises: c2d9a4e7b815
+Create Date: 2026-10-18 13:05:12.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f3b8a1c962'
+down_revision: Union[str, Sequence[str], None] = 'c2d9a4e7b815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Materialize ranking positions (maintained incrementally from now on)."""
+    op.execute(sa.text(
+        """
+        UPDATE players SET ranking = ranked.rank
+        FROM (
+            SELECT id, DENSE_RANK() OVER (PARTITION BY event_id ORDER BY elo_rating DESC) AS rank
+            FROM players WHERE active = 1
+        ) AS ranked
+        WHERE players.id = ranked.id
+        """
+    ))
+    op.execute(sa.text("UPDATE players SET ranking = 0 WHERE active IS NOT 1"))
+
+
+def downgrade() -> None:
+    """Downgrade schema - Nothing to undo (the column already existed)."""
+    pass
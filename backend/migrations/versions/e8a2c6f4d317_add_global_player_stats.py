@@ -0,0 +1,70 @@
+"""Add global_player_stats table for the cross-event leaderboard
+
+Revision ID: e8a2c6f4d317
+Revises: d5f3b8a1c962
+Create Date: 2026-10-18 13:48:27.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a2c6f4d317'
+down_revision: Union[str, Sequence[str], None] = 'd5f3b8a1c962'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = ('wins', 'losses', 'games_won', 'games_lost', 'matches_played')
+
+
+def upgrade() -> None:
+    """Upgrade schema - Add cross-event player statistics, backfilled from player_event_stats."""
+    table = op.create_table(
+        'global_player_stats',
+        sa.Column('player_key', sa.String(length=100), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('wins', sa.Integer(), nullable=False),
+        sa.Column('losses', sa.Integer(), nullable=False),
+        sa.Column('win_rate', sa.Float(), nullable=False),
+        sa.Column('games_won', sa.Integer(), nullable=False),
+        sa.Column('games_lost', sa.Integer(), nullable=False),
+        sa.Column('matches_played', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('player_key'),
+    )
+    op.create_index('ix_global_player_stats_wins', 'global_player_stats', ['wins', 'win_rate'])
+    op.create_index('ix_global_player_stats_win_rate', 'global_player_stats', ['win_rate', 'wins'])
+
+    # Group by normalized name in Python (SQLite's lower() only folds ASCII),
+    # same normalization as utils.player_stats.player_key
+    per_player = op.get_bind().execute(sa.text(
+        """
+        SELECT p.name, s.wins, s.losses, s.games_won, s.games_lost, s.matches_played
+        FROM players p JOIN player_event_stats s ON s.player_id = p.id
+        WHERE s.matches_played > 0
+        ORDER BY p.id
+        """
+    )).mappings()
+    totals = {}
+    for row in per_player:
+        key = " ".join(row['name'].split()).casefold()
+        entry = totals.setdefault(key, {'player_key': key, 'name': row['name'], 'win_rate': 0.0,
+                                        **{c: 0 for c in COUNTERS}})
+        for column in COUNTERS:
+            entry[column] += row[column]
+    if totals:
+        op.bulk_insert(table, list(totals.values()))
+        op.execute(sa.text(
+            """
+            UPDATE global_player_stats SET win_rate =
+                CASE WHEN wins + losses > 0 THEN round(wins * 1.0 / (wins + losses), 2) ELSE 0.0 END
+            """
+        ))
+
+
+def downgrade() -> None:
+    """Downgrade schema - Remove cross-event player statistics."""
+    op.drop_index('ix_global_player_stats_win_rate', table_name='global_player_stats')
+    op.drop_index('ix_global_player_stats_wins', table_name='global_player_stats')
+    op.drop_table('global_player_stats')
@@ -0,0 +1,38 @@
+"""Add normalized pair key to matches for head-to-head lookups
+
+Revision ID: f1b7d3e9a824
+Revises: e8a2c6f4d317
+Create Date: 2026-10-18 14:31:09.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7d3e9a824'
+down_revision: Union[str, Sequence[str], None] = 'e8a2c6f4d317'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Add and backfill (pair_min_id, pair_max_id) with its index."""
+    op.add_column('matches', sa.Column('pair_min_id', sa.Integer(), nullable=True))
+    op.add_column('matches', sa.Column('pair_max_id', sa.Integer(), nullable=True))
+    op.execute(sa.text(
+        "UPDATE matches SET pair_min_id = min(player1_id, player2_id), "
+        "pair_max_id = max(player1_id, player2_id)"
+    ))
+    op.create_index('ix_matches_pair', 'matches', ['pair_min_id', 'pair_max_id', 'finished_at'])
+    op.create_index('ix_rating_history_match_id', 'rating_history', ['match_id', 'player_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema - Remove the pair key."""
+    op.drop_index('ix_rating_history_match_id', table_name='rating_history')
+    op.drop_index('ix_matches_pair', table_name='matches')
+    with op.batch_alter_table('matches') as batch_op:
+        batch_op.drop_column('pair_max_id')
+        batch_op.drop_column('pair_min_id')
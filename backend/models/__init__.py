@@ -1,11 +1,15 @@
 # Diretório para modelos SQLAlchemy
 from .event import Event
+from .idempotency_key import IdempotencyKey
 from .match import Match
-from .player import Player
 from .membership import Membership, MembershipStatus
-from .tournament import Tournament, TournamentType, TournamentStatus
+from .player import Player
+from .player_stats import GlobalPlayerStats, PlayerEventStats
+from .rating_history import RatingCheckpoint, RatingHistory
+from .tournament import Tournament, TournamentStatus, TournamentType
 
 __all__ = [
     'Event', 'Player', 'Match', 'Membership', 'MembershipStatus',
-    'Tournament', 'TournamentType', 'TournamentStatus'
+    'Tournament', 'TournamentType', 'TournamentStatus', 'PlayerEventStats',
+    'RatingHistory', 'RatingCheckpoint', 'GlobalPlayerStats', 'IdempotencyKey'
 ]
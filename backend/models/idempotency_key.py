@@ -0,0 +1,27 @@
+# Model for IdempotencyKey (stored responses of retried write requests)
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+
+from database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Response of a write request sent with an Idempotency-Key header, replayed
+    when the client retries the same request with the same key.
+
+    status_code is NULL while the first request is still running. Rows expire
+    after config.IDEMPOTENCY_KEY_TTL seconds and are deleted by
+    utils.idempotency. The table is keyed by the client's key only (WITHOUT
+    ROWID): one B-tree, nothing else to maintain but the expiry index.
+    """
+    __tablename__ = "idempotency_keys"
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)  # SHA-256 of method, path, query and body
+    status_code = Column(Integer, nullable=True)
+    response = Column(Text, nullable=True)  # Response body as sent
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_idempotency_keys_created_at", "created_at"),
+        {"sqlite_with_rowid": False},
+    )
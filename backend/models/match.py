@@ -1,10 +1,22 @@
 # Model for Match
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from database import Base
 
 
+def _pair_min_id(context):
+    """Insert default: lower of the two player IDs"""
+    params = context.get_current_parameters()
+    return min(params["player1_id"], params["player2_id"])
+
+
+def _pair_max_id(context):
+    """Insert default: higher of the two player IDs"""
+    params = context.get_current_parameters()
+    return max(params["player1_id"], params["player2_id"])
+
+
 class Match(Base):
     __tablename__ = "matches"
     id = Column(Integer, primary_key=True, index=True)
@@ -15,6 +27,10 @@ class Match(Base):
     tournament_id = Column(Integer, ForeignKey("tournaments.id"), nullable=True)
     best_of = Column(Integer, default=5)
     finished = Column(Boolean, default=False)  # Match completion status
+    finished_at = Column(DateTime, nullable=True)  # When the result (winner) was recorded
+    # Normalized pair key (same for A vs B and B vs A), filled on insert, for head-to-head lookups
+    pair_min_id = Column(Integer, nullable=True, default=_pair_min_id)
+    pair_max_id = Column(Integer, nullable=True, default=_pair_max_id)
     
     # Game scores (e.g., "11-9,10-12,11-8,11-6" or "11-9 11-8 11-6")
     player1_games = Column(Integer, default=0)  # Number of games won by player 1
@@ -26,3 +42,15 @@ class Match(Base):
     player1 = relationship("Player", foreign_keys=[player1_id], back_populates="matches_as_player1")
     player2 = relationship("Player", foreign_keys=[player2_id], back_populates="matches_as_player2")
     winner = relationship("Player", foreign_keys=[winner_id])
+
+    __table_args__ = (
+        Index("ix_matches_pair", "pair_min_id", "pair_max_id", "finished_at"),
+        # Chronological result order of an event (finished_at, then id/rowid) for replays
+        Index("ix_matches_event_finished_at", "event_id", "finished_at"),
+        # Match listings filter on one of these and page by id (the implicit last index column)
+        Index("ix_matches_event_id", "event_id"),
+        Index("ix_matches_event_finished", "event_id", "finished"),
+        Index("ix_matches_player1_id", "player1_id"),
+        Index("ix_matches_player2_id", "player2_id"),
+        Index("ix_matches_tournament_id", "tournament_id"),
+    )
@@ -1,21 +1,41 @@
 # Modelo para Player (Jogador)
-from sqlalchemy import Boolean, Column, Float, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from database import Base
 
 
+def player_key(name: str) -> str:
+    """Default cross-event identity of a player: name with collapsed whitespace, casefolded"""
+    return " ".join(name.split()).casefold()
+
+
+def _default_player_key(context) -> str:
+    return player_key(context.get_current_parameters()["name"])
+
+
 class Player(Base):
     __tablename__ = "players"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
+    # Cross-event identity (global leaderboard): set once, a rename doesn't change it
+    player_key = Column(String(100), nullable=False, default=_default_player_key)
     event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
     elo_rating = Column(Float, default=1200.0)  # Elo rating starts at 1200 (from REFINAMENTO_FEATURE_1.md)
     score = Column(Integer, default=0)  # Legacy: number of wins
     ranking = Column(Integer, default=0)  # Position in tournament ranking
     active = Column(Boolean, default=True)  # Soft delete flag
+    # Optimistic concurrency: incremented by every update (see utils/concurrency.py)
+    version = Column(Integer, nullable=False, default=1)
 
     event = relationship("Event", back_populates="players", passive_deletes=True)
     matches_as_player1 = relationship("Match", foreign_keys="Match.player1_id", back_populates="player1")
     matches_as_player2 = relationship("Match", foreign_keys="Match.player2_id", back_populates="player2")
     memberships = relationship("Membership", back_populates="player", cascade="all, delete-orphan")
+    stats = relationship("PlayerEventStats", back_populates="player", uselist=False, passive_deletes=True)
+
+    __table_args__ = (
+        # Elo ranking: active players of an event ordered by rating
+        Index("ix_players_event_active_elo", "event_id", "active", "elo_rating"),
+    )
+    __mapper_args__ = {"version_id_col": version}
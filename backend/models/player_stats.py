@@ -0,0 +1,72 @@
+# Model for PlayerEventStats (materialized per-event player statistics)
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import relationship
+
+from database import Base
+
+from .player import Player
+
+
+class PlayerEventStats(Base):
+    """
+    Wins/losses/games per player, kept in sync by the match endpoints.
+
+    Only finished matches with a winner are counted. A zeroed row is created
+    whenever a player is inserted. The table can always be recomputed from
+    `matches` with rebuild_player_stats.py.
+    """
+    __tablename__ = "player_event_stats"
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    wins = Column(Integer, default=0, nullable=False)
+    losses = Column(Integer, default=0, nullable=False)
+    win_rate = Column(Float, default=0.0, nullable=False)  # wins / (wins + losses), rounded to 2 places
+    games_won = Column(Integer, default=0, nullable=False)
+    games_lost = Column(Integer, default=0, nullable=False)
+    matches_played = Column(Integer, default=0, nullable=False)
+    last_played_at = Column(DateTime, nullable=True)
+
+    player = relationship("Player", back_populates="stats")
+
+    __table_args__ = (
+        # Ranking sort orders (see routers/ranking.py)
+        Index("ix_player_event_stats_event_wins", "event_id", "wins", "win_rate"),
+        Index("ix_player_event_stats_event_win_rate", "event_id", "win_rate", "wins"),
+    )
+
+
+class GlobalPlayerStats(Base):
+    """
+    Wins/losses/games across all events, one row per player identity.
+
+    Players are per-event rows, so identities are matched by Player.player_key
+    (the normalized name unless given at registration). Only active players
+    count. Kept in sync together with player_event_stats and recomputed by
+    rebuild_player_stats.py.
+    """
+    __tablename__ = "global_player_stats"
+    player_key = Column(String(100), primary_key=True)
+    name = Column(String(100), nullable=False)  # Display name (first spelling seen)
+    wins = Column(Integer, default=0, nullable=False)
+    losses = Column(Integer, default=0, nullable=False)
+    win_rate = Column(Float, default=0.0, nullable=False)
+    games_won = Column(Integer, default=0, nullable=False)
+    games_lost = Column(Integer, default=0, nullable=False)
+    matches_played = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        # Global leaderboard sort orders (see routers/ranking.py)
+        Index("ix_global_player_stats_wins", "wins", "win_rate"),
+        Index("ix_global_player_stats_win_rate", "win_rate", "wins"),
+    )
+
+
+@event.listens_for(Player, "after_insert")
+def create_player_stats_row(mapper, connection, target):
+    """Every player gets a zeroed stats row, so rankings can inner-join the stats table"""
+    connection.execute(
+        sqlite_insert(PlayerEventStats.__table__)
+        .values(player_id=target.id, event_id=target.event_id)
+        .on_conflict_do_nothing()
+    )
@@ -0,0 +1,73 @@
+# Model for RatingHistory (append-only Elo rating ledger)
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+
+from database import Base
+
+
+class RatingHistory(Base):
+    """
+    One row per rating change of a player. Rows are only ever appended.
+
+    - reason "match": Elo update from a match result (match_id and k_factor set)
+    - reason "replay": correction written when an event's ratings are replayed
+      (e.g. after a match deletion); match_id and k_factor are NULL
+
+    match_id is a plain column (no foreign key) so that entries survive the
+    deletion of their match.
+    """
+    __tablename__ = "rating_history"
+    id = Column(Integer, primary_key=True, index=True)
+    player_id = Column(Integer, ForeignKey("players.id", ondelete="CASCADE"), nullable=False)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    match_id = Column(Integer, nullable=True)
+    reason = Column(String(10), nullable=False, default="match")
+    rating_before = Column(Float, nullable=False)
+    rating_after = Column(Float, nullable=False)
+    delta = Column(Float, nullable=False)
+    k_factor = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index("ix_rating_history_player_id_id", "player_id", "id"),
+        # Ledger entries of given matches (head-to-head Elo swing)
+        Index("ix_rating_history_match_id", "match_id", "player_id"),
+    )
+
+
+class RatingCheckpoint(Base):
+    """
+    Snapshot of an event's replay state after its first `match_count` results
+    (chronological order: finished_at, then id), written by utils.elo_replay as
+    results are recorded.
+
+    `state` holds parallel lists: player_ids, ratings, wins, played. Point-in-time
+    rankings start from the nearest checkpoint (by last_finished_at, last_match_id)
+    and replay only the remainder.
+    Checkpoints are discarded and rewritten whenever the event is replayed.
+    """
+    __tablename__ = "rating_checkpoints"
+    id = Column(Integer, primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    match_count = Column(Integer, nullable=False)
+    # Replay-order key (finished_at, id) of the last result included
+    last_finished_at = Column(DateTime, nullable=True)
+    last_match_id = Column(Integer, nullable=False)
+    state = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        UniqueConstraint("event_id", "match_count", name="uq_rating_checkpoints_event_count"),
+        Index("ix_rating_checkpoints_event_key", "event_id", "last_finished_at", "last_match_id"),
+    )
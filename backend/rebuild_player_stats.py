@@ -0,0 +1,50 @@
+"""
+Rebuild the materialized player_event_stats table from the matches table
+(global_player_stats is rebuilt from it as well).
+
+Usage (from backend/):
+    python rebuild_player_stats.py                 # rebuild every event
+    python rebuild_player_stats.py --event-id 3    # rebuild one event
+    python rebuild_player_stats.py --check         # only report drift (exit code 1 if any)
+"""
+
+import argparse
+import sys
+
+from database import Base, SessionLocal, engine
+from utils.player_stats import find_player_stats_drift, rebuild_player_stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild player_event_stats from matches")
+    parser.add_argument("--event-id", type=int, default=None, help="Only rebuild this event")
+    parser.add_argument("--check", action="store_true", help="Report drift without writing")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if args.check:
+            drift = find_player_stats_drift(db, args.event_id)
+        else:
+            drift = rebuild_player_stats(db, args.event_id)
+            db.commit()
+    finally:
+        db.close()
+
+    for entry in drift:
+        print(f"  player {entry['player_id']}: {entry['field']} "
+              f"stored={entry['stored']} expected={entry['expected']}")
+
+    scope = f"event {args.event_id}" if args.event_id else "all events"
+    if args.check:
+        print(f"[{'DRIFT' if drift else 'OK'}] {len(drift)} mismatching field(s) in {scope}")
+        return 1 if drift else 0
+
+    print(f"[OK] Rebuilt player_event_stats for {scope} ({len(drift)} field(s) corrected) "
+          f"and global_player_stats")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
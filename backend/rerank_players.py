@@ -0,0 +1,38 @@
+"""
+Recompute the materialized Player.ranking positions (dense rank by Elo rating).
+
+Positions are maintained incrementally by the match endpoints; this is the
+repair job for rows written outside of them.
+
+Usage (from backend/):
+    python rerank_players.py                 # rerank every event
+    python rerank_players.py --event-id 3    # rerank one event
+"""
+
+import argparse
+import sys
+
+from database import Base, SessionLocal, engine
+from utils.player_ranking import rerank_players
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Recompute Player.ranking with DENSE_RANK()")
+    parser.add_argument("--event-id", type=int, default=None, help="Only rerank this event")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        corrected = rerank_players(db, args.event_id)
+        db.commit()
+    finally:
+        db.close()
+
+    scope = f"event {args.event_id}" if args.event_id else "all events"
+    print(f"[OK] Reranked players for {scope} ({corrected} position(s) corrected)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
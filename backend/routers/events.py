@@ -1,18 +1,37 @@
 
+import numpy as np
+
 # FastAPI imports for API routing and dependency injection
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import select
 
 # SQLAlchemy imports for database session management
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database import SessionLocal
+import config
+from database import get_async_db, get_db
+from elo import win_probability_matrix
 
 # Import Event model
 from models.event import Event
+from models.player import Player
 
 # Import schemas
-from schemas import EventCreate, EventRead, EventUpdate
-from pydantic import BaseModel
+from schemas import (
+    EloReplayResult,
+    EventCreate,
+    EventRead,
+    EventUpdate,
+    WinMatrixFormatEnum,
+    WinMatrixResponse,
+)
+from utils.concurrency import ConcurrentUpdateError, retry_on_conflict
+from utils.elo_replay import replay_event_ratings
+from utils.event_stream import RANKING_CHANGED, iter_event_stream, publish_event_change
+
 
 # Schema for status update
 class EventStatusUpdate(BaseModel):
@@ -20,29 +39,20 @@ class EventStatusUpdate(BaseModel):
 
 router = APIRouter(prefix="/events", tags=["events"])
 
-# Dependency to get a database session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # List all events (active and inactive)
 @router.get("", response_model=list[EventRead])
-def list_events(db: Session = Depends(get_db)):
+async def list_events(db: AsyncSession = Depends(get_async_db)):
     """
     List all events (active and inactive).
 
     Returns a list of all events, sorted by active status (active first) and then by date.
     """
-    return db.query(Event).order_by(Event.active.desc(), Event.date.desc()).all()
+    return (await db.scalars(select(Event).order_by(Event.active.desc(), Event.date.desc()))).all()
 
 
 # Get a specific event
 @router.get("/{event_id}", response_model=EventRead)
-def get_event(event_id: int, db: Session = Depends(get_db)):
+async def get_event(event_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get details of a specific event.
     
@@ -50,7 +60,7 @@ def get_event(event_id: int, db: Session = Depends(get_db)):
 
     - **event_id**: The event ID to retrieve
     """
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
@@ -115,6 +125,98 @@ def update_event_status(event_id: int, status: EventStatusUpdate, db: Session =
     return event
 
 
+# Recompute Elo ratings of an event from its match history
+@router.post("/{event_id}/replay-ratings", response_model=EloReplayResult)
+def replay_ratings(event_id: int, db: Session = Depends(get_db)):
+    """
+    Recompute every player's Elo rating and win count from the event's finished
+    matches, in the order their results were recorded.
+
+    - **event_id**: The event ID to replay
+    """
+    event = db.query(Event).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    try:
+        result = retry_on_conflict(db, lambda: replay_event_ratings(db, event_id))
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from None
+    publish_event_change(event_id, RANKING_CHANGED)
+    return result
+
+
+# Live feed of an event's changes
+@router.get("/{event_id}/stream", response_class=StreamingResponse)
+def stream_event(event_id: int, db: Session = Depends(get_db, scope="function")):
+    """
+    Server-Sent Events feed of the event's activity, to keep screens current
+    without polling (use with EventSource).
+
+    Event types: match-created and match-updated (`{"matches": [...]}`),
+    match-deleted (`{"match_ids": [...]}`), ranking-changed (fetch the
+    ranking again) and membership-changed (the membership). A `resync` event
+    means changes were missed: reload everything.
+    """
+    # The database session is closed as soon as the event is checked: the stream stays open for hours
+    if db.query(Event.id).filter(Event.id == event_id).first() is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return StreamingResponse(
+        iter_event_stream(event_id, config.EVENT_STREAM_KEEPALIVE),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Pairwise win probabilities of the active players of an event
+@router.get(
+    "/{event_id}/win-matrix",
+    response_model=WinMatrixResponse,
+    responses={200: {"content": {"application/octet-stream": {}}}},
+)
+def win_matrix(
+    event_id: int,
+    format: WinMatrixFormatEnum = Query(WinMatrixFormatEnum.JSON, description="json or binary"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the probability that each active player beats each other one
+    (elo.calculate_win_probability for every pair), players sorted by rating.
+
+    - **format=json** (default): nested lists
+    - **format=binary**: `application/octet-stream`, little-endian: uint32 N,
+      N int32 player IDs, then the N x N matrix as float32, row-major
+      (about 1 MB for 500 players, instead of ~10 MB of JSON)
+    """
+    event = db.query(Event).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    rows = db.execute(
+        select(Player.id, Player.elo_rating)
+        .where(Player.event_id == event_id, Player.active.is_(True))
+        .order_by(Player.elo_rating.desc(), Player.id)
+    ).all()
+    player_ids = np.array([row[0] for row in rows], dtype="<i4")
+    ratings = np.array([row[1] for row in rows], dtype=np.float64)
+    matrix = win_probability_matrix(ratings)
+
+    if format == WinMatrixFormatEnum.BINARY:
+        body = (
+            np.array([len(player_ids)], dtype="<u4").tobytes()
+            + player_ids.tobytes()
+            + matrix.astype("<f4").tobytes()
+        )
+        return Response(content=body, media_type="application/octet-stream")
+
+    return WinMatrixResponse(
+        event_id=event_id,
+        player_ids=player_ids.tolist(),
+        ratings=ratings.tolist(),
+        probabilities=matrix.tolist(),
+    )
+
+
 # Soft delete an event (mark as inactive)
 @router.delete("/{event_id}")
 def delete_event(event_id: int, db: Session = Depends(get_db)):
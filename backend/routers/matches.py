@@ -1,25 +1,106 @@
 
 
+import asyncio
+import hmac
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
 # FastAPI imports for API routing and dependency injection
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
 # SQLAlchemy imports for database session management
-from sqlalchemy.orm import Session
-
-from database import SessionLocal
-from elo import update_ratings, calculate_match_outcome
-from models import Event, Match, Player, Membership, MembershipStatus
-from schemas import MatchCreate, MatchRead, MatchUpdate, MatchResultResponse
+from sqlalchemy import and_, bindparam, insert, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+import config
+from database import SessionLocal, get_async_db, get_db
+from elo import calculate_match_outcome, update_ratings
+from models import Event, Match, Membership, Player
+from schemas import (
+    LiveRoleEnum,
+    LiveScoreAction,
+    LiveScoreActionEnum,
+    MatchBulkResponse,
+    MatchCreate,
+    MatchExportFormatEnum,
+    MatchOrderEnum,
+    MatchQueueMetrics,
+    MatchRead,
+    MatchResultResponse,
+    MatchTicket,
+    MatchUpdate,
+)
+from utils.broadcaster import Subscription, broadcaster
+from utils.concurrency import ConcurrentUpdateError, retry_on_conflict
+from utils.elo_replay import extend_rating_checkpoints, replay_event_ratings
+from utils.event_stream import (
+    MATCH_CREATED,
+    MATCH_DELETED,
+    MATCH_UPDATED,
+    RANKING_CHANGED,
+    publish_event_change,
+    publish_match,
+    publish_matches_created,
+)
+from utils.idempotency import idempotency
+from utils.live_scoring import LiveMatch, LiveScoreboard
+from utils.match_export import iter_csv, iter_ndjson
+from utils.match_import import MAX_BULK_MATCHES, import_matches, membership_error, parse_match_rows
+from utils.match_queue import MatchResultQueue, QueueFullError
+from utils.player_ranking import move_player_rating
+from utils.player_stats import apply_match_stats, counts_for_stats
+from utils.rating_history import record_match_ratings
+
+logger = logging.getLogger(__name__)
 
 # Router for match-related endpoints
 router = APIRouter(prefix="/matches", tags=["matches"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Response header carrying the after_id of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# WebSocket close codes of the live scoring channel: unknown match, umpire token refused
+LIVE_MATCH_NOT_FOUND = 4404
+LIVE_UMPIRE_FORBIDDEN = 4403
+
+# Create/update routes replay the stored response of a retried Idempotency-Key
+idempotent = Depends(idempotency(get_db))
+
+
+# Write-behind queue of match results, applied by a single writer thread
+match_queue = MatchResultQueue(
+    SessionLocal,
+    batch_size=config.MATCH_QUEUE_BATCH_SIZE,
+    batch_wait=config.MATCH_QUEUE_BATCH_WAIT,
+    max_depth=config.MATCH_QUEUE_MAX_DEPTH,
+    ticket_retention=config.MATCH_QUEUE_TICKET_RETENTION,
+)
+
+
+def get_match_queue() -> MatchResultQueue:
+    return match_queue
+
+
+# Matches being scored point by point, kept in memory
+live_scores = LiveScoreboard(SessionLocal)
+
+
+def get_live_scoreboard() -> LiveScoreboard:
+    return live_scores
 
 
 def validate_player_can_play(player_id: int, event_id: int, db: Session) -> None:
@@ -30,27 +111,87 @@ def validate_player_can_play(player_id: int, event_id: int, db: Session) -> None
     - Jogador não tem membership no evento
     - Membership não está em status ATIVO
     """
-    membership = db.query(Membership).filter(
+    status = db.scalar(select(Membership.status).where(
         Membership.player_id == player_id,
         Membership.event_id == event_id
-    ).first()
-    
-    if not membership:
-        raise HTTPException(
-            status_code=403,
-            detail=f"Jogador {player_id} não tem membership no evento {event_id}"
-        )
-    
-    if membership.status != MembershipStatus.ATIVO:
-        raise HTTPException(
-            status_code=403,
-            detail=f"Jogador {player_id} não pode jogar. Status: {membership.status.value}. "
-                   f"Apenas membros ATIVO podem participar."
-        )
+    ).limit(1))
+    detail = membership_error(player_id, event_id, status)
+    if detail:
+        raise HTTPException(status_code=403, detail=detail)
+
+
+def _apply_elo_result(db: Session, match: Match, player1: Player, player2: Player, winner_id: int) -> None:
+    """
+    Apply a match result to both players' Elo ratings, ranking positions and
+    win counts, append it to the rating history ledger and save the rating
+    checkpoint it completes, if any.
+    """
+    # Calculate new Elo ratings using match_outcome function
+    outcome = calculate_match_outcome(
+        player1.elo_rating,
+        player2.elo_rating,
+        winner_id,
+        player1.id,
+        player2.id,
+        player1_match_count=player1.score,  # Use wins as match count approximation
+        player2_match_count=player2.score
+    )
+    record_match_ratings(db, match, player1, player2, outcome)
+
+    # Update player ratings (shifting the affected ranking positions) and increment win count for winner
+    move_player_rating(db, player1, outcome['player1_new_rating'])
+    move_player_rating(db, player2, outcome['player2_new_rating'])
+
+    if winner_id == player1.id:
+        player1.score += 1
+    else:
+        player2.score += 1
+    extend_rating_checkpoints(db, match.event_id)
+
+
+def _registration_statement():
+    """
+    One query validating a new match: the event row joined with both players
+    (if active in the event) and their memberships. Returns no row if the event
+    doesn't exist; a missing player or membership comes back as NULL.
+
+    Built once with bound parameters (event_id, player1_id, player2_id), as
+    constructing the aliased joins costs more than running the query.
+    """
+    player1, player2 = aliased(Player, name="player1"), aliased(Player, name="player2")
+    membership1, membership2 = aliased(Membership, name="membership1"), aliased(Membership, name="membership2")
+    return (
+        select(Event.id, player1, player2, membership1.status, membership2.status)
+        .outerjoin(player1, and_(
+            player1.id == bindparam("player1_id"), player1.event_id == Event.id, player1.active.is_(True)
+        ))
+        .outerjoin(player2, and_(
+            player2.id == bindparam("player2_id"), player2.event_id == Event.id, player2.active.is_(True)
+        ))
+        .outerjoin(membership1, and_(
+            membership1.player_id == bindparam("player1_id"), membership1.event_id == Event.id
+        ))
+        .outerjoin(membership2, and_(
+            membership2.player_id == bindparam("player2_id"), membership2.event_id == Event.id
+        ))
+        .where(Event.id == bindparam("event_id"))
+        .limit(1)
+    )
+
+
+REGISTRATION_STATEMENT = _registration_statement()
+
+
+def _commit_with_retry(db: Session, operation):
+    """Run and commit a read-compute-write unit, retried on concurrent player updates (409 if it keeps failing)"""
+    try:
+        return retry_on_conflict(db, operation)
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from None
 
 
 # Register a new match in an event
-@router.post("", response_model=MatchRead, status_code=201)
+@router.post("", response_model=MatchRead, status_code=201, dependencies=[idempotent])
 def register_match(match_data: MatchCreate, db: Session = Depends(get_db)):
     """
     Create a new match between two players.
@@ -62,23 +203,22 @@ def register_match(match_data: MatchCreate, db: Session = Depends(get_db)):
     - **player2_id**: Second player ID
     - **best_of**: Best of N sets (1, 3, 5, or 7) - default 5
     """
-    # Validate event exists (active or inactive)
-    event = db.query(Event).filter(Event.id == match_data.event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    match = _commit_with_retry(db, lambda: _register_match(db, match_data))
+    publish_match(MATCH_CREATED, match, ranking_changed=match.winner_id is not None)
+    return match
 
-    # Validate players exist and belong to the event
-    player1 = db.query(Player).filter(
-        Player.id == match_data.player1_id,
-        Player.event_id == match_data.event_id,
-        Player.active
-    ).first()
 
-    player2 = db.query(Player).filter(
-        Player.id == match_data.player2_id,
-        Player.event_id == match_data.event_id,
-        Player.active
-    ).first()
+def _register_match(db: Session, match_data: MatchCreate) -> MatchRead:
+    """Validate and insert a match, applying its result if any (not committed)"""
+    # Validate event, players and memberships (only ATIVO can play) in one round trip
+    validation = db.execute(REGISTRATION_STATEMENT, {
+        "event_id": match_data.event_id,
+        "player1_id": match_data.player1_id,
+        "player2_id": match_data.player2_id,
+    }).first()
+    if validation is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    _, player1, player2, player1_status, player2_status = validation
 
     if not player1:
         raise HTTPException(status_code=400, detail="Player 1 not found in event")
@@ -86,97 +226,261 @@ def register_match(match_data: MatchCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Player 2 not found in event")
     if player1.id == player2.id:
         raise HTTPException(status_code=400, detail="Player cannot play against themselves")
+    for player_id, status in ((player1.id, player1_status), (player2.id, player2_status)):
+        detail = membership_error(player_id, match_data.event_id, status)
+        if detail:
+            raise HTTPException(status_code=403, detail=detail)
+    if match_data.winner_id is not None and match_data.winner_id not in [player1.id, player2.id]:
+        raise HTTPException(
+            status_code=400,
+            detail="Winner must be one of the match players"
+        )
 
-    # ✨ VALIDAÇÃO DE MEMBERSHIP: Apenas ATIVO podem jogar
-    validate_player_can_play(player1.id, match_data.event_id, db)
-    validate_player_can_play(player2.id, match_data.event_id, db)
-
-    match = Match(
-        event_id=match_data.event_id,
-        player1_id=match_data.player1_id,
-        player2_id=match_data.player2_id,
-        player1_games=match_data.player1_games if match_data.player1_games is not None else 0,
-        player2_games=match_data.player2_games if match_data.player2_games is not None else 0,
-        games_score=match_data.games_score,
-        winner_id=match_data.winner_id,
-        best_of=match_data.best_of,
-        finished=(match_data.winner_id is not None)
+    # INSERT ... RETURNING gives the complete row back: no refresh needed after commit
+    match = db.scalar(
+        insert(Match)
+        .values(
+            event_id=match_data.event_id,
+            player1_id=match_data.player1_id,
+            player2_id=match_data.player2_id,
+            player1_games=match_data.player1_games if match_data.player1_games is not None else 0,
+            player2_games=match_data.player2_games if match_data.player2_games is not None else 0,
+            games_score=match_data.games_score,
+            winner_id=match_data.winner_id,
+            best_of=match_data.best_of,
+            finished=(match_data.winner_id is not None),
+            finished_at=datetime.now(timezone.utc) if match_data.winner_id is not None else None
+        )
+        .returning(Match)
     )
-    db.add(match)
-    
+
     # If winner is set, update Elo ratings immediately
     if match_data.winner_id is not None:
-        if match_data.winner_id not in [match_data.player1_id, match_data.player2_id]:
-            raise HTTPException(
-                status_code=400,
-                detail="Winner must be one of the match players"
-            )
-        
-        # Calculate new Elo ratings using match_outcome function
-        outcome = calculate_match_outcome(
-            player1.elo_rating,
-            player2.elo_rating,
-            match_data.winner_id,
-            player1.id,
-            player2.id,
-            player1_match_count=player1.score,  # Use wins as match count approximation
-            player2_match_count=player2.score
-        )
-        
-        # Update player ratings and increment win count for winner
-        player1.elo_rating = outcome['player1_new_rating']
-        player2.elo_rating = outcome['player2_new_rating']
-        
-        if match_data.winner_id == player1.id:
-            player1.score += 1
-        else:
-            player2.score += 1
-    
-    db.commit()
-    db.refresh(match)
-    return match
+        _apply_elo_result(db, match, player1, player2, match_data.winner_id)
+        apply_match_stats(db, match)
+
+    return MatchRead.model_validate(match)
+
+
+async def _bulk_payload(request: Request) -> list:
+    """Raw rows of a bulk import body (JSON array or CSV)"""
+    try:
+        rows = parse_match_rows(request.headers.get("content-type", ""), await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from None
+    if len(rows) > MAX_BULK_MATCHES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_MATCHES} matches per import")
+    return rows
+
+
+# Register many matches at once
+@router.post("/bulk", response_model=MatchBulkResponse, dependencies=[idempotent])
+def register_matches_bulk(rows: list = Depends(_bulk_payload), db: Session = Depends(get_db)):
+    """
+    Create many matches in one transaction (e.g. the results of a league night).
+
+    The body is either a JSON array of matches (same fields as POST /matches)
+    or, with `Content-Type: text/csv`, a CSV document whose header row names
+    those fields. Results are applied to Elo ratings in submission order.
+
+    Invalid rows are skipped and listed in `errors` with their row number
+    (1-based, not counting the CSV header); the other rows are imported.
+    """
+    report = _commit_with_retry(db, lambda: import_matches(db, rows))
+    publish_matches_created(db, report["match_ids"])
+    return report
+
+
+# Queue a match result (write-behind mode)
+@router.post("/queue", response_model=MatchTicket, status_code=202, dependencies=[idempotent])
+def queue_match(match_data: MatchCreate, results: MatchResultQueue = Depends(get_match_queue)):
+    """
+    Accept a match result without waiting for the database.
+
+    The result is applied shortly after by the single writer, batched with
+    other queued results (same validation and Elo rules as POST /matches,
+    applied in submission order). Follow its outcome with
+    GET /matches/queue/{ticket_id}.
+
+    Returns 503 when the queue is full.
+    """
+    try:
+        return results.submit(match_data)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e)) from None
+
+
+# Write-behind queue metrics
+@router.get("/queue/metrics", response_model=MatchQueueMetrics)
+def queue_metrics(results: MatchResultQueue = Depends(get_match_queue)):
+    """Queue depth, lag (age of the oldest waiting result) and batch counters"""
+    return results.metrics()
+
+
+# Outcome of a queued match result
+@router.get("/queue/{ticket_id}", response_model=MatchTicket)
+def queued_match_status(ticket_id: str, results: MatchResultQueue = Depends(get_match_queue)):
+    """Get the status of a queued result: queued, applied (with match_id) or rejected (with detail)"""
+    ticket = results.ticket(ticket_id)
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    return ticket
+
+
+def _match_page(
+    db: Session,
+    response: Response,
+    conditions: list,
+    player_id: Optional[int],
+    limit: Optional[int],
+    after_id: Optional[int],
+    order: MatchOrderEnum,
+) -> list:
+    """
+    Read one page of matches ordered by ID (keyset pagination on the primary key).
+
+    Every filter has an index whose entries are in ID order within a key, so a
+    page is an index range scan of at most limit + 1 rows. The player filter
+    reads the player1 and player2 indexes separately (one range each) instead
+    of an OR over both columns. The next page's after_id is returned in the
+    `X-Next-Cursor` response header.
+    """
+    descending = order == MatchOrderEnum.DESC
+    id_order = Match.id.desc() if descending else Match.id.asc()
+    conditions = list(conditions)
+    if after_id is not None:
+        conditions.append(Match.id < after_id if descending else Match.id > after_id)
+    fetch = limit + 1 if limit is not None else None
+
+    query = select(Match).where(*conditions)
+    if player_id is not None:
+        sides = [
+            select(Match.id).where(*conditions, side == player_id).order_by(id_order).limit(fetch).subquery()
+            for side in (Match.player1_id, Match.player2_id)
+        ]
+        query = select(Match).where(Match.id.in_(union_all(*(select(side.c.id) for side in sides))))
+    matches = db.scalars(query.order_by(id_order).limit(fetch)).all()
+
+    if limit is not None and len(matches) > limit:
+        matches = matches[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = str(matches[-1].id)
+    return matches
 
 
 # List all matches in an event
 @router.get("", response_model=list[MatchRead])
-def list_matches(event_id: int = Query(..., gt=0), db: Session = Depends(get_db)):
+async def list_matches(
+    response: Response,
+    event_id: int = Query(..., gt=0),
+    player_id: Optional[int] = Query(None, gt=0, description="Only matches of this player"),
+    finished: Optional[bool] = Query(None, description="Only finished (true) or unfinished (false) matches"),
+    tournament_id: Optional[int] = Query(None, gt=0, description="Only matches of this tournament"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (default: all matches)"),
+    after_id: Optional[int] = Query(None, ge=0, description="X-Next-Cursor header of the previous page"),
+    order: MatchOrderEnum = Query(MatchOrderEnum.ASC, description="Match ID order: asc or desc (newest first)"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
-    Get all matches for an event.
+    Get the matches of an event, ordered by ID.
     
     Works for both active and inactive events.
 
     - **event_id**: Event ID to filter matches
+    - **player_id**, **finished**, **tournament_id**: Optional filters
+    - **limit**: Page size; when more matches follow, the `after_id` of the
+      next page is returned in the `X-Next-Cursor` response header
+    - **after_id**: Return matches after this ID (in the requested order)
     """
     # Verify event exists (active or inactive)
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    return db.query(Match).filter(Match.event_id == event_id).all()
+    conditions = [Match.event_id == event_id]
+    if player_id is not None:
+        # Players belong to a single event: check it once, so that the player
+        # indexes (not the event index) drive the page read
+        if await db.scalar(select(Player.event_id).where(Player.id == player_id)) != event_id:
+            return []
+        conditions = []
+    if finished is not None:
+        conditions.append(Match.finished == finished)
+    if tournament_id is not None:
+        conditions.append(Match.tournament_id == tournament_id)
+    return await db.run_sync(_match_page, response, conditions, player_id, limit, after_id, order)
 
 
 # List all matches across all events (for system statistics)
 @router.get("/all/list")
-def list_all_matches(db: Session = Depends(get_db)):
+def list_all_matches(
+    response: Response,
+    player_id: Optional[int] = Query(None, gt=0, description="Only matches of this player"),
+    finished: bool = Query(True, description="Finished (default) or unfinished matches"),
+    tournament_id: Optional[int] = Query(None, gt=0, description="Only matches of this tournament"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (default: all matches)"),
+    after_id: Optional[int] = Query(None, ge=0, description="X-Next-Cursor header of the previous page"),
+    order: MatchOrderEnum = Query(MatchOrderEnum.ASC, description="Match ID order: asc or desc (newest first)"),
+    db: Session = Depends(get_db)
+):
     """
-    Get all finished matches across all events.
+    Get all finished matches across all events, ordered by ID.
     Used for system statistics and dashboard.
+
+    Accepts the same filters and pagination parameters as GET /matches.
     """
-    return db.query(Match).filter(Match.finished).all()
+    conditions = [Match.finished == finished]
+    if tournament_id is not None:
+        conditions.append(Match.tournament_id == tournament_id)
+    return _match_page(db, response, conditions, player_id, limit, after_id, order)
+
+
+# Stream matches as NDJSON or CSV
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+)
+def export_matches(
+    format: MatchExportFormatEnum = Query(MatchExportFormatEnum.NDJSON, description="ndjson or csv"),
+    event_id: Optional[int] = Query(None, gt=0, description="Only export this event's matches"),
+    db: Session = Depends(get_db)
+):
+    """
+    Export matches (all, or those of one event) ordered by ID.
+
+    The response is streamed while rows are read from the database, so memory
+    use doesn't depend on the number of matches.
+
+    - **format=ndjson** (default): one JSON object per line
+    - **format=csv**: header row, then one line per match
+    """
+    if event_id is not None and not db.query(Event.id).filter(Event.id == event_id).first():
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    filename = f"matches-event-{event_id}" if event_id is not None else "matches"
+    if format == MatchExportFormatEnum.CSV:
+        content, media_type, filename = iter_csv(db, event_id), "text/csv", f"{filename}.csv"
+    else:
+        content, media_type, filename = iter_ndjson(db, event_id), "application/x-ndjson", f"{filename}.ndjson"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 # Get a specific match
 @router.get("/{match_id}", response_model=MatchRead)
-def get_match(match_id: int, db: Session = Depends(get_db)):
+async def get_match(match_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get details of a specific match"""
-    match = db.query(Match).filter(Match.id == match_id).first()
+    match = await db.get(Match, match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     return match
 
 
 # Update a match (set winner, mark as finished)
-@router.put("/{match_id}", response_model=MatchRead)
+@router.put("/{match_id}", response_model=MatchRead, dependencies=[idempotent])
 def update_match(match_id: int, match_update: MatchUpdate, db: Session = Depends(get_db)):
     """
     Update match result (set scores, winner and finish status).
@@ -190,46 +494,50 @@ def update_match(match_id: int, match_update: MatchUpdate, db: Session = Depends
     - **winner_id**: ID of the winning player (must be player1 or player2)
     - **finished**: Whether the match is finished
     """
+    match = _commit_with_retry(db, lambda: _update_match(db, match_id, match_update))
+    db.refresh(match)
+    result_fields = {"winner_id", "finished"} & match_update.model_fields_set
+    publish_match(MATCH_UPDATED, match, ranking_changed=bool(result_fields))
+    return match
+
+
+def _update_match(db: Session, match_id: int, match_update: MatchUpdate) -> Match:
+    """Apply a match update and its rating consequences (not committed)"""
     match = db.query(Match).filter(Match.id == match_id).first()
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
+    players = _match_players_for_winner(db, match, match_update.winner_id)
 
-    # Validate winner_id if provided
-    if match_update.winner_id is not None:
-        if match_update.winner_id not in [match.player1_id, match.player2_id]:
-            raise HTTPException(
-                status_code=400,
-                detail="Winner must be one of the match players"
-            )
-        
-        # Get both players for Elo calculation
-        player1 = db.query(Player).filter(Player.id == match.player1_id).first()
-        player2 = db.query(Player).filter(Player.id == match.player2_id).first()
-        
-        if not player1 or not player2:
-            raise HTTPException(status_code=404, detail="One or both players not found")
-        
-        # Only calculate Elo if winner wasn't already set (avoid double calculation)
-        if match.winner_id is None:
-            outcome = calculate_match_outcome(
-                player1.elo_rating,
-                player2.elo_rating,
-                match_update.winner_id,
-                player1.id,
-                player2.id,
-                player1_match_count=player1.score,
-                player2_match_count=player2.score
-            )
-            
-            player1.elo_rating = outcome['player1_new_rating']
-            player2.elo_rating = outcome['player2_new_rating']
-            
-            if match_update.winner_id == player1.id:
-                player1.score += 1
-            else:
-                player2.score += 1
-    
-    # Update fields using model_dump pattern (like PlayerUpdate)
+    # Remove the previous result from player stats; re-added below with the new values
+    previously_counted = counts_for_stats(match)
+    previous_winner_id = match.winner_id
+    apply_match_stats(db, match, sign=-1)
+    _apply_match_fields(match, match_update)
+    apply_match_stats(db, match)
+
+    _sync_match_ratings(db, match, players, previously_counted, previous_winner_id)
+    return match
+
+
+def _match_players_for_winner(db: Session, match: Match, winner_id: Optional[int]) -> Optional[tuple]:
+    """Validate a new winner and return both players for the Elo calculation (None without a winner)"""
+    if winner_id is None:
+        return None
+    if winner_id not in [match.player1_id, match.player2_id]:
+        raise HTTPException(
+            status_code=400,
+            detail="Winner must be one of the match players"
+        )
+
+    player1 = db.query(Player).filter(Player.id == match.player1_id).first()
+    player2 = db.query(Player).filter(Player.id == match.player2_id).first()
+    if not player1 or not player2:
+        raise HTTPException(status_code=404, detail="One or both players not found")
+    return player1, player2
+
+
+def _apply_match_fields(match: Match, match_update: MatchUpdate) -> None:
+    """Copy the set fields of an update onto the match (a winner also finishes it)"""
     update_data = match_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         if field == "winner_id" and value is not None:
@@ -240,19 +548,214 @@ def update_match(match_id: int, match_update: MatchUpdate, db: Session = Depends
         elif value is not None:
             setattr(match, field, value)
 
-    db.commit()
-    db.refresh(match)
-    return match
+    if match.finished and match.winner_id is not None and match.finished_at is None:
+        match.finished_at = datetime.now(timezone.utc)
+
+
+def _sync_match_ratings(
+    db: Session,
+    match: Match,
+    players: Optional[tuple],
+    previously_counted: bool,
+    previous_winner_id: Optional[int],
+) -> None:
+    """
+    Bring Elo ratings in line with the match's new result.
+
+    A first result is the latest in the event and is applied incrementally.
+    Any other change of the counted result (a correction, a reopened match, a
+    reopened match finished again) can't be undone incrementally: the event is
+    replayed.
+    """
+    counted = counts_for_stats(match)
+    if counted and not previously_counted and previous_winner_id is None:
+        _apply_elo_result(db, match, *players, match.winner_id)
+    elif counted != previously_counted or (counted and match.winner_id != previous_winner_id):
+        replay_event_ratings(db, match.event_id)
 
 
 # Delete a match
 @router.delete("/{match_id}")
 def delete_match(match_id: int, db: Session = Depends(get_db)):
-    """Delete a match from the event"""
+    """
+    Delete a match from the event.
+
+    If the match had a result, the event's Elo ratings are replayed without it.
+    """
+    event_id, had_result = _commit_with_retry(db, lambda: _delete_match(db, match_id))
+    publish_event_change(event_id, MATCH_DELETED, {"match_ids": [match_id]})
+    if had_result:
+        publish_event_change(event_id, RANKING_CHANGED)
+    return {"detail": "Match deleted successfully"}
+
+
+def _delete_match(db: Session, match_id: int) -> tuple[int, bool]:
+    """
+    Delete a match and replay the event's ratings if needed (not committed).
+    Returns the match's event ID and whether it had a result.
+    """
     match = db.query(Match).filter(Match.id == match_id).first()
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
 
+    had_result = counts_for_stats(match)
+    event_id = match.event_id
+    apply_match_stats(db, match, sign=-1)
     db.delete(match)
-    db.commit()
-    return {"detail": "Match deleted successfully"}
+    if had_result:
+        replay_event_ratings(db, event_id)
+    return event_id, had_result
+
+
+def _live_channel(match_id: int) -> str:
+    return f"match:{match_id}"
+
+
+def _load_live_match(scoreboard: LiveScoreboard, match_id: int) -> Optional[LiveMatch]:
+    """Live state of a match, resumed from the database on first use (None if not found)"""
+    def load():
+        with scoreboard.session_factory() as db:
+            match = db.get(Match, match_id)
+            return LiveMatch.from_match(match) if match else None
+    return scoreboard.load(match_id, load)
+
+
+def _flush_live_match(scoreboard: LiveScoreboard, live: LiveMatch) -> None:
+    """
+    Write the finished games of a live match (and its result, with Elo, once
+    decided) in one transaction. Writes of a match are serialized and always
+    carry its latest score, so an older flush never overwrites a newer one.
+    """
+    with live.flush_lock:
+        with live.lock:
+            if not live.dirty:
+                return
+            flushed_games = len(live.games)
+            player1_games, player2_games = live.games_won
+            update = MatchUpdate(
+                player1_games=player1_games,
+                player2_games=player2_games,
+                games_score=live.games_score,
+                winner_id=live.winner_id,
+            )
+        with scoreboard.session_factory() as db:
+            match = retry_on_conflict(db, lambda: _update_match(db, live.match_id, update))
+            publish_match(MATCH_UPDATED, match, ranking_changed=update.winner_id is not None)
+        with live.lock:
+            live.flushed_games = flushed_games
+            done = live.finished and not live.dirty
+    if done:
+        scoreboard.discard(live.match_id)
+
+
+async def _apply_live_action(scoreboard: LiveScoreboard, live: LiveMatch, message: str) -> Optional[str]:
+    """Apply an umpire message, broadcast the new score and write finished games; returns an error, if any"""
+    try:
+        action = LiveScoreAction.model_validate_json(message)
+    except ValidationError as e:
+        return f"Invalid action: {e.errors()[0]['msg']}"
+    try:
+        with live.lock:
+            if action.action == LiveScoreActionEnum.UNDO:
+                live.undo()
+            elif action.player_id is None:
+                raise ValueError("player_id is required to score a point")
+            else:
+                live.score_point(action.player_id)
+            state, dirty = live.snapshot(), live.dirty
+    except ValueError as e:
+        return str(e)
+
+    broadcaster.publish(_live_channel(live.match_id), {"type": "score", **state})
+    if dirty:
+        try:
+            await run_in_threadpool(_flush_live_match, scoreboard, live)
+        except HTTPException as e:
+            return e.detail
+        except ConcurrentUpdateError as e:
+            return str(e)
+    return None
+
+
+def _umpire_token_valid(token: Optional[str]) -> bool:
+    """Umpire connections need LIVE_UMPIRE_TOKEN, when one is configured"""
+    if not config.LIVE_UMPIRE_TOKEN:
+        return True
+    return token is not None and hmac.compare_digest(token.encode(), config.LIVE_UMPIRE_TOKEN.encode())
+
+
+async def _forward_scores(websocket: WebSocket, subscription: Subscription) -> None:
+    while True:
+        await websocket.send_json(await subscription.get())
+
+
+async def _serve_live_connection(
+    websocket: WebSocket, scoreboard: LiveScoreboard, live: LiveMatch, umpire: bool
+) -> None:
+    """Send the score of a live match until the client leaves, applying the actions of an umpire"""
+    with broadcaster.subscribe(_live_channel(live.match_id)) as subscription:
+        with live.lock:
+            state = live.snapshot()
+        await websocket.send_json({"type": "score", **state})
+        forward = asyncio.create_task(_forward_scores(websocket, subscription))
+        try:
+            while True:
+                message = await websocket.receive_text()
+                if umpire:
+                    error = await _apply_live_action(scoreboard, live, message)
+                else:
+                    error = "Spectators can't send scoring actions"
+                if error:
+                    await websocket.send_json({"type": "error", "detail": error})
+        except WebSocketDisconnect:
+            pass
+        finally:
+            forward.cancel()
+            if live.dirty:
+                # A game whose write failed: try again before the umpire leaves
+                try:
+                    await run_in_threadpool(_flush_live_match, scoreboard, live)
+                except (HTTPException, ConcurrentUpdateError):
+                    logger.exception("Live score of match %d could not be written", live.match_id)
+
+
+# Live point-by-point scoring
+@router.websocket("/{match_id}/live")
+async def live_score(
+    websocket: WebSocket,
+    match_id: int,
+    role: LiveRoleEnum = Query(LiveRoleEnum.SPECTATOR, description="spectator (read-only) or umpire"),
+    token: Optional[str] = Query(None, description="Umpire token, when LIVE_UMPIRE_TOKEN is configured"),
+    scoreboard: LiveScoreboard = Depends(get_live_scoreboard),
+):
+    """
+    Live scoring channel of a match, for umpires and spectators.
+
+    On connection the current score is sent, then every change as
+    `{"type": "score", ...}` (finished games, points of the current game,
+    games won, winner). Umpires (`?role=umpire`, plus `&token=` when
+    LIVE_UMPIRE_TOKEN is set) send `{"action": "point", "player_id": ...}`
+    or `{"action": "undo"}` (last point of the current game); invalid
+    actions, and any action from a spectator, are answered with
+    `{"type": "error", "detail": ...}`.
+
+    Points are kept in memory: the match is written when a game ends
+    (player1_games, player2_games, games_score) and its result, with Elo,
+    when the match is decided.
+    """
+    await websocket.accept()
+    umpire = role == LiveRoleEnum.UMPIRE
+    if umpire and not _umpire_token_valid(token):
+        await websocket.send_json({"type": "error", "detail": "Invalid umpire token"})
+        await websocket.close(code=LIVE_UMPIRE_FORBIDDEN)
+        return
+    live = await run_in_threadpool(_load_live_match, scoreboard, match_id)
+    if live is None:
+        await websocket.send_json({"type": "error", "detail": "Match not found"})
+        await websocket.close(code=LIVE_MATCH_NOT_FOUND)
+        return
+
+    try:
+        await _serve_live_connection(websocket, scoreboard, live, umpire)
+    finally:
+        scoreboard.release(match_id)
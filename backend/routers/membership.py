@@ -14,25 +14,31 @@ Endpoints:
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from database import SessionLocal
-from models import Membership, Event, Player, MembershipStatus
+from database import get_db
+from models import Event, Membership, MembershipStatus, Player
 from schemas import (
-    MembershipCreate,
-    MembershipRead,
     MembershipAcceptInvite,
+    MembershipCreate,
     MembershipLeave,
-    MembershipSuspend,
     MembershipReactivate,
+    MembershipRead,
+    MembershipSuspend,
 )
+from utils.event_stream import MEMBERSHIP_CHANGED, publish_event_change
+from utils.idempotency import idempotency
 
 router = APIRouter(prefix="/members", tags=["members"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Rotas de criação/transição devolvem a resposta guardada de um Idempotency-Key repetido
+idempotent = Depends(idempotency(get_db))
+
+
+def _publish_membership(membership: Membership) -> Membership:
+    """Avisar o stream do evento (GET /events/{id}/stream) de um membership alterado (após o commit)"""
+    publish_event_change(
+        membership.event_id, MEMBERSHIP_CHANGED, MembershipRead.model_validate(membership).model_dump(mode="json")
+    )
+    return membership
 
 
 @router.get("/{event_id}", response_model=list[MembershipRead])
@@ -68,7 +74,7 @@ def list_memberships(
     return memberships
 
 
-@router.post("", response_model=MembershipRead)
+@router.post("", response_model=MembershipRead, dependencies=[idempotent])
 def create_membership(
     membership: MembershipCreate,
     db: Session = Depends(get_db),
@@ -114,7 +120,7 @@ def create_membership(
     db.add(new_membership)
     db.commit()
     db.refresh(new_membership)
-    return new_membership
+    return _publish_membership(new_membership)
 
 
 @router.get("/{id}", response_model=MembershipRead)
@@ -129,7 +135,7 @@ def get_membership(
     return membership
 
 
-@router.put("/{id}/accept", response_model=MembershipRead)
+@router.put("/{id}/accept", response_model=MembershipRead, dependencies=[idempotent])
 def accept_invite(
     id: int,
     db: Session = Depends(get_db),
@@ -156,10 +162,10 @@ def accept_invite(
     membership.accept_invite()
     db.commit()
     db.refresh(membership)
-    return membership
+    return _publish_membership(membership)
 
 
-@router.put("/{id}/leave", response_model=MembershipRead)
+@router.put("/{id}/leave", response_model=MembershipRead, dependencies=[idempotent])
 def leave_group(
     id: int,
     db: Session = Depends(get_db),
@@ -186,10 +192,10 @@ def leave_group(
     membership.leave_group()
     db.commit()
     db.refresh(membership)
-    return membership
+    return _publish_membership(membership)
 
 
-@router.put("/{id}/suspend", response_model=MembershipRead)
+@router.put("/{id}/suspend", response_model=MembershipRead, dependencies=[idempotent])
 def suspend_member(
     id: int,
     suspend_data: MembershipSuspend,
@@ -218,10 +224,10 @@ def suspend_member(
     membership.suspend_member(suspend_data.motivo_suspensao or "Sem motivo especificado")
     db.commit()
     db.refresh(membership)
-    return membership
+    return _publish_membership(membership)
 
 
-@router.put("/{id}/reactivate", response_model=MembershipRead)
+@router.put("/{id}/reactivate", response_model=MembershipRead, dependencies=[idempotent])
 def reactivate_member(
     id: int,
     db: Session = Depends(get_db),
@@ -248,4 +254,4 @@ def reactivate_member(
     membership.reactivate()
     db.commit()
     db.refresh(membership)
-    return membership
+    return _publish_membership(membership)
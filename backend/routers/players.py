@@ -2,30 +2,51 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 # SQLAlchemy imports for database session management
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database import SessionLocal
+from database import get_async_db, get_db
 
 # Import models
 from models.event import Event
-from models.player import Player
+from models.player import Player, player_key
+from models.player_stats import PlayerEventStats
 
 # Import schemas
-from schemas import PlayerCreate, PlayerRead, PlayerUpdate
+from schemas import (
+    HeadToHeadResponse,
+    PlayerCreate,
+    PlayerRead,
+    PlayerStatsRead,
+    PlayerUpdate,
+    RatingHistoryResponse,
+)
+from utils.concurrency import ConcurrentUpdateError, retry_on_conflict
+from utils.event_stream import RANKING_CHANGED, publish_event_change
+from utils.head_to_head import head_to_head
+from utils.idempotency import idempotency
+from utils.player_ranking import rank_player, unrank_player
+from utils.player_stats import move_global_stats, withdraw_global_stats
+from utils.rating_history import rating_history_series
 
 # Router for player-related endpoints
 router = APIRouter(prefix="/players", tags=["players"])
 
-def get_db():
-    db = SessionLocal()
+# Create/update routes replay the stored response of a retried Idempotency-Key
+idempotent = Depends(idempotency(get_db))
+
+
+def _commit_with_retry(db: Session, operation):
+    """Run and commit a player write, retried when a match result changes the player meanwhile (409 if it keeps failing)"""
     try:
-        yield db
-    finally:
-        db.close()
+        return retry_on_conflict(db, operation)
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from None
 
 
 # Register a new player in an event
-@router.post("", response_model=PlayerRead, status_code=201)
+@router.post("", response_model=PlayerRead, status_code=201, dependencies=[idempotent])
 def register_player(player_data: PlayerCreate, db: Session = Depends(get_db)):
     """
     Register a new player for an event.
@@ -34,22 +55,33 @@ def register_player(player_data: PlayerCreate, db: Session = Depends(get_db)):
 
     - **name**: Player's name (1-100 characters)
     - **event_id**: Event ID player is registering for
+    - **player_key**: Identity across events for the global leaderboard
+      (optional, defaults to the normalized name: give namesakes distinct keys)
     """
     # Verify event exists (active or inactive)
     event = db.query(Event).filter(Event.id == player_data.event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
+    player = _commit_with_retry(db, lambda: _add_player(db, player_data))
+    db.refresh(player)
+    publish_event_change(player.event_id, RANKING_CHANGED)
+    return player
+
+
+def _add_player(db: Session, player_data: PlayerCreate) -> Player:
+    """Insert the player and give them their ranking position; the caller commits"""
     player = Player(name=player_data.name, event_id=player_data.event_id)
+    if player_data.player_key is not None:
+        player.player_key = player_key(player_data.player_key)
     db.add(player)
-    db.commit()
-    db.refresh(player)
+    rank_player(db, player)
     return player
 
 
 # List all players in an event
 @router.get("", response_model=list[PlayerRead])
-def list_players(event_id: int = Query(..., gt=0), db: Session = Depends(get_db)):
+async def list_players(event_id: int = Query(..., gt=0), db: AsyncSession = Depends(get_async_db)):
     """
     List all active players in an event.
     
@@ -58,14 +90,14 @@ def list_players(event_id: int = Query(..., gt=0), db: Session = Depends(get_db)
     - **event_id**: Event ID to filter players
     """
     # Verify event exists (active or inactive)
-    event = db.query(Event).filter(Event.id == event_id).first()
+    event = await db.get(Event, event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    return db.query(Player).filter(
+    return (await db.scalars(select(Player).where(
         Player.event_id == event_id,
         Player.active
-    ).all()
+    ))).all()
 
 # List all active players (for system stats)
 @router.get("/all", response_model=list[PlayerRead])
@@ -75,42 +107,122 @@ def list_all_players(db: Session = Depends(get_db)):
 
 # Get a specific player
 @router.get("/{player_id}", response_model=PlayerRead)
-def get_player(player_id: int, db: Session = Depends(get_db)):
+async def get_player(player_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get details of a specific player"""
-    player = db.query(Player).filter(Player.id == player_id).first()
+    player = await db.get(Player, player_id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     return player
 
+# Get a player's statistics in their event
+@router.get("/{player_id}/stats", response_model=PlayerStatsRead)
+def get_player_stats(player_id: int, db: Session = Depends(get_db)):
+    """
+    Get wins, losses, games and last played date of a player.
+
+    Served from the materialized player_event_stats table (single primary-key lookup).
+    """
+    stats = db.query(PlayerEventStats).filter(PlayerEventStats.player_id == player_id).first()
+    if stats:
+        return stats
+
+    player = db.query(Player).filter(Player.id == player_id).first()
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return PlayerStatsRead(player_id=player.id, event_id=player.event_id)
+
+# Head-to-head statistics between two players
+@router.get("/{player_a_id}/vs/{player_b_id}", response_model=HeadToHeadResponse)
+def player_head_to_head(
+    player_a_id: int,
+    player_b_id: int,
+    last: int = Query(5, ge=0, le=50, description="Number of most recent results to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get head-to-head statistics of player A against player B: wins, games,
+    net Elo swing and the most recent results.
+
+    The Elo swing sums the rating changes recorded when each result was reported.
+    """
+    if player_a_id == player_b_id:
+        raise HTTPException(status_code=400, detail="Head-to-head needs two different players")
+    found = db.query(Player.id).filter(Player.id.in_((player_a_id, player_b_id))).count()
+    if found != 2:
+        raise HTTPException(status_code=404, detail="Player not found")
+
+    return head_to_head(db, player_a_id, player_b_id, last)
+
+# Get a player's Elo rating history
+@router.get("/{player_id}/rating-history", response_model=RatingHistoryResponse)
+def get_rating_history(
+    player_id: int,
+    points: int = Query(200, ge=2, le=5000, description="Maximum number of points to return"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the evolution of a player's Elo rating, oldest first.
+
+    Long histories are downsampled to at most **points** entries (always keeping
+    the first and the latest one), so the response size doesn't grow with history.
+    """
+    player = db.query(Player).filter(Player.id == player_id).first()
+    if not player:
+        raise HTTPException(status_code=404, detail="Player not found")
+
+    total, rows = rating_history_series(db, player_id, points)
+    return RatingHistoryResponse(player_id=player_id, total_points=total, points=rows)
+
 # Update a player
-@router.put("/{player_id}", response_model=PlayerRead)
+@router.put("/{player_id}", response_model=PlayerRead, dependencies=[idempotent])
 def update_player(player_id: int, player_data: PlayerUpdate, db: Session = Depends(get_db)):
     """
     Update player information.
 
-    - **name**: Player's name (optional)
-    - **score**: Player's score (optional)
-    - **ranking**: Player's ranking (optional)
+    - **name**: Player's name (optional); the player_key is kept, so the
+      global leaderboard history follows the player
+    - **player_key**: Identity across events (optional); the player's totals
+      move to the new key
+
+    Score and ranking follow from the match results (Elo replay and dense
+    rank) and can't be set directly.
     """
+    player = _commit_with_retry(db, lambda: _update_player(db, player_id, player_data))
+    db.refresh(player)
+    publish_event_change(player.event_id, RANKING_CHANGED)
+    return player
+
+
+def _update_player(db: Session, player_id: int, player_data: PlayerUpdate) -> Player:
+    """Read and change the player (one attempt of update_player); the caller commits"""
     player = db.query(Player).filter(Player.id == player_id).first()
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
 
-    update_data = player_data.model_dump(exclude_unset=True)
+    update_data = player_data.model_dump(exclude_unset=True, exclude_none=True)
+    if "player_key" in update_data:
+        update_data["player_key"] = player_key(update_data["player_key"])
+        move_global_stats(db, player, update_data["player_key"])
     for field, value in update_data.items():
         setattr(player, field, value)
-
-    db.commit()
-    db.refresh(player)
     return player
 
 # Delete a player (soft delete)
 @router.delete("/{player_id}")
 def delete_player(player_id: int, db: Session = Depends(get_db)):
     """Soft delete a player (mark as inactive)"""
+    event_id = _commit_with_retry(db, lambda: _deactivate_player(db, player_id))
+    publish_event_change(event_id, RANKING_CHANGED)
+    return {"detail": "Player marked as inactive"}
+
+
+def _deactivate_player(db: Session, player_id: int) -> int:
+    """Read and deactivate the player (one attempt of delete_player); returns the event ID"""
     player = db.query(Player).filter(Player.id == player_id).first()
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
+    if player.active:
+        unrank_player(db, player)
+        withdraw_global_stats(db, player)
     player.active = False
-    db.commit()
-    return {"detail": "Player marked as inactive"}
+    return player.event_id
@@ -1,103 +1,378 @@
-
-
 # FastAPI imports for API routing and dependency injection
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func, select
 
 # SQLAlchemy imports for database session management
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database import SessionLocal
+from database import get_async_db, get_db
 from models.event import Event
-from models.match import Match
 
-# Import Player and Match models
+# Import Player and PlayerEventStats models
 from models.player import Player
+from models.player_stats import GlobalPlayerStats, PlayerEventStats
 
 # Import schemas
-from schemas import RankingEntry
+from schemas import (
+    GlobalRankingEntry,
+    GlobalRankingSortEnum,
+    RankedEntry,
+    RankingAroundResponse,
+    RankingEntry,
+    RankingSortEnum,
+)
+from utils.elo_replay import event_ratings_as_of
+from utils.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_condition,
+    order_by_clauses,
+    paginate_rows,
+    row_key,
+)
+from utils.player_stats import win_rate
 
 # Router for ranking endpoints
 router = APIRouter(prefix="/ranking", tags=["ranking"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Sort orders: (column, direction) pairs, each ending with the player id for stable ties.
+# Each one is backed by an index (see models): players(event_id, active, elo_rating),
+# player_event_stats(event_id, wins, win_rate) and player_event_stats(event_id, win_rate, wins).
+RANKING_SORTS = {
+    RankingSortEnum.ELO: (
+        (Player.elo_rating, "desc"),
+        (Player.id, "asc"),
+    ),
+    RankingSortEnum.WINS: (
+        (PlayerEventStats.wins, "desc"),
+        (PlayerEventStats.win_rate, "desc"),
+        (PlayerEventStats.player_id, "asc"),
+    ),
+    RankingSortEnum.WIN_RATE: (
+        (PlayerEventStats.win_rate, "desc"),
+        (PlayerEventStats.wins, "desc"),
+        (PlayerEventStats.player_id, "asc"),
+    ),
+}
+
+# Result keys matching the RANKING_SORTS columns, used to build cursors
+RANKING_SORT_KEYS = {
+    RankingSortEnum.ELO: ("elo", "player_id"),
+    RankingSortEnum.WINS: ("wins", "win_rate", "player_id"),
+    RankingSortEnum.WIN_RATE: ("win_rate", "wins", "player_id"),
+}
+
+# Global leaderboard sort orders, backed by global_player_stats(wins, win_rate) and (win_rate, wins)
+GLOBAL_RANKING_SORTS = {
+    GlobalRankingSortEnum.WINS: (
+        (GlobalPlayerStats.wins, "desc"),
+        (GlobalPlayerStats.win_rate, "desc"),
+        (GlobalPlayerStats.player_key, "asc"),
+    ),
+    GlobalRankingSortEnum.WIN_RATE: (
+        (GlobalPlayerStats.win_rate, "desc"),
+        (GlobalPlayerStats.wins, "desc"),
+        (GlobalPlayerStats.player_key, "asc"),
+    ),
+}
+
+GLOBAL_RANKING_SORT_KEYS = {
+    GlobalRankingSortEnum.WINS: ("wins", "win_rate", "player_key"),
+    GlobalRankingSortEnum.WIN_RATE: ("win_rate", "wins", "player_key"),
+}
+
+# Cross-event leaderboard (declared before /{event_id} so "global" isn't parsed as an ID)
+@router.get("/global", response_model=list[GlobalRankingEntry])
+async def global_ranking(
+    response: Response,
+    sort: GlobalRankingSortEnum = Query(GlobalRankingSortEnum.WINS, description="Sort by wins or win_rate"),
+    limit: int = Query(50, ge=1, le=500, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the leaderboard across all events.
+
+    Active players of different events are grouped by player_key (the
+    normalized name unless set at registration). Totals are read from the
+    incrementally maintained global_player_stats table, one index range per page.
+
+    - **sort**: `wins` (default) or `win_rate`
+    - **limit** / **cursor**: keyset pagination; the next page's cursor is
+      returned in the `X-Next-Cursor` response header
+    """
+    spec = GLOBAL_RANKING_SORTS[sort]
+    stmt = select(GlobalPlayerStats).order_by(*order_by_clauses(spec))
+    if cursor is not None:
+        try:
+            values = decode_cursor(cursor, f"global:{sort.value}", len(spec))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from None
+        stmt = stmt.where(keyset_condition(spec, values))
+
+    rows, has_more = paginate_rows((await db.scalars(stmt.limit(limit + 1))).all(), limit)
+    if has_more:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            f"global:{sort.value}", [getattr(last, key) for key in GLOBAL_RANKING_SORT_KEYS[sort]]
+        )
+    return rows
 
 
 # Get ranking of players in an event based on match wins
 @router.get("", response_model=list[RankingEntry])
-def event_ranking(event_id: int = Query(..., gt=0), db: Session = Depends(get_db)):
+async def event_ranking(
+    response: Response,
+    event_id: int = Query(..., gt=0),
+    sort: RankingSortEnum = Query(RankingSortEnum.WINS, description="Sort by elo, wins or win_rate"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (default: whole ranking)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    as_of: Optional[str] = Query(None, description="ISO timestamp or match ID: ranking at that point in time"),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Get player ranking for an event based on wins/losses.
 
     - **event_id**: Event ID to get ranking for (query parameter)
+    - **sort**: `wins` (default), `win_rate` or `elo`
+    - **limit** / **cursor**: keyset pagination; the next page's cursor is
+      returned in the `X-Next-Cursor` response header
+    - **as_of**: ranking after the results recorded up to an ISO timestamp, or
+      up to and including a match ID (no cursor pagination)
 
     Returns players sorted by wins (descending) then by win rate (descending)
     """
-    return _get_ranking_data(event_id, db)
+    return await db.run_sync(
+        lambda sync_session: _get_ranking_page(event_id, sync_session, response, sort, limit, cursor, as_of)
+    )
 
 
 # Alternative route: Get ranking using path parameter
 @router.get("/{event_id}", response_model=list[RankingEntry])
-def event_ranking_path(event_id: int, db: Session = Depends(get_db)):
+async def event_ranking_path(
+    event_id: int,
+    response: Response,
+    sort: RankingSortEnum = Query(RankingSortEnum.WINS, description="Sort by elo, wins or win_rate"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (default: whole ranking)"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    as_of: Optional[str] = Query(None, description="ISO timestamp or match ID: ranking at that point in time"),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Get player ranking for an event based on wins/losses (alternative route with path parameter).
 
     - **event_id**: Event ID to get ranking for (path parameter)
+    - **sort**: `wins` (default), `win_rate` or `elo`
+    - **limit** / **cursor**: keyset pagination; the next page's cursor is
+      returned in the `X-Next-Cursor` response header
+    - **as_of**: ranking after the results recorded up to an ISO timestamp, or
+      up to and including a match ID (no cursor pagination)
 
     Returns players sorted by wins (descending) then by win rate (descending)
     """
-    return _get_ranking_data(event_id, db)
+    return await db.run_sync(
+        lambda sync_session: _get_ranking_page(event_id, sync_session, response, sort, limit, cursor, as_of)
+    )
+
+
+# Get a player's position and the players ranked right above and below
+@router.get("/{event_id}/around/{player_id}", response_model=RankingAroundResponse)
+def ranking_around_player(
+    event_id: int,
+    player_id: int,
+    window: int = Query(3, ge=0, le=50, description="Number of players to return above and below"),
+    sort: RankingSortEnum = Query(RankingSortEnum.WINS, description="Sort by elo, wins or win_rate"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a player's exact position in an event ranking and up to `window`
+    neighbors on each side.
+
+    The position is an index range count of the players ranked ahead, and the
+    neighbors are two LIMIT `window` keyset reads, so the cost depends on
+    `window`, not on the size of the event.
+    """
+    event = db.query(Event).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    spec = RANKING_SORTS[sort]
+    stmt = _ranking_statement(event_id, sort)
+    player_row = db.execute(stmt.where(Player.id == player_id)).mappings().first()
+    if player_row is None:
+        raise HTTPException(status_code=404, detail="Player not ranked in this event")
+
+    values = row_key(player_row, RANKING_SORT_KEYS[sort])
+    ahead = stmt.where(keyset_condition(spec, values, before=True))
+    position = db.scalar(select(func.count()).select_from(ahead.order_by(None).subquery())) + 1
+    behind = stmt.where(keyset_condition(spec, values))
+    total = position + db.scalar(select(func.count()).select_from(behind.order_by(None).subquery()))
+
+    above = db.execute(
+        ahead.order_by(None).order_by(*order_by_clauses(spec, reverse=True)).limit(window)
+    ).mappings().all()
+    below = db.execute(behind.limit(window)).mappings().all()
+
+    rows = list(reversed(above)) + [player_row] + list(below)
+    first = position - len(above)
+    return RankingAroundResponse(
+        event_id=event_id,
+        player_id=player_id,
+        sort=sort,
+        position=position,
+        total=total,
+        entries=[RankedEntry(**row, position=first + i) for i, row in enumerate(rows)],
+    )
+
+
+def _ranking_statement(event_id: int, sort: RankingSortEnum = RankingSortEnum.WINS):
+    """
+    Build the ranking query for an event.
+
+    Wins, losses and win rate are read from the materialized player_event_stats
+    table (every player has a row, created on insert), so the cost doesn't depend
+    on the number of matches. Ordering is done in SQL along an index, so a LIMIT
+    only reads the rows it returns.
+    """
+    stmt = (
+        select(
+            Player.id.label("player_id"),
+            Player.name,
+            Player.elo_rating.label("elo"),
+            Player.ranking,
+            PlayerEventStats.wins,
+            PlayerEventStats.losses,
+            PlayerEventStats.win_rate,
+        )
+        .where(Player.active.is_(True))
+        .order_by(*order_by_clauses(RANKING_SORTS[sort]))
+    )
+    if sort == RankingSortEnum.ELO:
+        # Drive from players(event_id, active, elo_rating)
+        return (
+            stmt.select_from(Player)
+            .join(PlayerEventStats, PlayerEventStats.player_id == Player.id)
+            .where(Player.event_id == event_id)
+        )
+    # Drive from the stats index for the requested sort
+    return (
+        stmt.select_from(PlayerEventStats)
+        .join(Player, Player.id == PlayerEventStats.player_id)
+        .where(PlayerEventStats.event_id == event_id)
+    )
 
 
-def _get_ranking_data(event_id: int, db: Session):
-    """Helper function to get ranking data"""
+def _get_ranking_data(
+    event_id: int,
+    db: Session,
+    sort: RankingSortEnum = RankingSortEnum.WINS,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+):
+    """
+    Helper function to get ranking data
+
+    Returns:
+        Tuple of (list of RankingEntry, cursor of the next page or None)
+    """
     # Verify event exists (active or inactive)
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    players = db.query(Player).filter(
-        Player.event_id == event_id,
-        Player.active
+    spec = RANKING_SORTS[sort]
+    stmt = _ranking_statement(event_id, sort)
+    if cursor is not None:
+        try:
+            values = decode_cursor(cursor, sort.value, len(spec))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from None
+        stmt = stmt.where(keyset_condition(spec, values))
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+
+    rows, has_more = paginate_rows(db.execute(stmt).mappings().all(), limit)
+    next_cursor = encode_cursor(sort.value, row_key(rows[-1], RANKING_SORT_KEYS[sort])) if has_more else None
+    return [RankingEntry(**row) for row in rows], next_cursor
+
+
+def _parse_as_of(as_of: str) -> dict:
+    """Parse an as_of value into event_ratings_as_of keyword arguments"""
+    if as_of.isdigit():
+        return {"match_id": int(as_of)}
+    try:
+        timestamp = datetime.fromisoformat(as_of)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="as_of must be an ISO timestamp or a match ID") from None
+    # finished_at is stored as naive UTC
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return {"timestamp": timestamp}
+
+
+def _get_ranking_as_of(
+    event_id: int,
+    db: Session,
+    as_of: str,
+    sort: RankingSortEnum = RankingSortEnum.WINS,
+    limit: Optional[int] = None,
+):
+    """
+    Ranking of the event's active players after the results recorded up to `as_of`.
+
+    Ratings come from the nearest rating checkpoint plus a short replay
+    (see utils.elo_replay.event_ratings_as_of); nothing is written, so this
+    runs on the read-only pool.
+    """
+    event = db.query(Event).filter(Event.id == event_id).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    state = event_ratings_as_of(db, event_id, **_parse_as_of(as_of))
+    if state is None:
+        raise HTTPException(status_code=400, detail="as_of match is not a finished match of this event")
+
+    players = db.execute(
+        select(Player.id, Player.name).where(Player.event_id == event_id, Player.active.is_(True))
     ).all()
+    # (player_id, name, elo, wins, losses, win_rate), sorted before building the response page
+    rows = []
+    for player_id, name in players:
+        rating, wins, played = state[player_id]
+        rows.append((player_id, name, rating, wins, played - wins, win_rate(wins, played - wins)))
+    sort_keys = {
+        RankingSortEnum.ELO: lambda row: (-row[2], row[0]),
+        RankingSortEnum.WINS: lambda row: (-row[3], -row[5], row[0]),
+        RankingSortEnum.WIN_RATE: lambda row: (-row[5], -row[3], row[0]),
+    }
+    rows.sort(key=sort_keys[sort])
+
+    ratings = sorted({row[2] for row in rows}, reverse=True)
+    dense_rank = {rating: rank for rank, rating in enumerate(ratings, start=1)}
+    return [
+        RankingEntry(
+            player_id=player_id, name=name, elo=rating, ranking=dense_rank[rating],
+            wins=wins, losses=losses, win_rate=rate,
+        )
+        for player_id, name, rating, wins, losses, rate in (rows[:limit] if limit is not None else rows)
+    ]
+
 
-    ranking_data = []
-
-    for player in players:
-        # Count wins
-        wins = db.query(func.count(Match.id)).filter(
-            Match.event_id == event_id,
-            Match.winner_id == player.id,
-            Match.finished
-        ).scalar() or 0
-
-        # Count losses
-        losses = db.query(func.count(Match.id)).filter(
-            Match.event_id == event_id,
-            ((Match.player1_id == player.id) | (Match.player2_id == player.id)),
-            Match.finished,
-            Match.winner_id != player.id
-        ).scalar() or 0
-
-        total_matches = wins + losses
-        win_rate = (wins / total_matches) if total_matches > 0 else 0.0
-
-        ranking_data.append(RankingEntry(
-            player_id=player.id,
-            name=player.name,
-            elo=player.elo_rating,
-            wins=wins,
-            losses=losses,
-            win_rate=round(win_rate, 2)
-        ))
-
-    # Sort by wins (desc), then by win_rate (desc)
-    ranking_data.sort(key=lambda x: (x.wins, x.win_rate), reverse=True)
-
-    return ranking_data
+def _get_ranking_page(event_id, db, response, sort, limit, cursor, as_of=None):
+    """Run _get_ranking_data and expose the next page's cursor as a response header"""
+    if as_of is not None:
+        if cursor is not None:
+            raise HTTPException(status_code=400, detail="cursor can't be combined with as_of")
+        return _get_ranking_as_of(event_id, db, as_of, sort, limit)
 
+    entries, next_cursor = _get_ranking_data(event_id, db, sort, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return entries
@@ -5,18 +5,24 @@ Handles CRUD operations for tournaments and tournament-related functionality.
 Supports 4 tournament types: Single Elimination, Swiss, Group+Knockout, Round Robin.
 """
 
+from datetime import datetime
+from typing import List, Optional
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
 
-from database import SessionLocal
-from models import Tournament, Event, Player, Match, TournamentStatus
+from database import get_db
+from models import Event, Match, Player, Tournament, TournamentStatus
 from schemas import (
-    TournamentCreate, TournamentRead, TournamentUpdate,
-    TournamentAddParticipant, TournamentRemoveParticipant,
-    TournamentStart, TournamentAdvanceRound, TournamentFinish,
-    TournamentCancel
+    TournamentAddParticipant,
+    TournamentAdvanceRound,
+    TournamentCancel,
+    TournamentCreate,
+    TournamentFinish,
+    TournamentRead,
+    TournamentRemoveParticipant,
+    TournamentStart,
+    TournamentUpdate,
 )
 
 router = APIRouter(
@@ -26,15 +32,6 @@ router = APIRouter(
 )
 
 
-# Dependency to get a database session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ============ Helper Functions ============
 
 def get_tournament_or_404(tournament_id: int, db: Session) -> Tournament:
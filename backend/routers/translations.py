@@ -7,23 +7,17 @@ Provides RESTful endpoints for:
 - Caching and cache invalidation
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from database import SessionLocal
-from models.translation import TranslationMessage, LocaleConfig, TranslationAudit
-from schemas import TranslationSchema, LocaleConfigSchema
 from datetime import datetime
 
-router = APIRouter(prefix="/i18n", tags=["i18n"])
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from database import get_db
+from models.translation import LocaleConfig, TranslationAudit, TranslationMessage
+from schemas import LocaleConfigSchema, TranslationSchema
 
+router = APIRouter(prefix="/i18n", tags=["i18n"])
 
 # ============================================================================
 # PUBLIC ENDPOINTS (for frontend)
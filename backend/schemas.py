@@ -1,8 +1,8 @@
 # Pydantic schemas for request/response validation
 import re
 from datetime import datetime
-from typing import Optional
 from enum import Enum
+from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
@@ -69,6 +69,10 @@ class PlayerCreate(BaseModel):
     """Schema for creating a new player"""
     name: str = Field(..., min_length=1, max_length=100, description="Player name")
     event_id: int = Field(..., gt=0, description="Event ID the player is registering for")
+    player_key: Optional[str] = Field(
+        None, min_length=1, max_length=100,
+        description="Identity across events for the global leaderboard (default: the normalized name)"
+    )
 
 class TranslationMessageCreate(BaseModel):
     """Schema for creating a translation message"""
@@ -126,12 +130,69 @@ class PlayerRead(BaseModel):
     ranking: int
     elo_rating: Optional[float] = None
     active: bool
+    player_key: str
+
+class PlayerStatsRead(BaseModel):
+    """Schema for reading a player's materialized event statistics"""
+    model_config = ConfigDict(from_attributes=True)
+
+    player_id: int
+    event_id: int
+    wins: int = 0
+    losses: int = 0
+    win_rate: float = 0.0
+    games_won: int = 0
+    games_lost: int = 0
+    matches_played: int = 0
+    last_played_at: Optional[datetime] = None
+
+class RatingHistoryPoint(BaseModel):
+    """Schema for one entry of the rating history ledger"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    match_id: Optional[int] = None
+    reason: str = Field(description="'match' for a match result, 'replay' for a replay correction")
+    rating_before: float
+    rating_after: float
+    delta: float
+    k_factor: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+class RatingHistoryResponse(BaseModel):
+    """Schema for a player's (downsampled) rating history"""
+    player_id: int
+    total_points: int = Field(description="Number of entries in the full history")
+    points: list[RatingHistoryPoint]
+
+class HeadToHeadResult(BaseModel):
+    """One finished match between two players, from player A's point of view"""
+    match_id: int
+    finished_at: Optional[datetime] = None
+    winner_id: int
+    player_a_games: int
+    player_b_games: int
+    player_a_elo_change: Optional[float] = Field(None, description="Player A's recorded rating change")
+
+class HeadToHeadResponse(BaseModel):
+    """Schema for head-to-head statistics between two players"""
+    player_a_id: int
+    player_b_id: int
+    matches_played: int
+    player_a_wins: int
+    player_b_wins: int
+    player_a_games: int = Field(description="Games won by player A in these matches")
+    player_b_games: int = Field(description="Games won by player B in these matches")
+    player_a_elo_swing: float = Field(description="Net rating change of player A in these matches")
+    player_b_elo_swing: float = Field(description="Net rating change of player B in these matches")
+    last_results: list[HeadToHeadResult] = Field(description="Most recent results first")
 
 class PlayerUpdate(BaseModel):
-    """Schema for updating player data"""
+    """Schema for updating player data (score and ranking are derived from the results: rejected)"""
+    model_config = ConfigDict(extra="forbid")
+
     name: Optional[str] = Field(None, min_length=1, max_length=100)
-    score: Optional[int] = Field(None, ge=0)
-    ranking: Optional[int] = Field(None, ge=0)
+    player_key: Optional[str] = Field(None, min_length=1, max_length=100)
 
 # ============ Match Schemas ============
 class MatchCreate(BaseModel):
@@ -169,6 +230,62 @@ class MatchRead(BaseModel):
     games_score: Optional[str] = None
 
 
+class MatchOrderEnum(str, Enum):
+    """Match listing orders (by match ID)"""
+    ASC = "asc"
+    DESC = "desc"
+
+
+class MatchExportFormatEnum(str, Enum):
+    """Encodings of the streaming match export"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class MatchBulkError(BaseModel):
+    """Schema for a rejected row of a bulk match import"""
+    row: int = Field(..., description="Row number in the submitted batch (1-based)")
+    detail: str
+
+
+class MatchBulkResponse(BaseModel):
+    """Schema for the report of a bulk match import"""
+    received: int = Field(description="Number of rows submitted")
+    imported: int = Field(description="Number of matches created")
+    match_ids: list[int] = Field(description="IDs of the created matches, in submission order")
+    errors: list[MatchBulkError] = Field(default_factory=list)
+
+
+class MatchTicketStatusEnum(str, Enum):
+    """States of a queued match result"""
+    QUEUED = "queued"
+    APPLIED = "applied"
+    REJECTED = "rejected"
+
+
+class MatchTicket(BaseModel):
+    """Schema for a match result submitted to the write-behind queue"""
+    model_config = ConfigDict(from_attributes=True)
+
+    ticket_id: str
+    status: MatchTicketStatusEnum
+    match_id: Optional[int] = Field(None, description="ID of the created match, once applied")
+    detail: Optional[str] = Field(None, description="Why the result was rejected")
+
+
+class MatchQueueMetrics(BaseModel):
+    """Schema for the write-behind queue metrics"""
+    queue_depth: int = Field(description="Results waiting to be applied")
+    oldest_pending_seconds: float = Field(description="Age of the oldest waiting result (current lag)")
+    last_lag_seconds: float = Field(description="Submission-to-commit delay of the last batch's first result")
+    max_lag_seconds: float
+    applied_total: int
+    rejected_total: int
+    batches_total: int
+    last_batch_size: int
+    writer_running: bool
+
+
 class MatchResultResponse(BaseModel):
     """Schema for match result with ELO calculations"""
     match_id: int
@@ -184,6 +301,27 @@ class MatchResultResponse(BaseModel):
     player1_k_factor: int = Field(description="K-factor used for player 1")
     player2_k_factor: int = Field(description="K-factor used for player 2")
 
+class EloReplayResult(BaseModel):
+    """Schema for the result of an Elo replay"""
+    event_id: int
+    matches_replayed: int = Field(description="Finished matches replayed in order")
+    players_updated: int = Field(description="Players whose rating and score were recomputed")
+
+class WinMatrixFormatEnum(str, Enum):
+    """Encodings of the win-probability matrix"""
+    JSON = "json"
+    BINARY = "binary"
+
+
+class WinMatrixResponse(BaseModel):
+    """Schema for an event's pairwise win probabilities"""
+    event_id: int
+    player_ids: list[int] = Field(description="Active players, by Elo rating (descending)")
+    ratings: list[float]
+    probabilities: list[list[float]] = Field(
+        description="probabilities[i][j] = probability that player_ids[i] beats player_ids[j]"
+    )
+
 class MatchUpdate(BaseModel):
     """Schema for updating match data"""
     winner_id: Optional[int] = Field(None, gt=0, description="Winning player ID")
@@ -192,7 +330,32 @@ class MatchUpdate(BaseModel):
     games_score: Optional[str] = Field(None, description="Detailed score per game")
     finished: Optional[bool] = Field(None, description="Whether the match is finished")
 
+
+class LiveRoleEnum(str, Enum):
+    """Role of a live scoring connection"""
+    SPECTATOR = "spectator"  # receives the score
+    UMPIRE = "umpire"  # also sends scoring actions
+
+
+class LiveScoreActionEnum(str, Enum):
+    """Umpire actions on the live scoring channel"""
+    POINT = "point"
+    UNDO = "undo"
+
+
+class LiveScoreAction(BaseModel):
+    """Message sent by an umpire over the live scoring WebSocket"""
+    action: LiveScoreActionEnum
+    player_id: Optional[int] = Field(None, gt=0, description="Player who won the point (for action=point)")
+
 # ============ Ranking Schemas ============
+class RankingSortEnum(str, Enum):
+    """Ranking sort options"""
+    ELO = "elo"
+    WINS = "wins"
+    WIN_RATE = "win_rate"
+
+
 class RankingEntry(BaseModel):
     """Schema for ranking entry"""
     model_config = ConfigDict(from_attributes=True)
@@ -200,10 +363,46 @@ class RankingEntry(BaseModel):
     player_id: int
     name: str
     elo: float = Field(default=1600.0, description="ELO rating")
+    ranking: int = Field(default=0, ge=0, description="Dense rank by Elo rating (0 = unranked)")
     wins: int = Field(default=0, ge=0)
     losses: int = Field(default=0, ge=0)
     win_rate: float = Field(default=0.0, ge=0.0, le=1.0)
 
+class GlobalRankingSortEnum(str, Enum):
+    """Global leaderboard sort options"""
+    WINS = "wins"
+    WIN_RATE = "win_rate"
+
+
+class GlobalRankingEntry(BaseModel):
+    """Schema for a cross-event leaderboard entry"""
+    model_config = ConfigDict(from_attributes=True)
+
+    player_key: str = Field(..., description="Identity of the player across events (Player.player_key)")
+    name: str
+    wins: int = Field(default=0, ge=0)
+    losses: int = Field(default=0, ge=0)
+    win_rate: float = Field(default=0.0, ge=0.0, le=1.0)
+    games_won: int = Field(default=0, ge=0)
+    games_lost: int = Field(default=0, ge=0)
+    matches_played: int = Field(default=0, ge=0)
+
+
+class RankedEntry(RankingEntry):
+    """Ranking entry with its 1-based position in the ranking"""
+    position: int = Field(..., ge=1)
+
+
+class RankingAroundResponse(BaseModel):
+    """Schema for a player's position and neighbors in a ranking"""
+    event_id: int
+    player_id: int
+    sort: RankingSortEnum
+    position: int = Field(..., ge=1, description="Player's 1-based position")
+    total: int = Field(..., ge=1, description="Number of ranked players")
+    entries: list[RankedEntry]
+
+
 class RankingResponse(BaseModel):
     """Schema for ranking response"""
     model_config = ConfigDict(from_attributes=True)
@@ -1,5 +1,13 @@
 """Utilities package"""
 
 from .bracket_generator import BracketGenerator
+from .player_ranking import rerank_players
+from .player_stats import apply_match_stats, find_player_stats_drift, rebuild_player_stats
 
-__all__ = ["BracketGenerator"]
+__all__ = [
+    "BracketGenerator",
+    "apply_match_stats",
+    "find_player_stats_drift",
+    "rebuild_player_stats",
+    "rerank_players",
+]
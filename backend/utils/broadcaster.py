@@ -0,0 +1,103 @@
+"""
+In-Process Broadcaster
+
+Fans out messages published on a channel (e.g. "match:42") to every
+subscriber of that channel, so one change reaches all open screens without
+each of them querying the database.
+
+publish() may be called from any thread (sync endpoints run in the
+threadpool); each subscriber receives messages on its own event loop through a
+bounded queue. A subscriber that falls max_pending messages behind loses the
+oldest ones rather than holding memory or slowing the publisher down.
+
+Subscribers only see messages published by this process: with several server
+workers, each one has its own broadcaster.
+"""
+
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Set
+
+# Messages kept for a subscriber that doesn't keep up
+MAX_PENDING_MESSAGES = 100
+
+
+class Subscription:
+    """Messages of one channel for one subscriber, read with `await get()`"""
+
+    def __init__(self, broadcaster: "Broadcaster", channel: str, max_pending: int):
+        self.broadcaster = broadcaster
+        self.channel = channel
+        self.dropped = 0
+        self._loop = asyncio.get_running_loop()
+        self._messages: "asyncio.Queue" = asyncio.Queue(maxsize=max_pending)
+
+    async def get(self) -> Any:
+        """Next message (waits until one is published)"""
+        return await self._messages.get()
+
+    def close(self) -> None:
+        self.broadcaster._unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _deliver(self, message: Any) -> None:
+        """Queue a message, dropping the oldest if full (runs on the subscriber's loop)"""
+        if self._messages.full():
+            self._messages.get_nowait()
+            self.dropped += 1
+        self._messages.put_nowait(message)
+
+
+class Broadcaster:
+    """Channel-based publish/subscribe within one process"""
+
+    def __init__(self, max_pending: int = MAX_PENDING_MESSAGES):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._channels: Dict[str, Set[Subscription]] = defaultdict(set)
+
+    def subscribe(self, channel: str) -> Subscription:
+        """Subscribe to a channel (from a coroutine); use as a context manager to unsubscribe"""
+        subscription = Subscription(self, channel, self.max_pending)
+        with self._lock:
+            self._channels[channel].add(subscription)
+        return subscription
+
+    def publish(self, channel: str, message: Any) -> int:
+        """Send a message to the channel's current subscribers and return how many there were"""
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription._loop.call_soon_threadsafe(subscription._deliver, message)
+            except RuntimeError:
+                # The subscriber's event loop is closed: it won't read anymore
+                self._unsubscribe(subscription)
+        return len(subscribers)
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._channels.get(channel, ()))
+
+    def channels(self) -> List[str]:
+        """Channels that currently have subscribers"""
+        with self._lock:
+            return list(self._channels)
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[subscription.channel]
+
+
+# Shared by the live scoring and event stream endpoints
+broadcaster = Broadcaster()
@@ -0,0 +1,95 @@
+"""
+Optimistic Concurrency for Player Ratings
+
+`Player.version` is the mapper's version counter: every ORM flush that changes
+a player runs UPDATE ... WHERE id = ? AND version = ? and increments the
+version, raising StaleDataError if another transaction changed the player
+since it was read. Bulk writers use write_player_ratings, which performs the
+same compare-and-swap for many players in one executemany UPDATE.
+
+retry_on_conflict runs a whole read-compute-write unit again (a bounded number
+of times, with jittered backoff) when one of its compare-and-swaps fails, so
+several workers can report results for the same players without overwriting
+each other's ratings.
+
+Ranking positions are derived data, maintained with relative UPDATEs and
+repaired by rerank_players: they don't take part in version checks.
+"""
+
+import random
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, TypeVar
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from models.player import Player
+
+# Attempts of a read-compute-write unit before giving up
+MAX_ATTEMPTS = 5
+
+# Upper bound of the first retry delay in seconds (doubled at each attempt)
+RETRY_BACKOFF = 0.005
+
+T = TypeVar("T")
+
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a unit of work still conflicts after MAX_ATTEMPTS attempts"""
+
+
+def retry_on_conflict(db: Session, operation: Callable[[], T], attempts: Optional[int] = None) -> T:
+    """
+    Run operation() and commit, starting over when a compare-and-swap fails.
+
+    The session is rolled back (expiring every loaded object) before a retry,
+    so operation must read everything it updates itself.
+
+    Raises:
+        ConcurrentUpdateError: If all attempts (default: MAX_ATTEMPTS) conflicted
+    """
+    attempts = attempts or MAX_ATTEMPTS
+    for attempt in range(attempts):
+        try:
+            result = operation()
+            db.commit()
+            return result
+        except StaleDataError:
+            db.rollback()
+            if attempt + 1 < attempts:
+                time.sleep(random.uniform(0, RETRY_BACKOFF * 2 ** attempt))
+    raise ConcurrentUpdateError(f"Players were updated concurrently {attempts} times in a row, try again")
+
+
+def write_player_ratings(db: Session, rows: Iterable[Dict[str, Any]]) -> None:
+    """
+    Compare-and-swap the rating and win count of many players at once.
+
+    Args:
+        rows: Dictionaries with id, version (as read), elo_rating and score
+
+    Raises:
+        StaleDataError: If any of the players changed since it was read
+    """
+    params = [
+        {"p_id": row["id"], "p_version": row["version"], "p_elo_rating": row["elo_rating"], "p_score": row["score"]}
+        for row in rows
+    ]
+    if not params:
+        return
+    players = Player.__table__
+    result = db.execute(
+        update(players)
+        .where(players.c.id == bindparam("p_id"), players.c.version == bindparam("p_version"))
+        .values(
+            elo_rating=bindparam("p_elo_rating"),
+            score=bindparam("p_score"),
+            version=players.c.version + 1,
+        ),
+        params,
+    )
+    if result.rowcount != len(params):
+        raise StaleDataError(
+            f"{len(params) - result.rowcount} of {len(params)} players were updated concurrently"
+        )
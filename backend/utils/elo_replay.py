@@ -0,0 +1,375 @@
+"""
+Chronological Elo Replay
+
+Recomputes every player's Elo rating (and legacy win count, `Player.score`)
+for an event from its match history, using the same elo.calculate_match_outcome
+call as the match endpoints. Used on demand and after deleting or correcting
+a finished match, when incremental updates can no longer be undone.
+
+The replay loop works on plain Python lists indexed by position, never on ORM
+objects: matches are read as tuples and ratings written back with a single
+executemany compare-and-swap UPDATE (utils.concurrency.write_player_ratings). Rating changes are appended to the rating history ledger
+and ranking positions are recomputed with rerank_players.
+
+Periodically, the replay state is saved as a RatingCheckpoint: every
+CHECKPOINT_INTERVAL results, or every N results for events with N > 100
+players, so that checkpoint storage stays proportional to the number of results.
+Checkpoints are written by replays and, as results are recorded, by
+extend_rating_checkpoints. event_ratings_as_of only reads them: it starts from
+the nearest checkpoint, so a point-in-time ranking replays less than one
+interval of matches.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from elo import calculate_match_outcome, get_initial_rating
+from models.match import Match
+from models.player import Player
+from models.rating_history import RatingCheckpoint
+from utils.concurrency import write_player_ratings
+from utils.player_ranking import rerank_players
+from utils.rating_history import record_replay_corrections
+
+# Minimum number of results between two rating checkpoints
+CHECKPOINT_INTERVAL = 100
+
+
+def checkpoint_interval(num_players: int) -> int:
+    """Results between two checkpoints of an event with num_players players"""
+    return max(CHECKPOINT_INTERVAL, num_players)
+
+
+def replay_ratings(
+    player_ids: Sequence[int],
+    player1_ids: Sequence[int],
+    player2_ids: Sequence[int],
+    winner_ids: Sequence[int],
+    ratings: Optional[Sequence[float]] = None,
+    scores: Optional[Sequence[int]] = None,
+) -> Tuple[List[float], List[int]]:
+    """
+    Replay a chronologically ordered match history.
+
+    Args:
+        player_ids: IDs of every player that may appear in the matches
+        player1_ids, player2_ids, winner_ids: One entry per match, in order
+        ratings, scores: Starting state aligned with player_ids
+            (default: initial ratings and no wins)
+
+    Returns:
+        Tuple of (ratings, scores) aligned with player_ids
+    """
+    index = {player_id: i for i, player_id in enumerate(player_ids)}
+    ratings = list(ratings) if ratings is not None else [get_initial_rating()] * len(player_ids)
+    scores = list(scores) if scores is not None else [0] * len(player_ids)
+
+    for player1_id, player2_id, winner_id in zip(player1_ids, player2_ids, winner_ids):
+        i = index[player1_id]
+        j = index[player2_id]
+        outcome = calculate_match_outcome(
+            ratings[i],
+            ratings[j],
+            winner_id,
+            player1_id,
+            player2_id,
+            player1_match_count=scores[i],  # Same wins-as-match-count approximation as the endpoints
+            player2_match_count=scores[j]
+        )
+        ratings[i] = outcome['player1_new_rating']
+        ratings[j] = outcome['player2_new_rating']
+        scores[i if winner_id == player1_id else j] += 1
+
+    return ratings, scores
+
+
+def _history_statement(event_id: int):
+    """Counted results of an event in replay order (finished_at, then id)"""
+    return (
+        select(Match.id, Match.finished_at, Match.player1_id, Match.player2_id, Match.winner_id)
+        .where(Match.event_id == event_id, Match.finished, Match.winner_id.is_not(None))
+        .order_by(Match.finished_at, Match.id)
+    )
+
+
+def _replay_with_checkpoints(
+    db: Session,
+    event_id: int,
+    player_ids: List[int],
+    history: Sequence[Tuple[int, int, int, int]],
+    start: int,
+    ratings: Optional[List[float]] = None,
+    scores: Optional[List[int]] = None,
+    played: Optional[List[int]] = None,
+    save: bool = True,
+) -> Tuple[List[float], List[int], List[int]]:
+    """
+    Replay `history` (the event's results after the first `start` ones) in
+    chunks ending on checkpoint boundaries, saving a checkpoint at each boundary
+    unless `save` is False.
+
+    Returns:
+        Tuple of (ratings, wins, matches played) aligned with player_ids
+    """
+    index = {player_id: i for i, player_id in enumerate(player_ids)}
+    played = list(played) if played is not None else [0] * len(player_ids)
+    interval = checkpoint_interval(len(player_ids))
+    position, done = start, 0
+    while done < len(history) or ratings is None:
+        boundary = (position // interval + 1) * interval
+        chunk = history[done:done + boundary - position]
+        _, _, player1_ids, player2_ids, winner_ids = zip(*chunk) if chunk else ((), (), (), (), ())
+        ratings, scores = replay_ratings(player_ids, player1_ids, player2_ids, winner_ids, ratings, scores)
+        for player_id in player1_ids + player2_ids:
+            played[index[player_id]] += 1
+        position += len(chunk)
+        done += len(chunk)
+        if save and position == boundary:
+            last_match_id, last_finished_at = chunk[-1][:2]
+            _save_checkpoint(db, event_id, position, last_match_id, last_finished_at,
+                             player_ids, ratings, scores, played)
+    return ratings, scores, played
+
+
+def _save_checkpoint(
+    db, event_id, match_count, last_match_id, last_finished_at, player_ids, ratings, scores, played
+) -> None:
+    """Store the replay state after `match_count` results (kept if already present)"""
+    db.execute(
+        sqlite_insert(RatingCheckpoint)
+        .values(
+            event_id=event_id,
+            match_count=match_count,
+            last_match_id=last_match_id,
+            last_finished_at=last_finished_at,
+            state={"player_ids": player_ids, "ratings": ratings, "wins": scores, "played": played},
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+def replay_event_ratings(db: Session, event_id: int) -> Dict[str, int]:
+    """
+    Recompute ratings and scores of all players in an event from its finished matches.
+
+    Matches are replayed in the order their results were recorded
+    (finished_at, then id). Pending changes in the session are flushed first so
+    that a just-deleted or corrected match is taken into account. The event's
+    rating checkpoints are rewritten. The caller commits.
+
+    Returns:
+        Dictionary with event_id, matches_replayed and players_updated
+    """
+    db.flush()
+
+    players = db.execute(
+        select(Player.id, Player.elo_rating, Player.version).where(Player.event_id == event_id)
+    ).all()
+    player_ids = [player_id for player_id, _, _ in players]
+    history = db.execute(_history_statement(event_id)).all()
+
+    # The history may have changed before existing checkpoints
+    db.execute(delete(RatingCheckpoint).where(RatingCheckpoint.event_id == event_id))
+    ratings, scores, _ = _replay_with_checkpoints(db, event_id, player_ids, history, 0)
+
+    if player_ids:
+        # Fails (StaleDataError) if a result was reported while replaying
+        write_player_ratings(db, [
+            {"id": player_id, "version": version, "elo_rating": rating, "score": score}
+            for (player_id, _, version), rating, score in zip(players, ratings, scores)
+        ])
+        record_replay_corrections(db, event_id, (
+            (player_id, current, rating)
+            for (player_id, current, _), rating in zip(players, ratings)
+        ))
+        # Every rating may have moved: recompute ranking positions in one pass
+        rerank_players(db, event_id)
+        # Bulk UPDATE bypasses the identity map: reload players on next access
+        db.expire_all()
+
+    return {
+        "event_id": event_id,
+        "matches_replayed": len(history),
+        "players_updated": len(player_ids),
+    }
+
+
+def _at_or_before(finished_col, id_col, finished_at: Optional[datetime], match_id: Optional[int]):
+    """
+    Condition: (finished_col, id_col) is at or before (finished_at, match_id)
+    in replay order, where a NULL finished_at (results recorded before the
+    column existed) sorts first. match_id=None means any match at finished_at.
+    """
+    if finished_at is None:
+        return and_(finished_col.is_(None), id_col <= match_id)
+    same_time = finished_col == finished_at
+    if match_id is not None:
+        same_time = and_(same_time, id_col <= match_id)
+    return or_(finished_col.is_(None), finished_col < finished_at, same_time)
+
+
+def _history_segments(
+    after: Optional[Tuple[Optional[datetime], int]],
+    until: Optional[Tuple[Optional[datetime], Optional[int]]],
+) -> List[List]:
+    """
+    Conditions selecting the results strictly after the `after` key and at or
+    before the `until` key (None: up to the latest result), as at most two
+    index ranges on (event_id, finished_at): results without finished_at (which
+    sort first), then the timestamped ones. Keys are (finished_at, match id);
+    a None match id in `until` means every result at that time.
+    """
+    (after_time, after_id), (until_time, until_id) = after or (None, None), until or (None, None)
+    segments = []
+    if after is None or after_time is None:
+        conditions = [Match.finished_at.is_(None)]
+        if after is not None:
+            conditions.append(Match.id > after_id)
+        if until is not None and until_time is None:
+            conditions.append(Match.id <= until_id)
+        segments.append(conditions)
+    if until is None or until_time is not None:
+        conditions = []
+        if until_time is not None:
+            conditions.append(Match.finished_at <= until_time)
+            if until_id is not None:
+                conditions.append(or_(Match.finished_at < until_time, Match.id <= until_id))
+        if after_time is not None:
+            conditions += [Match.finished_at >= after_time, or_(Match.finished_at > after_time, Match.id > after_id)]
+        else:
+            conditions.append(Match.finished_at.is_not(None))
+        segments.append(conditions)
+    return segments
+
+
+def _history_between(
+    db: Session,
+    event_id: int,
+    after: Optional[Tuple[Optional[datetime], int]],
+    until: Optional[Tuple[Optional[datetime], Optional[int]]],
+) -> List[Tuple]:
+    """Results between two keys, in replay order (see _history_segments)"""
+    rows = []
+    for conditions in _history_segments(after, until):
+        rows += db.execute(_history_statement(event_id).where(*conditions)).all()
+    return rows
+
+
+def _checkpoint_state(checkpoint: Optional[RatingCheckpoint], player_ids: Sequence[int]) -> Tuple:
+    """
+    Replay state saved in a checkpoint, aligned with player_ids.
+
+    Returns:
+        Tuple of (match_count, ratings, wins, matches played, key of its last
+        result), all None but match_count 0 without a checkpoint
+    """
+    if checkpoint is None:
+        return 0, None, None, None, None
+    saved = {
+        player_id: (rating, wins, count)
+        for player_id, rating, wins, count in zip(
+            checkpoint.state["player_ids"], checkpoint.state["ratings"],
+            checkpoint.state["wins"], checkpoint.state["played"],
+        )
+    }
+    # Players registered after the checkpoint start from scratch
+    initial = (get_initial_rating(), 0, 0)
+    states = [saved.get(player_id, initial) for player_id in player_ids]
+    return (
+        checkpoint.match_count,
+        [state[0] for state in states],
+        [state[1] for state in states],
+        [state[2] for state in states],
+        (checkpoint.last_finished_at, checkpoint.last_match_id),
+    )
+
+
+def extend_rating_checkpoints(db: Session, event_id: int) -> None:
+    """
+    Save the checkpoints reached by the results recorded since the event's
+    latest checkpoint. Called wherever results are applied incrementally
+    (replay_event_ratings rewrites every checkpoint itself), so point-in-time
+    rankings only ever read them. Pending changes in the session are flushed
+    first. The caller commits.
+
+    Per result this is a few index lookups; the replay from the latest
+    checkpoint only runs once a checkpoint boundary is reached.
+    """
+    db.flush()
+
+    checkpoint = db.scalars(
+        select(RatingCheckpoint)
+        .where(RatingCheckpoint.event_id == event_id)
+        .order_by(RatingCheckpoint.match_count.desc())
+        .limit(1)
+    ).first()
+    start = checkpoint.match_count if checkpoint is not None else 0
+    after = (checkpoint.last_finished_at, checkpoint.last_match_id) if checkpoint is not None else None
+    num_players = db.scalar(select(func.count(Player.id)).where(Player.event_id == event_id))
+    interval = checkpoint_interval(num_players)
+    recorded = sum(
+        db.scalar(
+            select(func.count(Match.id))
+            .where(Match.event_id == event_id, Match.finished, Match.winner_id.is_not(None), *conditions)
+        )
+        for conditions in _history_segments(after, None)
+    )
+    if start + recorded < (start // interval + 1) * interval:
+        return
+
+    player_ids = db.scalars(select(Player.id).where(Player.event_id == event_id).order_by(Player.id)).all()
+    start, ratings, scores, played, after = _checkpoint_state(checkpoint, player_ids)
+    history = _history_between(db, event_id, after, None)
+    _replay_with_checkpoints(db, event_id, player_ids, history, start, ratings, scores, played)
+
+
+def event_ratings_as_of(
+    db: Session, event_id: int, timestamp: Optional[datetime] = None, match_id: Optional[int] = None
+) -> Optional[Dict[int, Tuple[float, int, int]]]:
+    """
+    Replay state of an event at a point in time, given as a timestamp (results
+    recorded at or before it) or as a match (results up to and including it).
+
+    Starts from the latest checkpoint at or before that point and replays the
+    remaining results. Both lookups are index ranges on (finished_at, id), so
+    the cost doesn't depend on how far into the history the point is. Read-only:
+    checkpoints are saved by the write paths (extend_rating_checkpoints).
+
+    Returns:
+        Dictionary of player_id -> (rating, wins, matches played), or None if
+        match_id is not a counted result of the event
+    """
+    if match_id is not None:
+        match = db.execute(
+            select(Match.finished_at).where(
+                Match.id == match_id, Match.event_id == event_id, Match.finished, Match.winner_id.is_not(None)
+            )
+        ).first()
+        if match is None:
+            return None
+        timestamp = match.finished_at
+
+    player_ids = db.scalars(select(Player.id).where(Player.event_id == event_id).order_by(Player.id)).all()
+    checkpoint = db.scalars(
+        select(RatingCheckpoint)
+        .where(
+            RatingCheckpoint.event_id == event_id,
+            _at_or_before(RatingCheckpoint.last_finished_at, RatingCheckpoint.last_match_id, timestamp, match_id),
+        )
+        .order_by(RatingCheckpoint.match_count.desc())
+        .limit(1)
+    ).first()
+
+    start, ratings, scores, played, after = _checkpoint_state(checkpoint, player_ids)
+    history = _history_between(db, event_id, after, (timestamp, match_id))
+    ratings, scores, played = _replay_with_checkpoints(
+        db, event_id, player_ids, history, start, ratings, scores, played, save=False
+    )
+    return {
+        player_id: (rating, wins, count)
+        for player_id, rating, wins, count in zip(player_ids, ratings, scores, played)
+    }
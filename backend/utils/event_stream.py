@@ -0,0 +1,108 @@
+"""
+Event Activity Stream
+
+Changes to an event (matches created, updated or deleted, ranking and
+membership changes) are published on the event's broadcaster channel after
+they are committed, and sent to open screens by GET /events/{id}/stream as
+Server-Sent Events:
+
+    event: match-created
+    data: {"matches": [{...MatchRead...}]}
+
+Payloads carry what a screen needs to update itself (the matches or
+membership as returned by the API; ranking-changed only says that the ranking
+must be fetched again). A client that fell too far behind receives a resync
+event and should reload everything.
+"""
+
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Match
+from schemas import MatchRead
+from utils.broadcaster import broadcaster
+
+MATCH_CREATED = "match-created"
+MATCH_UPDATED = "match-updated"
+MATCH_DELETED = "match-deleted"
+RANKING_CHANGED = "ranking-changed"
+MEMBERSHIP_CHANGED = "membership-changed"
+RESYNC = "resync"
+
+# Reconnection delay suggested to EventSource clients, in milliseconds
+SSE_RETRY_MS = 3000
+
+_CHANNEL_PREFIX = "event:"
+
+
+def event_channel(event_id: int) -> str:
+    return f"{_CHANNEL_PREFIX}{event_id}"
+
+
+def publish_event_change(event_id: int, kind: str, data: Optional[Dict[str, Any]] = None) -> None:
+    """Send a change to the event's stream subscribers (call after commit)"""
+    broadcaster.publish(event_channel(event_id), {"type": kind, "data": data or {}})
+
+
+def publish_match(kind: str, match, ranking_changed: bool = False) -> None:
+    """Publish a created or updated match (Match or MatchRead), and a ranking change if its result counted"""
+    match = MatchRead.model_validate(match)
+    publish_event_change(match.event_id, kind, {"matches": [match.model_dump(mode="json")]})
+    if ranking_changed:
+        publish_event_change(match.event_id, RANKING_CHANGED)
+
+
+def publish_matches_created(db: Session, match_ids: Iterable[int]) -> None:
+    """
+    Publish matches created in bulk: one match-created (and ranking-changed
+    if any has a result) per event. Only events with stream subscribers are
+    loaded.
+    """
+    watched = [
+        int(channel[len(_CHANNEL_PREFIX):]) for channel in broadcaster.channels()
+        if channel.startswith(_CHANNEL_PREFIX)
+    ]
+    match_ids = list(match_ids)
+    if not watched or not match_ids:
+        return
+
+    by_event = defaultdict(list)
+    for match in db.scalars(
+        select(Match).where(Match.id.in_(match_ids), Match.event_id.in_(watched)).order_by(Match.id)
+    ):
+        by_event[match.event_id].append(MatchRead.model_validate(match))
+    for event_id, matches in by_event.items():
+        publish_event_change(event_id, MATCH_CREATED, {"matches": [m.model_dump(mode="json") for m in matches]})
+        if any(m.winner_id is not None for m in matches):
+            publish_event_change(event_id, RANKING_CHANGED)
+
+
+def format_sse(kind: str, data: Dict[str, Any]) -> str:
+    """One Server-Sent Events message"""
+    return f"event: {kind}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def iter_event_stream(event_id: int, keepalive: float) -> AsyncIterator[str]:
+    """
+    Messages of an event's stream, with a comment line every `keepalive`
+    seconds without changes so that proxies keep the connection open.
+    """
+    with broadcaster.subscribe(event_channel(event_id)) as subscription:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        dropped = 0
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if subscription.dropped > dropped:
+                # Some changes were lost while this client was too slow
+                dropped = subscription.dropped
+                yield format_sse(RESYNC, {})
+            yield format_sse(message["type"], message["data"])
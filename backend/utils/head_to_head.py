@@ -0,0 +1,99 @@
+"""
+Head-to-Head Statistics
+
+Matches between two players are found through the normalized pair key
+(`Match.pair_min_id`, `Match.pair_max_id`) and its index, so a lookup reads
+only the pair's own matches whatever the total number of matches. The Elo
+swing comes from the rating history ledger entries of those matches.
+
+Only finished matches with a winner count, as for the other statistics.
+"""
+
+from typing import Any, Dict
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from models.match import Match
+from models.rating_history import RatingHistory
+
+
+def _pair_conditions(player_a_id: int, player_b_id: int) -> tuple:
+    """Counted matches between the two players, in either order"""
+    low, high = sorted((player_a_id, player_b_id))
+    return (
+        Match.pair_min_id == low,
+        Match.pair_max_id == high,
+        Match.finished,
+        Match.winner_id.is_not(None),
+    )
+
+
+def head_to_head(db: Session, player_a_id: int, player_b_id: int, last: int) -> Dict[str, Any]:
+    """
+    Compute head-to-head statistics of player A against player B.
+
+    Returns:
+        Dictionary matching schemas.HeadToHeadResponse, with the `last` most
+        recent results first
+    """
+    pair = _pair_conditions(player_a_id, player_b_id)
+    a_is_player1 = Match.player1_id == player_a_id
+    a_games = func.coalesce(case((a_is_player1, Match.player1_games), else_=Match.player2_games), 0)
+    b_games = func.coalesce(case((a_is_player1, Match.player2_games), else_=Match.player1_games), 0)
+
+    totals = db.execute(
+        select(
+            func.count().label("matches_played"),
+            func.coalesce(func.sum(case((Match.winner_id == player_a_id, 1), else_=0)), 0).label("player_a_wins"),
+            func.coalesce(func.sum(case((Match.winner_id == player_b_id, 1), else_=0)), 0).label("player_b_wins"),
+            func.coalesce(func.sum(a_games), 0).label("player_a_games"),
+            func.coalesce(func.sum(b_games), 0).label("player_b_games"),
+        ).where(*pair)
+    ).mappings().one()
+
+    swings = dict(db.execute(
+        select(RatingHistory.player_id, func.sum(RatingHistory.delta))
+        .select_from(Match)
+        .join(RatingHistory, RatingHistory.match_id == Match.id)
+        .where(
+            *pair,
+            RatingHistory.player_id.in_((player_a_id, player_b_id)),
+            RatingHistory.reason == "match",
+        )
+        .group_by(RatingHistory.player_id)
+    ).all())
+
+    a_delta = (
+        select(RatingHistory.delta)
+        .where(
+            RatingHistory.match_id == Match.id,
+            RatingHistory.player_id == player_a_id,
+            RatingHistory.reason == "match",
+        )
+        .order_by(RatingHistory.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    last_results = db.execute(
+        select(
+            Match.id.label("match_id"),
+            Match.finished_at,
+            Match.winner_id,
+            a_games.label("player_a_games"),
+            b_games.label("player_b_games"),
+            a_delta.label("player_a_elo_change"),
+        )
+        .where(*pair)
+        .order_by(Match.finished_at.desc(), Match.id.desc())
+        .limit(last)
+    ).mappings().all()
+
+    return {
+        "player_a_id": player_a_id,
+        "player_b_id": player_b_id,
+        **totals,
+        "player_a_elo_swing": swings.get(player_a_id, 0.0),
+        "player_b_elo_swing": swings.get(player_b_id, 0.0),
+        "last_results": [dict(row) for row in last_results],
+    }
@@ -0,0 +1,189 @@
+"""
+Idempotency Keys for Write Endpoints
+
+Clients on unreliable networks retry writes they never saw the answer to.
+When a write request carries an Idempotency-Key header, its response is
+stored under that key, and a retry with the same key and the same request
+gets the stored response back (with an Idempotent-Replayed: true header)
+without running the endpoint again: nothing is validated twice and no Elo
+result is applied twice. A replay only reads idempotency_keys.
+
+How it works:
+- The dependency returned by idempotency(get_db) (added to the create and
+  update routes of each router) claims the key by inserting a pending row
+  in its own transaction. An existing key is replayed (IdempotentReplayError,
+  answered by replay_response), refused with 422 if it was used for a
+  different request, or with 409 while its first request is still running.
+- IdempotencyMiddleware records the response sent for a claimed key. Server
+  errors and 409 conflicts are transient: their claim is released instead,
+  so that the retry runs.
+
+Keys expire after config.IDEMPOTENCY_KEY_TTL seconds. Expired rows are
+deleted at most every config.IDEMPOTENCY_EVICT_INTERVAL seconds, when a new
+key is claimed.
+"""
+
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+import config
+from models.idempotency_key import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+
+# Longest accepted key (the column size)
+MAX_KEY_LENGTH = 255
+
+_keys = IdempotencyKey.__table__
+_eviction_lock = threading.Lock()
+_next_eviction = 0.0
+
+
+class IdempotentReplayError(Exception):
+    """Raised by the idempotency dependency to answer with a stored response (not a failure)"""
+
+    def __init__(self, status_code: int, body: str):
+        self.status_code = status_code
+        self.body = body
+
+
+def replay_response(request: Request, exc: IdempotentReplayError) -> Response:
+    """Exception handler: the stored response of the first request"""
+    return Response(
+        content=exc.body,
+        status_code=exc.status_code,
+        media_type="application/json",
+        headers={REPLAY_HEADER: "true"},
+    )
+
+
+def request_hash(method: str, path: str, query: str, body: bytes) -> str:
+    digest = hashlib.sha256(f"{method} {path}?{query}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def evict_expired_keys(engine: Engine, force: bool = False) -> int:
+    """Delete expired keys (at most every IDEMPOTENCY_EVICT_INTERVAL seconds unless forced)"""
+    global _next_eviction
+    with _eviction_lock:
+        if not force and time.monotonic() < _next_eviction:
+            return 0
+        _next_eviction = time.monotonic() + config.IDEMPOTENCY_EVICT_INTERVAL
+    cutoff = _utcnow() - timedelta(seconds=config.IDEMPOTENCY_KEY_TTL)
+    with engine.begin() as conn:
+        return conn.execute(delete(_keys).where(_keys.c.created_at < cutoff)).rowcount
+
+
+def claim_key(engine: Engine, key: str, fingerprint: str) -> None:
+    """
+    Reserve a key for a new request, in its own transaction.
+
+    Raises:
+        IdempotentReplayError: If the key already holds a response to the same request
+        HTTPException: 422 if the key was used for another request, 409 if
+            its first request hasn't finished yet
+    """
+    evict_expired_keys(engine)
+    now = _utcnow()
+    with engine.begin() as conn:
+        # An expired key that wasn't evicted yet counts as new
+        conn.execute(delete(_keys).where(
+            _keys.c.key == key, _keys.c.created_at < now - timedelta(seconds=config.IDEMPOTENCY_KEY_TTL)
+        ))
+        claimed = conn.execute(
+            sqlite_insert(_keys)
+            .values(key=key, request_hash=fingerprint, created_at=now)
+            .on_conflict_do_nothing()
+        ).rowcount
+        if claimed:
+            return
+        stored = conn.execute(
+            select(_keys.c.request_hash, _keys.c.status_code, _keys.c.response).where(_keys.c.key == key)
+        ).first()
+
+    if stored.request_hash != fingerprint:
+        raise HTTPException(status_code=422, detail=f"{IDEMPOTENCY_HEADER} was already used for a different request")
+    if stored.status_code is None:
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+    raise IdempotentReplayError(stored.status_code, stored.response)
+
+
+def finish_key(engine: Engine, key: str, status_code: Optional[int], body: bytes) -> None:
+    """Store the response of a claimed key, or release the claim if the response shouldn't be replayed"""
+    with engine.begin() as conn:
+        if status_code is None or status_code >= 500 or status_code == 409:
+            conn.execute(delete(_keys).where(_keys.c.key == key, _keys.c.status_code.is_(None)))
+        else:
+            conn.execute(
+                update(_keys)
+                .where(_keys.c.key == key)
+                .values(status_code=status_code, response=body.decode())
+            )
+
+
+def idempotency(get_db: Callable) -> Callable:
+    """
+    Dependency honouring the Idempotency-Key header, bound to a router's
+    get_db (so tests' database overrides apply to the stored keys too).
+    """
+    async def idempotent_request(request: Request, db: Session = Depends(get_db)) -> None:
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=400, detail=f"{IDEMPOTENCY_HEADER} must have 1 to {MAX_KEY_LENGTH} characters"
+            )
+        fingerprint = request_hash(request.method, request.url.path, request.url.query, await request.body())
+        engine = db.get_bind()
+        await run_in_threadpool(claim_key, engine, key, fingerprint)
+        # Picked up by IdempotencyMiddleware once the response is sent
+        request.state.idempotency_claim = (engine, key)
+
+    return idempotent_request
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware recording the responses of requests that claimed an Idempotency-Key"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            await self.app(scope, receive, send)
+            return
+
+        response = {"status": None, "body": []}
+
+        async def recording_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body" and "idempotency_claim" in scope.get("state", {}):
+                response["body"].append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, recording_send)
+        finally:
+            claim = scope.get("state", {}).get("idempotency_claim")
+            if claim is not None:
+                engine, key = claim
+                await run_in_threadpool(finish_key, engine, key, response["status"], b"".join(response["body"]))
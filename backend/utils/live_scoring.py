@@ -0,0 +1,198 @@
+"""
+Live Point-by-Point Scoring
+
+Keeps the score of matches being played in memory: points are counted here
+and broadcast to spectators, and only finished games reach the database (as
+player1_games, player2_games and games_score, plus the winner and Elo once the
+match is decided). A game of 20 points thus costs one commit instead of 20.
+
+The points of the game in progress are not persisted: if the process
+restarts, or every umpire and spectator disconnects, scoring resumes from the
+last finished game. The state is per process, so live scoring needs a single
+server worker.
+"""
+
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+# A game is won at GAME_POINTS with a lead of at least GAME_LEAD
+GAME_POINTS = 11
+GAME_LEAD = 2
+
+_GAME_SCORE = re.compile(r"(\d+)\s*-\s*(\d+)")
+
+
+def parse_games_score(games_score: Optional[str]) -> List[Tuple[int, int]]:
+    """Games of a score string such as "11-9,10-12,11-8" or "11-9 11-8" """
+    return [(int(p1), int(p2)) for p1, p2 in _GAME_SCORE.findall(games_score or "")]
+
+
+def game_winner(points: Tuple[int, int]) -> Optional[int]:
+    """Side (1 or 2) that has won a game with these points, if any"""
+    p1, p2 = points
+    if max(p1, p2) >= GAME_POINTS and abs(p1 - p2) >= GAME_LEAD:
+        return 1 if p1 > p2 else 2
+    return None
+
+
+class LiveMatch:
+    """Score of one match: finished games, points of the current game and the winner"""
+
+    def __init__(
+        self,
+        match_id: int,
+        player1_id: int,
+        player2_id: int,
+        best_of: int,
+        games: Optional[List[Tuple[int, int]]] = None,
+        winner_id: Optional[int] = None,
+    ):
+        self.match_id = match_id
+        self.player1_id = player1_id
+        self.player2_id = player2_id
+        self.best_of = best_of or 1
+        self.games = list(games or [])
+        self.winner_id = winner_id
+        self.rallies: List[int] = []  # side (1 or 2) of each point of the current game
+        self.flushed_games = len(self.games)
+        self.lock = threading.Lock()  # guards the score
+        self.flush_lock = threading.Lock()  # serializes writes of this match
+
+    @classmethod
+    def from_match(cls, match) -> "LiveMatch":
+        """Resume from the games already stored on a Match"""
+        return cls(
+            match.id, match.player1_id, match.player2_id, match.best_of,
+            games=parse_games_score(match.games_score), winner_id=match.winner_id,
+        )
+
+    @property
+    def points(self) -> Tuple[int, int]:
+        return self.rallies.count(1), self.rallies.count(2)
+
+    @property
+    def games_won(self) -> Tuple[int, int]:
+        won = [game_winner(game) for game in self.games]
+        return won.count(1), won.count(2)
+
+    @property
+    def games_score(self) -> Optional[str]:
+        return ",".join(f"{p1}-{p2}" for p1, p2 in self.games) or None
+
+    @property
+    def finished(self) -> bool:
+        return self.winner_id is not None
+
+    @property
+    def dirty(self) -> bool:
+        """Finished games not yet written to the database"""
+        return len(self.games) > self.flushed_games
+
+    def score_point(self, player_id: int) -> bool:
+        """
+        Add a point for a player and return True if it ended a game.
+
+        Raises:
+            ValueError: If the match is over or the player isn't playing it
+        """
+        if self.finished:
+            raise ValueError("Match is already finished")
+        if player_id not in (self.player1_id, self.player2_id):
+            raise ValueError("Player is not playing this match")
+        self.rallies.append(1 if player_id == self.player1_id else 2)
+
+        side = game_winner(self.points)
+        if side is None:
+            return False
+        self.games.append(self.points)
+        self.rallies = []
+        if max(self.games_won) > self.best_of // 2:
+            self.winner_id = self.player1_id if side == 1 else self.player2_id
+        return True
+
+    def undo(self) -> None:
+        """
+        Remove the last point of the current game.
+
+        Raises:
+            ValueError: If the current game has no points (finished games are final)
+        """
+        if self.finished or not self.rallies:
+            raise ValueError("No point to undo in the current game")
+        self.rallies.pop()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable state sent to subscribers"""
+        player1_games, player2_games = self.games_won
+        return {
+            "match_id": self.match_id,
+            "player1_id": self.player1_id,
+            "player2_id": self.player2_id,
+            "best_of": self.best_of,
+            "games": [list(game) for game in self.games],
+            "points": list(self.points),
+            "player1_games": player1_games,
+            "player2_games": player2_games,
+            "games_score": self.games_score,
+            "winner_id": self.winner_id,
+            "finished": self.finished,
+        }
+
+
+class LiveScoreboard:
+    """
+    Matches being scored live, by match ID, with the sessions used to load and
+    write them. Each connection holds a reference to its match: a match nobody
+    is connected to is forgotten, unless it has games not yet written.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._matches: Dict[int, LiveMatch] = {}
+        self._connections: Dict[int, int] = {}
+
+    def get(self, match_id: int) -> Optional[LiveMatch]:
+        with self._lock:
+            return self._matches.get(match_id)
+
+    def load(self, match_id: int, loader: Callable[[], Optional[LiveMatch]]) -> Optional[LiveMatch]:
+        """
+        Live state of a match for a new connection, created with loader() (None
+        if not found) on first use. Pair with release() when the connection ends.
+        """
+        with self._lock:
+            live = self._matches.get(match_id)
+            if live is not None:
+                self._connections[match_id] = self._connections.get(match_id, 0) + 1
+                return live
+        live = loader()
+        if live is None:
+            return None
+        with self._lock:
+            self._connections[match_id] = self._connections.get(match_id, 0) + 1
+            return self._matches.setdefault(match_id, live)
+
+    def release(self, match_id: int) -> None:
+        """End a connection's use of a match; the last one out forgets it if nothing is left to write"""
+        with self._lock:
+            remaining = self._connections.get(match_id, 0) - 1
+            if remaining > 0:
+                self._connections[match_id] = remaining
+                return
+            self._connections.pop(match_id, None)
+            live = self._matches.get(match_id)
+            if live is not None and not live.dirty:
+                del self._matches[match_id]
+
+    def connections(self, match_id: int) -> int:
+        with self._lock:
+            return self._connections.get(match_id, 0)
+
+    def discard(self, match_id: int) -> None:
+        """Forget a match (finished and written: the database has its full score)"""
+        with self._lock:
+            self._matches.pop(match_id, None)
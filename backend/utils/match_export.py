@@ -0,0 +1,80 @@
+"""
+Streaming Match Export
+
+Serializes matches as NDJSON (one JSON object per line) or CSV while they are
+read. Rows are fetched as plain tuples with yield_per, so the driver cursor is
+consumed one batch at a time and each batch is encoded and handed to the
+response before the next one is read: memory stays constant whatever the
+number of matches exported.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.match import Match
+
+# Rows fetched (and encoded into one response chunk) at a time
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    Match.id,
+    Match.event_id,
+    Match.tournament_id,
+    Match.player1_id,
+    Match.player2_id,
+    Match.winner_id,
+    Match.best_of,
+    Match.finished,
+    Match.finished_at,
+    Match.player1_games,
+    Match.player2_games,
+    Match.games_score,
+)
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+
+
+def _batches(db: Session, event_id: Optional[int]) -> Iterator[list]:
+    """Matches (all or of one event) by id, in batches of EXPORT_BATCH_SIZE tuples"""
+    query = select(*EXPORT_COLUMNS).order_by(Match.id)
+    if event_id is not None:
+        query = query.where(Match.event_id == event_id)
+    result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def _json_value(value):
+    """JSON-compatible form of a column value"""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_ndjson(db: Session, event_id: Optional[int] = None) -> Iterator[str]:
+    """Yield matches as NDJSON, one chunk per fetched batch"""
+    for rows in _batches(db, event_id):
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_FIELDS, map(_json_value, row))), separators=(",", ":")) + "\n"
+            for row in rows
+        )
+
+
+def iter_csv(db: Session, event_id: Optional[int] = None) -> Iterator[str]:
+    """Yield matches as CSV with a header row, one chunk per fetched batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(EXPORT_FIELDS)
+    for rows in _batches(db, event_id):
+        writer.writerows(map(lambda row: map(_json_value, row), rows))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # No matches: the header alone
+        yield buffer.getvalue()
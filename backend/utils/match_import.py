@@ -0,0 +1,274 @@
+"""
+Bulk Match Import
+
+Imports a batch of match results in a single transaction:
+- parse_match_rows: decode a JSON array or a CSV document into raw rows
+- import_matches: validate every row, insert the valid ones and apply their results
+
+Validation uses a fixed number of set-based queries (events, players and
+memberships are each read once with IN (...)), whatever the batch size. Valid
+rows are inserted with one executemany INSERT, and their Elo results are
+applied in submission order on in-memory ratings, written back with one
+executemany compare-and-swap UPDATE. Rows that fail validation are skipped
+and reported with their row number; the other rows are still imported.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from elo import calculate_match_outcome
+from models import Event, Match, Membership, MembershipStatus, Player
+from models.rating_history import RatingHistory
+from schemas import MatchCreate
+from utils.concurrency import write_player_ratings
+from utils.elo_replay import extend_rating_checkpoints
+from utils.player_ranking import rerank_players
+from utils.player_stats import apply_bulk_match_stats
+
+# Maximum number of rows accepted in one import
+MAX_BULK_MATCHES = 1000
+
+CSV_MEDIA_TYPES = ("text/csv", "application/csv")
+
+
+def parse_match_rows(content_type: str, body: bytes) -> List[Dict[str, Any]]:
+    """
+    Decode a bulk import body into raw rows.
+
+    JSON bodies are an array of MatchCreate objects. CSV bodies have a header
+    row with MatchCreate field names; empty cells are treated as missing.
+
+    Raises:
+        ValueError: If the body is not a valid JSON array or CSV document
+    """
+    media_type = content_type.split(";")[0].strip().lower()
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        raise ValueError("Body must be UTF-8 encoded") from e
+
+    if media_type in CSV_MEDIA_TYPES:
+        try:
+            reader = csv.DictReader(io.StringIO(text))
+            return [
+                {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+                for row in reader
+            ]
+        except csv.Error as e:
+            raise ValueError(f"Invalid CSV: {e}") from e
+
+    try:
+        rows = json.loads(text)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON: {e}") from e
+    if not isinstance(rows, list):
+        raise ValueError("JSON body must be an array of matches")
+    return rows
+
+
+def membership_error(player_id: int, event_id: int, status: Optional[MembershipStatus]) -> Optional[str]:
+    """Reason why a player with this membership status can't play in the event (None if they can)"""
+    if status is None:
+        return f"Jogador {player_id} não tem membership no evento {event_id}"
+    if status != MembershipStatus.ATIVO:
+        return (f"Jogador {player_id} não pode jogar. Status: {status.value}. "
+                f"Apenas membros ATIVO podem participar.")
+    return None
+
+
+def _validation_detail(error: ValidationError) -> str:
+    """One-line summary of a pydantic validation error"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}" for item in error.errors()
+    )
+
+
+def _parse_rows(rows: List[Any]) -> Tuple[List[Tuple[int, MatchCreate]], List[Dict[str, Any]]]:
+    """Validate rows against MatchCreate: (row number, MatchCreate) pairs and errors"""
+    parsed, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        try:
+            parsed.append((number, MatchCreate.model_validate(row)))
+        except ValidationError as e:
+            errors.append({"row": number, "detail": _validation_detail(e)})
+    return parsed, errors
+
+
+def _load_references(db: Session, matches: List[MatchCreate]) -> Tuple[set, set, Dict[Tuple[int, int], Any]]:
+    """
+    Read the events, active players and memberships the matches refer to,
+    one IN (...) query each.
+
+    Returns:
+        Tuple of (existing event ids, active (player_id, event_id) pairs,
+        (player_id, event_id) -> membership status)
+    """
+    event_ids = {match.event_id for match in matches}
+    player_ids = {player_id for match in matches for player_id in (match.player1_id, match.player2_id)}
+    existing_events = set(db.scalars(select(Event.id).where(Event.id.in_(event_ids))))
+    active_players = set(db.execute(
+        select(Player.id, Player.event_id).where(Player.id.in_(player_ids), Player.active)
+    ).tuples())
+    memberships = dict(
+        ((player_id, event_id), status)
+        for player_id, event_id, status in db.execute(
+            select(Membership.player_id, Membership.event_id, Membership.status)
+            .where(Membership.player_id.in_(player_ids), Membership.event_id.in_(event_ids))
+        )
+    )
+    return existing_events, active_players, memberships
+
+
+def _row_error(match: MatchCreate, existing_events: set, active_players: set,
+               memberships: Dict[Tuple[int, int], Any]) -> Optional[str]:
+    """Reason why POST /matches would refuse the match (None if it's valid)"""
+    if match.event_id not in existing_events:
+        return "Event not found"
+    if (match.player1_id, match.event_id) not in active_players:
+        return "Player 1 not found in event"
+    if (match.player2_id, match.event_id) not in active_players:
+        return "Player 2 not found in event"
+    if match.player1_id == match.player2_id:
+        return "Player cannot play against themselves"
+    for player_id in (match.player1_id, match.player2_id):
+        detail = membership_error(player_id, match.event_id, memberships.get((player_id, match.event_id)))
+        if detail is not None:
+            return detail
+    if match.winner_id not in (None, match.player1_id, match.player2_id):
+        return "Winner must be one of the match players"
+    return None
+
+
+def _validate_rows(db: Session, rows: List[Any]) -> Tuple[List[Tuple[int, MatchCreate]], List[Dict[str, Any]]]:
+    """
+    Validate rows against MatchCreate and the database (same rules as
+    POST /matches).
+
+    Returns:
+        Tuple of (valid (row number, MatchCreate) pairs in order, errors)
+    """
+    parsed, errors = _parse_rows(rows)
+    if not parsed:
+        return [], errors
+
+    references = _load_references(db, [match for _, match in parsed])
+    valid = []
+    for number, match in parsed:
+        detail = _row_error(match, *references)
+        if detail is None:
+            valid.append((number, match))
+        else:
+            errors.append({"row": number, "detail": detail})
+
+    errors.sort(key=lambda error: error["row"])
+    return valid, errors
+
+
+def _apply_results(db: Session, matches: List[Dict[str, Any]]) -> None:
+    """
+    Apply the results of newly inserted matches, in order: Elo ratings and win
+    counts, rating history ledger, ranking positions, rating checkpoints and
+    player stats.
+    """
+    results = [match for match in matches if match["winner_id"] is not None]
+    if not results:
+        return
+
+    player_ids = {player_id for match in results for player_id in (match["player1_id"], match["player2_id"])}
+    # player_id -> [rating, wins, version as read]
+    players = {
+        player_id: [rating, score, version]
+        for player_id, rating, score, version in db.execute(
+            select(Player.id, Player.elo_rating, Player.score, Player.version).where(Player.id.in_(player_ids))
+        )
+    }
+
+    history = []
+    for match in results:
+        player1_id, player2_id, winner_id = match["player1_id"], match["player2_id"], match["winner_id"]
+        player1, player2 = players[player1_id], players[player2_id]
+        outcome = calculate_match_outcome(
+            player1[0],
+            player2[0],
+            winner_id,
+            player1_id,
+            player2_id,
+            player1_match_count=player1[1],  # Same wins-as-match-count approximation as POST /matches
+            player2_match_count=player2[1]
+        )
+        for player_id, player, new_rating in (
+            (player1_id, player1, outcome['player1_new_rating']),
+            (player2_id, player2, outcome['player2_new_rating']),
+        ):
+            history.append({
+                "player_id": player_id,
+                "event_id": match["event_id"],
+                "match_id": match["id"],
+                "reason": "match",
+                "rating_before": player[0],
+                "rating_after": new_rating,
+                "delta": new_rating - player[0],
+                "k_factor": outcome['player1_k_factor'],
+            })
+            player[0] = new_rating
+        players[winner_id][1] += 1
+
+    db.execute(insert(RatingHistory), history)
+    write_player_ratings(db, [
+        {"id": player_id, "version": version, "elo_rating": rating, "score": score}
+        for player_id, (rating, score, version) in players.items()
+    ])
+    # Many ratings may have moved: recompute ranking positions once per event
+    for event_id in sorted({match["event_id"] for match in results}):
+        rerank_players(db, event_id)
+        extend_rating_checkpoints(db, event_id)
+    apply_bulk_match_stats(db, results)
+    # Bulk UPDATE bypasses the identity map: reload players on next access
+    db.expire_all()
+
+
+def import_matches(db: Session, rows: List[Any]) -> Dict[str, Any]:
+    """
+    Validate and import a batch of matches. The caller commits.
+
+    Returns:
+        Dictionary matching schemas.MatchBulkResponse
+    """
+    valid, errors = _validate_rows(db, rows)
+
+    finished_at = datetime.now(timezone.utc)
+    matches = [
+        {
+            "event_id": match.event_id,
+            "player1_id": match.player1_id,
+            "player2_id": match.player2_id,
+            "player1_games": match.player1_games if match.player1_games is not None else 0,
+            "player2_games": match.player2_games if match.player2_games is not None else 0,
+            "games_score": match.games_score,
+            "winner_id": match.winner_id,
+            "best_of": match.best_of,
+            "finished": match.winner_id is not None,
+            "finished_at": finished_at if match.winner_id is not None else None,
+        }
+        for _, match in valid
+    ]
+    if matches:
+        # IDs follow submission order, so (finished_at, id) replays the batch in that order
+        match_ids = db.scalars(insert(Match).returning(Match.id, sort_by_parameter_order=True), matches).all()
+        for match, match_id in zip(matches, match_ids):
+            match["id"] = match_id
+        _apply_results(db, matches)
+
+    return {
+        "received": len(rows),
+        "imported": len(matches),
+        "match_ids": [match["id"] for match in matches],
+        "errors": errors,
+    }
@@ -0,0 +1,205 @@
+"""
+Write-Behind Match Result Queue
+
+SQLite has a single writer: when many requests report results at once, they
+wait on the database lock inside the request threadpool. In write-behind mode
+a result is only validated against MatchCreate and queued, and the request is
+answered at once with a ticket ID. A single writer thread applies the queued
+results in batches, each batch in one transaction through
+match_import.import_matches (set-based validation, executemany insert, Elo
+applied in submission order).
+
+Tickets report the outcome of each result (queued, applied with its match ID,
+or rejected with the validation error). Results still queued when the process
+dies are lost: stop() drains the queue on shutdown.
+"""
+
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from schemas import MatchCreate
+from utils.concurrency import retry_on_conflict
+from utils.event_stream import publish_matches_created
+from utils.match_import import import_matches
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+APPLIED = "applied"
+REJECTED = "rejected"
+
+_STOP = object()
+
+
+class QueueFullError(Exception):
+    """Raised when the queue already holds max_depth results"""
+
+
+@dataclass
+class Ticket:
+    """A queued match result and its outcome"""
+    ticket_id: str
+    payload: Dict[str, Any]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    status: str = QUEUED
+    match_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class MatchResultQueue:
+    """FIFO of match results applied in batches by one writer thread"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int,
+        batch_wait: float,
+        max_depth: int,
+        ticket_retention: int,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.max_depth = max_depth
+        self.ticket_retention = ticket_retention
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._tickets: "OrderedDict[str, Ticket]" = OrderedDict()
+        self._pending: "OrderedDict[str, Ticket]" = OrderedDict()
+        self._writer: Optional[threading.Thread] = None
+        self._applied = 0
+        self._rejected = 0
+        self._batches = 0
+        self._last_batch_size = 0
+        self._last_lag = 0.0
+        self._max_lag = 0.0
+
+    def submit(self, match_data: MatchCreate) -> Ticket:
+        """
+        Queue a result and return its ticket, starting the writer if needed.
+
+        Raises:
+            QueueFullError: If max_depth results are already waiting
+        """
+        ticket = Ticket(ticket_id=uuid.uuid4().hex, payload=match_data.model_dump())
+        with self._lock:
+            if len(self._pending) >= self.max_depth:
+                raise QueueFullError(f"Match queue is full ({self.max_depth} results waiting)")
+            self._tickets[ticket.ticket_id] = ticket
+            self._pending[ticket.ticket_id] = ticket
+            self._start_writer()
+        self._queue.put(ticket)
+        return ticket
+
+    def ticket(self, ticket_id: str) -> Optional[Ticket]:
+        """Ticket by ID (None if unknown or no longer retained)"""
+        with self._lock:
+            return self._tickets.get(ticket_id)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, lag and throughput counters"""
+        with self._lock:
+            oldest = next(iter(self._pending.values()), None)
+            return {
+                "queue_depth": len(self._pending),
+                "oldest_pending_seconds": time.monotonic() - oldest.enqueued_at if oldest else 0.0,
+                "last_lag_seconds": self._last_lag,
+                "max_lag_seconds": self._max_lag,
+                "applied_total": self._applied,
+                "rejected_total": self._rejected,
+                "batches_total": self._batches,
+                "last_batch_size": self._last_batch_size,
+                "writer_running": self._writer is not None and self._writer.is_alive(),
+            }
+
+    def join(self) -> None:
+        """Block until every submitted result has been applied or rejected"""
+        self._queue.join()
+
+    def stop(self) -> None:
+        """Apply the remaining results, then stop the writer"""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(_STOP)
+            writer.join()
+
+    def _start_writer(self) -> None:
+        """Start the writer thread (caller holds the lock)"""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._run, name="match-queue-writer", daemon=True)
+            self._writer.start()
+
+    def _run(self) -> None:
+        """Writer loop: take the next result, gather a batch behind it, apply it"""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            batch, stop = [item], False
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._apply(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _apply(self, batch: List[Ticket]) -> None:
+        """Import a batch in one transaction and settle its tickets"""
+        db = self.session_factory()
+        try:
+            report = retry_on_conflict(db, lambda: import_matches(db, [ticket.payload for ticket in batch]))
+            errors = {error["row"]: error["detail"] for error in report["errors"]}
+        except Exception as e:
+            logger.exception("Match queue batch of %d results failed", len(batch))
+            report, errors = {"match_ids": []}, {row: str(e) for row in range(1, len(batch) + 1)}
+        else:
+            try:
+                publish_matches_created(db, report["match_ids"])
+            except Exception:
+                # The batch is committed: a failed notification doesn't change its outcome
+                logger.exception("Could not publish %d queued matches", len(report["match_ids"]))
+        finally:
+            db.close()
+
+        match_ids = iter(report["match_ids"])
+        now = time.monotonic()
+        with self._lock:
+            for row, ticket in enumerate(batch, start=1):
+                if row in errors:
+                    ticket.status, ticket.detail = REJECTED, errors[row]
+                    self._rejected += 1
+                else:
+                    ticket.status, ticket.match_id = APPLIED, next(match_ids)
+                    self._applied += 1
+                self._pending.pop(ticket.ticket_id, None)
+            self._batches += 1
+            self._last_batch_size = len(batch)
+            self._last_lag = now - batch[0].enqueued_at
+            self._max_lag = max(self._max_lag, self._last_lag)
+            # Forget the oldest settled tickets beyond the retention limit
+            while len(self._tickets) > self.ticket_retention:
+                oldest_id, oldest = next(iter(self._tickets.items()))
+                if oldest.status == QUEUED:
+                    break
+                del self._tickets[oldest_id]
@@ -0,0 +1,85 @@
+"""
+Keyset (cursor) Pagination Helpers
+
+A page is requested with `limit` and an opaque `cursor` that encodes the sort
+key of the last row already returned. The next page is then read with a range
+condition on an index instead of OFFSET, so every page costs the same.
+
+A sort is described as a sequence of (column, direction) pairs whose last
+column is unique (usually the primary key), e.g.:
+    ((Stats.wins, "desc"), (Stats.win_rate, "desc"), (Player.id, "asc"))
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+SortSpec = Sequence[Tuple[Any, str]]
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Encode the sort name and last row's sort key as an opaque URL-safe cursor"""
+    payload = json.dumps({"s": sort, "v": list(values)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, size: int) -> list:
+    """
+    Decode a cursor produced by encode_cursor for the same sort.
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+        cursor_sort = payload["s"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if cursor_sort != sort or not isinstance(values, list) or len(values) != size:
+        raise ValueError("Cursor does not match the requested sort")
+    return values
+
+
+def order_by_clauses(spec: SortSpec, reverse: bool = False) -> list:
+    """ORDER BY clauses for a sort spec (or for its reverse order)"""
+    return [
+        column.desc() if (direction == "desc") != reverse else column.asc()
+        for column, direction in spec
+    ]
+
+
+def keyset_condition(spec: SortSpec, values: Sequence[Any], before: bool = False):
+    """
+    WHERE condition selecting rows strictly after (or before) `values` in sort order.
+
+    Expanded as (a > x) OR (a = x AND b > y) OR ..., plus a redundant bound on
+    the leading column so SQLite can use it as an index range.
+    """
+    branches = []
+    for i, (column, direction) in enumerate(spec):
+        forward = (direction == "asc") != before
+        comparison = column > values[i] if forward else column < values[i]
+        equal_prefix = [spec[j][0] == values[j] for j in range(i)]
+        branches.append(and_(*equal_prefix, comparison))
+
+    leading, direction = spec[0]
+    forward = (direction == "asc") != before
+    leading_bound = leading >= values[0] if forward else leading <= values[0]
+    return and_(leading_bound, or_(*branches))
+
+
+def row_key(row: Dict[str, Any], keys: Sequence[str]) -> list:
+    """Sort key of a result row, in the order expected by encode_cursor"""
+    return [row[key] for key in keys]
+
+
+def paginate_rows(rows: list, limit: Optional[int]) -> Tuple[list, bool]:
+    """Split rows fetched with LIMIT limit + 1 into (page, has_more)"""
+    if limit is None or len(rows) <= limit:
+        return rows, False
+    return rows[:limit], True
@@ -0,0 +1,135 @@
+"""
+Materialized Player Ranking Positions
+
+Keeps `Player.ranking` equal to the player's dense rank by Elo rating among
+the active players of their event (1 = highest rating, ties share a rank,
+inactive players have ranking 0):
+- rank_player / unrank_player: add or remove a player from the ranking
+- move_player_rating: change a player's rating, shifting only the rows whose rank changes
+- rerank_players: full recomputation with DENSE_RANK() OVER, used as a repair job
+
+With dense ranks, a rating change only affects the players rated between the
+old and the new rating, and only when those rating values become (or stop
+being) distinct. All lookups are seeks on players(event_id, active, elo_rating).
+"""
+
+from typing import Optional
+
+from sqlalchemy import exists, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from models.player import Player
+
+
+def _others(player: Player):
+    """Conditions selecting the other ranked players of the player's event"""
+    return (
+        Player.event_id == player.event_id,
+        Player.active.is_(True),
+        Player.id != player.id,
+    )
+
+
+def _rating_taken(db: Session, player: Player, rating: float) -> bool:
+    """Return True if another ranked player of the event has exactly this rating"""
+    return db.scalar(select(exists().where(*_others(player), Player.elo_rating == rating)))
+
+
+def _shift(db: Session, player: Player, delta: int, *conditions) -> None:
+    """Add `delta` to the ranking of the other ranked players matching `conditions`"""
+    db.execute(
+        update(Player)
+        .where(*_others(player), *conditions)
+        .values(ranking=Player.ranking + delta)
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+def _rank_for(db: Session, player: Player, rating: float) -> int:
+    """Dense rank a player would have at `rating`, from the neighbor ranked just above"""
+    same = db.scalar(select(Player.ranking).where(*_others(player), Player.elo_rating == rating).limit(1))
+    if same is not None:
+        return same
+    above = db.scalar(
+        select(Player.ranking)
+        .where(*_others(player), Player.elo_rating > rating)
+        .order_by(Player.elo_rating.asc())
+        .limit(1)
+    )
+    return 1 if above is None else above + 1
+
+
+def rank_player(db: Session, player: Player) -> None:
+    """Insert an active player into the ranking at their current rating"""
+    db.flush()
+    if not _rating_taken(db, player, player.elo_rating):
+        _shift(db, player, 1, Player.elo_rating < player.elo_rating)
+    player.ranking = _rank_for(db, player, player.elo_rating)
+
+
+def unrank_player(db: Session, player: Player) -> None:
+    """Remove a player from the ranking (before deactivating them)"""
+    db.flush()
+    if not _rating_taken(db, player, player.elo_rating):
+        _shift(db, player, -1, Player.elo_rating < player.elo_rating)
+    player.ranking = 0
+
+
+def move_player_rating(db: Session, player: Player, new_rating: float) -> None:
+    """
+    Set a ranked player's Elo rating and update the affected ranking positions.
+
+    Removing the old rating value (if nobody else has it) moves every lower
+    player up one rank; adding the new value (if nobody else has it) moves
+    every lower player down one rank. Only the difference is written, i.e.
+    the players rated between the old and the new rating.
+    """
+    db.flush()
+    old_rating = player.elo_rating
+    if not player.active or new_rating == old_rating:
+        player.elo_rating = new_rating
+        return
+
+    vanishes = not _rating_taken(db, player, old_rating)
+    appears = not _rating_taken(db, player, new_rating)
+    low, high = sorted((old_rating, new_rating))
+    if vanishes and appears:
+        # Players strictly between the two ratings cross over the moved player
+        delta = 1 if new_rating > old_rating else -1
+        _shift(db, player, delta, Player.elo_rating > low, Player.elo_rating < high)
+    elif vanishes:
+        _shift(db, player, -1, Player.elo_rating < old_rating)
+    elif appears:
+        _shift(db, player, 1, Player.elo_rating < new_rating)
+
+    player.elo_rating = new_rating
+    player.ranking = _rank_for(db, player, new_rating)
+
+
+def rerank_players(db: Session, event_id: Optional[int] = None) -> int:
+    """
+    Recompute every ranking position with DENSE_RANK() OVER (repair job).
+
+    Returns the number of players whose stored ranking was wrong. The caller commits.
+    """
+    db.flush()
+    ranked = select(
+        Player.id,
+        func.dense_rank().over(partition_by=Player.event_id, order_by=Player.elo_rating.desc()).label("rank"),
+    ).where(Player.active.is_(True))
+    inactive = [Player.active.is_not(True), Player.ranking != 0]
+    if event_id is not None:
+        ranked = ranked.where(Player.event_id == event_id)
+        inactive.append(Player.event_id == event_id)
+    ranked = ranked.subquery()
+
+    corrected = db.execute(
+        update(Player)
+        .where(Player.id == ranked.c.id, or_(Player.ranking.is_(None), Player.ranking != ranked.c.rank))
+        .values(ranking=ranked.c.rank)
+        .execution_options(synchronize_session="fetch")
+    ).rowcount
+    corrected += db.execute(
+        update(Player).where(*inactive).values(ranking=0).execution_options(synchronize_session="fetch")
+    ).rowcount
+    return corrected
@@ -0,0 +1,396 @@
+"""
+Player Event Statistics Maintenance
+
+Keeps the materialized `player_event_stats` table in sync with `matches`:
+- apply_match_stats: add (or revert) one match's contribution in the caller's transaction
+- apply_bulk_match_stats: add the contributions of a batch of new matches
+- player_stats_statement: recompute the statistics from scratch in one grouped query
+- find_player_stats_drift / rebuild_player_stats: compare and rewrite the table
+
+The cross-event `global_player_stats` table gets the same deltas, keyed by
+Player.player_key: players are per-event rows, so the same person in several
+events shares a key. The key defaults to the normalized name when the player
+is registered (namesakes can be given distinct keys) and survives renames.
+Only active players are counted there, as in the event ranking: deactivating
+a player withdraws their event totals (withdraw_global_stats).
+
+Only finished matches with a winner count towards the statistics.
+"""
+
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, delete, func, insert, or_, select, union_all, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from models.match import Match
+from models.player import Player
+from models.player_stats import GlobalPlayerStats, PlayerEventStats
+
+STAT_FIELDS = (
+    "wins", "losses", "win_rate", "games_won", "games_lost", "matches_played", "last_played_at"
+)
+
+
+GLOBAL_DELTA_FIELDS = ("wins", "losses", "games_won", "games_lost", "matches_played")
+
+
+def counts_for_stats(match: Match) -> bool:
+    """Return True if the match contributes to wins/losses"""
+    return bool(match.finished) and match.winner_id is not None
+
+
+def _win_rate_expr(wins, losses):
+    """SQL expression for the rounded win rate stored in the table"""
+    return case(
+        (wins + losses > 0, func.round(wins * 1.0 / (wins + losses), 2)),
+        else_=0.0,
+    )
+
+
+@lru_cache(maxsize=4096)
+def win_rate(wins: int, losses: int) -> float:
+    """
+    Python equivalent of _win_rate_expr: SQLite's round() rounds the shortest
+    decimal representation half up, unlike Python's round()
+    """
+    if wins + losses == 0:
+        return 0.0
+    rate = Decimal(repr(wins / (wins + losses)))
+    return float(rate.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+def apply_match_stats(db: Session, match: Match, sign: int = 1) -> None:
+    """
+    Add (sign=1) or revert (sign=-1) a match's contribution to both players' stats.
+
+    Statements run in the caller's session, so the change commits (or rolls back)
+    together with the match itself. Call with sign=-1 *before* changing or
+    deleting a match, and with sign=1 after the new result is set.
+    """
+    if not counts_for_stats(match):
+        return
+
+    sides = (
+        (match.player1_id, match.player1_games or 0, match.player2_games or 0),
+        (match.player2_id, match.player2_games or 0, match.player1_games or 0),
+    )
+    identities = _global_identities(db, (match.player1_id, match.player2_id))
+    for player_id, games_won, games_lost in sides:
+        won = 1 if match.winner_id == player_id else 0
+        deltas = {
+            "wins": sign * won,
+            "losses": sign * (1 - won),
+            "games_won": sign * games_won,
+            "games_lost": sign * games_lost,
+            "matches_played": sign,
+        }
+        if sign > 0:
+            _add_to_stats(db, player_id, match.event_id, deltas, match.finished_at)
+        else:
+            _remove_from_stats(db, player_id, deltas, match.id)
+        if player_id in identities:
+            _apply_global_stats(db, *identities[player_id], deltas)
+
+
+def apply_bulk_match_stats(db: Session, matches: Iterable[Dict[str, Any]]) -> None:
+    """
+    Add the contribution of many new matches (dictionaries with the Match
+    column values) to the players' stats.
+
+    Deltas are summed per player first, so each stats row is upserted once
+    whatever the number of matches.
+    """
+    totals: Dict[int, Dict[str, int]] = {}
+    events: Dict[int, int] = {}
+    played_at: Dict[int, Optional[datetime]] = {}
+    for match in matches:
+        if not match["finished"] or match["winner_id"] is None:
+            continue
+        games1, games2 = match.get("player1_games") or 0, match.get("player2_games") or 0
+        for player_id, games_won, games_lost in (
+            (match["player1_id"], games1, games2),
+            (match["player2_id"], games2, games1),
+        ):
+            won = 1 if match["winner_id"] == player_id else 0
+            deltas = totals.setdefault(player_id, dict.fromkeys(GLOBAL_DELTA_FIELDS, 0))
+            deltas["wins"] += won
+            deltas["losses"] += 1 - won
+            deltas["games_won"] += games_won
+            deltas["games_lost"] += games_lost
+            deltas["matches_played"] += 1
+            events[player_id] = match["event_id"]
+            latest, finished_at = played_at.get(player_id), match.get("finished_at")
+            played_at[player_id] = latest if finished_at is None or (latest and latest >= finished_at) else finished_at
+
+    if not totals:
+        return
+    identities = _global_identities(db, totals)
+    for player_id, deltas in totals.items():
+        _add_to_stats(db, player_id, events[player_id], deltas, played_at[player_id])
+        if player_id in identities:
+            _apply_global_stats(db, *identities[player_id], deltas)
+
+
+def _global_identities(db: Session, player_ids: Iterable[int]) -> Dict[int, tuple]:
+    """(player_key, name) of the given players that count globally (the active ones)"""
+    rows = db.execute(
+        select(Player.id, Player.player_key, Player.name)
+        .where(Player.id.in_(list(player_ids)), Player.active.is_(True))
+    ).all()
+    return {player_id: (key, name) for player_id, key, name in rows}
+
+
+def _add_to_stats(
+    db: Session, player_id: int, event_id: int, deltas: Dict[str, int],
+    played_at: Optional[datetime]
+) -> None:
+    """Upsert a player's stats row, incrementing counters by `deltas`"""
+    table = PlayerEventStats.__table__
+    wins = table.c.wins + deltas["wins"]
+    losses = table.c.losses + deltas["losses"]
+    last_played = table.c.last_played_at
+    if played_at is not None:
+        last_played = case(
+            (or_(table.c.last_played_at.is_(None), table.c.last_played_at < played_at), played_at),
+            else_=table.c.last_played_at,
+        )
+
+    stmt = sqlite_insert(table).values(
+        player_id=player_id,
+        event_id=event_id,
+        win_rate=win_rate(deltas["wins"], deltas["losses"]) if deltas["matches_played"] > 0 else 0.0,
+        last_played_at=played_at,
+        **deltas,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.player_id],
+        set_={
+            **{field: getattr(table.c, field) + delta for field, delta in deltas.items()},
+            "win_rate": _win_rate_expr(wins, losses),
+            "last_played_at": last_played,
+        },
+    )
+    db.execute(stmt)
+
+
+def _remove_from_stats(db: Session, player_id: int, deltas: Dict[str, int], match_id: int) -> None:
+    """Decrement a player's stats row and recompute last_played_at without the match"""
+    table = PlayerEventStats.__table__
+    wins = table.c.wins + deltas["wins"]
+    losses = table.c.losses + deltas["losses"]
+    last_played = (
+        select(func.max(Match.finished_at))
+        .where(
+            or_(Match.player1_id == player_id, Match.player2_id == player_id),
+            Match.finished,
+            Match.winner_id.is_not(None),
+            Match.id != match_id,
+        )
+        .scalar_subquery()
+    )
+    db.execute(
+        update(table)
+        .where(table.c.player_id == player_id)
+        .values(
+            **{field: getattr(table.c, field) + delta for field, delta in deltas.items()},
+            win_rate=_win_rate_expr(wins, losses),
+            last_played_at=last_played,
+        )
+    )
+
+
+def _apply_global_stats(db: Session, key: str, name: str, deltas: Dict[str, int]) -> None:
+    """Upsert a global stats row, incrementing counters by `deltas`; drop it when emptied"""
+    table = GlobalPlayerStats.__table__
+    wins = table.c.wins + deltas["wins"]
+    losses = table.c.losses + deltas["losses"]
+    stmt = sqlite_insert(table).values(
+        player_key=key,
+        name=name,
+        win_rate=win_rate(deltas["wins"], deltas["losses"]) if deltas["matches_played"] > 0 else 0.0,
+        **deltas,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.player_key],
+        set_={
+            **{field: getattr(table.c, field) + delta for field, delta in deltas.items()},
+            "win_rate": _win_rate_expr(wins, losses),
+        },
+    )
+    db.execute(stmt)
+    if deltas["matches_played"] < 0:
+        db.execute(delete(table).where(table.c.player_key == key, table.c.matches_played <= 0))
+
+
+def _event_totals(db: Session, player: Player) -> Optional[Dict[str, int]]:
+    """The player's event counters as global deltas, None if they count for nothing"""
+    if not player.active:
+        return None
+    stats = db.get(PlayerEventStats, player.id)
+    if stats is None or not stats.matches_played:
+        return None
+    return {field: getattr(stats, field) for field in GLOBAL_DELTA_FIELDS}
+
+
+def move_global_stats(db: Session, player: Player, new_key: str) -> None:
+    """Move a player's event statistics from their current player_key to `new_key`"""
+    deltas = _event_totals(db, player)
+    if deltas is None or new_key == player.player_key:
+        return
+    _apply_global_stats(db, player.player_key, player.name, {field: -value for field, value in deltas.items()})
+    _apply_global_stats(db, new_key, player.name, deltas)
+
+
+def withdraw_global_stats(db: Session, player: Player) -> None:
+    """Remove an active player's event statistics from the global totals (call before deactivating)"""
+    deltas = _event_totals(db, player)
+    if deltas is not None:
+        _apply_global_stats(db, player.player_key, player.name, {field: -value for field, value in deltas.items()})
+
+
+def player_stats_statement(event_id: Optional[int] = None):
+    """
+    Build the grouped aggregation that recomputes statistics from `matches`.
+
+    Each counted match contributes one row per participant (UNION ALL of the
+    player1 and player2 sides); the totals are outer-joined to players so that
+    players without matches get zeroed rows.
+    """
+    def side(player_col, won_col, lost_col):
+        stmt = select(
+            player_col.label("player_id"),
+            Match.winner_id.label("winner_id"),
+            func.coalesce(won_col, 0).label("games_won"),
+            func.coalesce(lost_col, 0).label("games_lost"),
+            Match.finished_at.label("finished_at"),
+        ).where(Match.finished, Match.winner_id.is_not(None))
+        if event_id is not None:
+            stmt = stmt.where(Match.event_id == event_id)
+        return stmt
+
+    sides = union_all(
+        side(Match.player1_id, Match.player1_games, Match.player2_games),
+        side(Match.player2_id, Match.player2_games, Match.player1_games),
+    ).subquery("sides")
+
+    totals = (
+        select(
+            sides.c.player_id,
+            func.sum(case((sides.c.winner_id == sides.c.player_id, 1), else_=0)).label("wins"),
+            func.sum(case((sides.c.winner_id != sides.c.player_id, 1), else_=0)).label("losses"),
+            func.sum(sides.c.games_won).label("games_won"),
+            func.sum(sides.c.games_lost).label("games_lost"),
+            func.count().label("matches_played"),
+            func.max(sides.c.finished_at).label("last_played_at"),
+        )
+        .group_by(sides.c.player_id)
+        .subquery("totals")
+    )
+
+    wins = func.coalesce(totals.c.wins, 0)
+    losses = func.coalesce(totals.c.losses, 0)
+    stmt = (
+        select(
+            Player.id.label("player_id"),
+            Player.event_id,
+            wins.label("wins"),
+            losses.label("losses"),
+            _win_rate_expr(wins, losses).label("win_rate"),
+            func.coalesce(totals.c.games_won, 0).label("games_won"),
+            func.coalesce(totals.c.games_lost, 0).label("games_lost"),
+            func.coalesce(totals.c.matches_played, 0).label("matches_played"),
+            totals.c.last_played_at,
+        )
+        .outerjoin(totals, totals.c.player_id == Player.id)
+        .order_by(Player.id)
+    )
+    if event_id is not None:
+        stmt = stmt.where(Player.event_id == event_id)
+    return stmt
+
+
+def find_player_stats_drift(db: Session, event_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Compare stored statistics with a from-scratch recomputation.
+
+    Returns one entry per mismatching field: player_id, field, stored, expected.
+    A missing row is reported with field "row".
+    """
+    expected_rows = db.execute(player_stats_statement(event_id)).mappings().all()
+
+    stored_query = select(PlayerEventStats)
+    if event_id is not None:
+        stored_query = stored_query.where(PlayerEventStats.event_id == event_id)
+    stored = {row.player_id: row for row in db.scalars(stored_query)}
+
+    drift = []
+    for expected in expected_rows:
+        row = stored.get(expected["player_id"])
+        if row is None:
+            drift.append({"player_id": expected["player_id"], "field": "row", "stored": None, "expected": "present"})
+            continue
+        for field in STAT_FIELDS:
+            if getattr(row, field) != expected[field]:
+                drift.append({
+                    "player_id": expected["player_id"],
+                    "field": field,
+                    "stored": getattr(row, field),
+                    "expected": expected[field],
+                })
+    return drift
+
+
+def rebuild_player_stats(db: Session, event_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Recompute `player_event_stats` from scratch (for one event or all of them).
+
+    global_player_stats is rebuilt as well, since it aggregates every event.
+    Returns the drift found before the rebuild. The caller commits.
+    """
+    drift = find_player_stats_drift(db, event_id)
+
+    clear = delete(PlayerEventStats)
+    if event_id is not None:
+        clear = clear.where(PlayerEventStats.event_id == event_id)
+    db.execute(clear)
+
+    rows = [dict(row) for row in db.execute(player_stats_statement(event_id)).mappings()]
+    if rows:
+        db.execute(insert(PlayerEventStats), rows)
+    rebuild_global_stats(db)
+    return drift
+
+
+def rebuild_global_stats(db: Session) -> int:
+    """
+    Recompute `global_player_stats` from `player_event_stats`.
+
+    Active players' rows are merged by Player.player_key; the display name is
+    the spelling of the first player registered. Returns the number of rows.
+    """
+    totals: Dict[str, Dict[str, Any]] = {}
+    per_player = db.execute(
+        select(Player.player_key, Player.name, *(getattr(PlayerEventStats, field) for field in GLOBAL_DELTA_FIELDS))
+        .join(PlayerEventStats, PlayerEventStats.player_id == Player.id)
+        .where(PlayerEventStats.matches_played > 0, Player.active.is_(True))
+        .order_by(Player.id)
+    ).mappings()
+    for row in per_player:
+        entry = totals.setdefault(row["player_key"], {
+            "name": row["name"], **{field: 0 for field in GLOBAL_DELTA_FIELDS}
+        })
+        for field in GLOBAL_DELTA_FIELDS:
+            entry[field] += row[field]
+
+    db.execute(delete(GlobalPlayerStats))
+    rows = [{"player_key": key, **entry} for key, entry in totals.items()]
+    if rows:
+        db.execute(insert(GlobalPlayerStats), rows)
+        # Same SQL rounding as the incremental path
+        table = GlobalPlayerStats.__table__
+        db.execute(update(table).values(win_rate=_win_rate_expr(table.c.wins, table.c.losses)))
+    return len(rows)
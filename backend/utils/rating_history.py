@@ -0,0 +1,110 @@
+"""
+Rating History Ledger
+
+Append-only record of every Elo rating change (see models.rating_history):
+- record_match_ratings: entries for both players of a match result
+- record_replay_corrections: entries for ratings changed by an event replay
+- rating_history_series: a player's history, downsampled in SQL
+"""
+
+import math
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from models.match import Match
+from models.player import Player
+from models.rating_history import RatingHistory
+
+
+def record_match_ratings(db: Session, match: Match, player1: Player, player2: Player, outcome: dict) -> None:
+    """
+    Append ledger entries for a match result.
+
+    Must be called before the players' ratings are updated with `outcome`
+    (the current ratings are recorded as rating_before).
+    """
+    if match.id is None:
+        db.flush()
+
+    # update_ratings applies player 1's K-factor to both players: record the K actually used
+    k_factor = outcome['player1_k_factor']
+    db.execute(insert(RatingHistory), [
+        {
+            "player_id": player.id,
+            "event_id": match.event_id,
+            "match_id": match.id,
+            "reason": "match",
+            "rating_before": player.elo_rating,
+            "rating_after": new_rating,
+            "delta": new_rating - player.elo_rating,
+            "k_factor": k_factor,
+        }
+        for player, new_rating in (
+            (player1, outcome['player1_new_rating']),
+            (player2, outcome['player2_new_rating']),
+        )
+    ])
+
+
+def record_replay_corrections(
+    db: Session, event_id: int, changes: Iterable[Tuple[int, float, float]]
+) -> int:
+    """
+    Append ledger entries for ratings changed by a replay.
+
+    Args:
+        changes: (player_id, rating_before, rating_after) for every replayed player
+
+    Returns:
+        Number of entries written (unchanged ratings are skipped)
+    """
+    rows = [
+        {
+            "player_id": player_id,
+            "event_id": event_id,
+            "match_id": None,
+            "reason": "replay",
+            "rating_before": before,
+            "rating_after": after,
+            "delta": after - before,
+            "k_factor": None,
+        }
+        for player_id, before, after in changes
+        if before != after
+    ]
+    if rows:
+        db.execute(insert(RatingHistory), rows)
+    return len(rows)
+
+
+def rating_history_series(db: Session, player_id: int, points: int) -> Tuple[int, List]:
+    """
+    Get a player's rating history, downsampled to at most `points` entries.
+
+    Downsampling happens in SQL: every step-th entry (by ledger order) is kept,
+    always including the first and the last one, so only the selected rows are
+    read out of the database.
+
+    Returns:
+        Tuple of (total number of entries, selected RatingHistory rows in order)
+    """
+    total = db.scalar(
+        select(func.count()).select_from(RatingHistory).where(RatingHistory.player_id == player_id)
+    )
+    query = select(RatingHistory).where(RatingHistory.player_id == player_id)
+    if total <= points:
+        return total, db.scalars(query.order_by(RatingHistory.id)).all()
+
+    step = math.ceil((total - 1) / (points - 1))
+    numbered = (
+        select(RatingHistory.id, func.row_number().over(order_by=RatingHistory.id).label("rn"))
+        .where(RatingHistory.player_id == player_id)
+        .subquery()
+    )
+    selected = select(numbered.c.id).where(
+        or_((numbered.c.rn - 1) % step == 0, numbered.c.rn == total)
+    )
+    rows = db.scalars(query.where(RatingHistory.id.in_(selected)).order_by(RatingHistory.id)).all()
+    return total, rows
@@ -4,4 +4,28 @@ const api = axios.create({
   baseURL: "http://localhost:8000", // ajuste conforme necessário
 });
 
+// Escritas levam um Idempotency-Key: reenviar o mesmo pedido não o aplica duas vezes
+const WRITE_METHODS = ["post", "put", "patch"];
+const MAX_RETRIES = 2;
+
+api.interceptors.request.use((config) => {
+  if (WRITE_METHODS.includes(config.method) && !config.headers["Idempotency-Key"]) {
+    config.headers["Idempotency-Key"] = crypto.randomUUID();
+  }
+  return config;
+});
+
+// Só é seguro reenviar leituras e escritas com Idempotency-Key (DELETE e afins não têm)
+const canRetry = (config) => config.method === "get" || Boolean(config.headers?.["Idempotency-Key"]);
+
+// Sem resposta (Wi-Fi instável): reenvia com a mesma chave
+api.interceptors.response.use(undefined, (error) => {
+  const config = error.config;
+  if (!config || error.response || !canRetry(config) || (config.retries || 0) >= MAX_RETRIES) {
+    return Promise.reject(error);
+  }
+  config.retries = (config.retries || 0) + 1;
+  return api.request(config);
+});
+
 export default api;
@@ -16,4 +16,24 @@ export default {
   delete(id) {
     return api.delete(`/events/${id}`);
   },
+  // Server-Sent Events: match-created, match-updated, match-deleted, ranking-changed, membership-changed, resync
+  stream(id, handlers) {
+    const source = new EventSource(`${api.defaults.baseURL}/events/${id}/stream`);
+    for (const [type, handler] of Object.entries(handlers)) {
+      source.addEventListener(type, (message) => handler(JSON.parse(message.data)));
+    }
+    return source;
+  },
+  // Resolves to { playerIds: Int32Array, matrix: Float32Array (N x N, row-major) }
+  async getWinMatrix(id) {
+    const { data } = await api.get(`/events/${id}/win-matrix`, {
+      params: { format: "binary" },
+      responseType: "arraybuffer",
+    });
+    const n = new DataView(data).getUint32(0, true);
+    return {
+      playerIds: new Int32Array(data.slice(4, 4 + 4 * n)),
+      matrix: new Float32Array(data.slice(4 + 4 * n)),
+    };
+  },
 };
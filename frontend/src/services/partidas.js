@@ -4,9 +4,22 @@ export default {
   create(data) {
     return api.post("/matches", data);
   },
+  // matches: array of match objects, or a CSV string with a header row
+  importBulk(matches) {
+    if (typeof matches === "string") {
+      return api.post("/matches/bulk", matches, { headers: { "Content-Type": "text/csv" } });
+    }
+    return api.post("/matches/bulk", matches);
+  },
   getEventMatches(event_id) {
     return api.get("/matches", { params: { event_id } });
   },
+  // One page, newest first; pass the X-Next-Cursor header of a page as afterId
+  getEventMatchesPage(event_id, { limit = 50, afterId, playerId, finished } = {}) {
+    return api.get("/matches", {
+      params: { event_id, limit, order: "desc", after_id: afterId, player_id: playerId, finished },
+    });
+  },
   listarPorEvento(event_id) {
     return api.get("/matches", { params: { event_id } });
   },
@@ -22,4 +35,15 @@ export default {
   delete(id) {
     return api.delete(`/matches/${id}`);
   },
+  // Live scoring channel: receives {type: "score", ...}; umpires ({ umpire: true, token })
+  // also send {action: "point", player_id} or {action: "undo"}
+  liveScore(id, { umpire = false, token } = {}) {
+    const params = new URLSearchParams();
+    if (umpire) {
+      params.set("role", "umpire");
+      if (token) params.set("token", token);
+    }
+    const query = params.toString() ? `?${params}` : "";
+    return new WebSocket(`${api.defaults.baseURL.replace(/^http/, "ws")}/matches/${id}/live${query}`);
+  },
 };
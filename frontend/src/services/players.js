@@ -16,4 +16,13 @@ export default {
   listAll() {
     return api.get("/players/all");
   },
+  getStats(player_id) {
+    return api.get(`/players/${player_id}/stats`);
+  },
+  getRatingHistory(player_id, points = 200) {
+    return api.get(`/players/${player_id}/rating-history`, { params: { points } });
+  },
+  getHeadToHead(player_id, opponent_id, last = 5) {
+    return api.get(`/players/${player_id}/vs/${opponent_id}`, { params: { last } });
+  },
 };
@@ -12,4 +12,21 @@ export default {
   getLeaderboard(eventId) {
     return api.get(`/ranking?event_id=${eventId}`);
   },
+
+  getTopRanking(eventId, { limit = 10, sort = 'wins', cursor } = {}) {
+    return api.get(`/ranking/${eventId}`, { params: { limit, sort, cursor } });
+  },
+
+  getGlobalRanking({ limit = 50, sort = 'wins', cursor } = {}) {
+    return api.get('/ranking/global', { params: { limit, sort, cursor } });
+  },
+
+  // asOf: ISO timestamp or match ID
+  getRankingAsOf(eventId, asOf, { sort = 'wins', limit } = {}) {
+    return api.get(`/ranking/${eventId}`, { params: { as_of: asOf, sort, limit } });
+  },
+
+  getRankingAround(eventId, playerId, { window = 3, sort = 'wins' } = {}) {
+    return api.get(`/ranking/${eventId}/around/${playerId}`, { params: { window, sort } });
+  },
 };
@@ -1,44 +1,65 @@
 """Fixtures and test database setup for integration tests"""
+import asyncio
+import os
+import sys
+import tempfile
+
 import pytest
+from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-from fastapi.testclient import TestClient
-
-import sys
-import os
+from sqlalchemy.pool import NullPool, StaticPool
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..', 'backend'))
 
 # Module-level test database setup
+_test_dir = None
 _test_engine = None
 _TestingSessionLocal = None
+_test_async_engine = None
+_TestingAsyncSessionLocal = None
 
 
 def create_test_db():
-    """Create in-memory test database with StaticPool for thread-safe access"""
-    global _test_engine, _TestingSessionLocal
-    
-    # Create in-memory engine with StaticPool to share connection across threads
-    # This is necessary for pytest with async and multi-threaded requests
+    """Create a temporary file database, shared by a sync and an async (aiosqlite) engine"""
+    global _test_dir, _test_engine, _TestingSessionLocal, _test_async_engine, _TestingAsyncSessionLocal
+    from database import SQLITE_PROFILES, configure_sqlite
+
+    pragmas = SQLITE_PROFILES["performance"]
+
+    # A file (not :memory:) so that the async endpoints' aiosqlite connections
+    # see the same data; WAL lets them read while a test session writes
+    _test_dir = tempfile.TemporaryDirectory()
+    path = os.path.join(_test_dir.name, "test.db")
+
+    # StaticPool shares one connection across threads: the sync endpoints and
+    # db_session see each other's writes
     _test_engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{path}",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    configure_sqlite(_test_engine, pragmas)
+    # NullPool: each TestClient request runs on its own event loop
+    _test_async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    configure_sqlite(_test_async_engine.sync_engine, pragmas)
     
     # Import models to register them with Base before creating tables
-    from models import Event, Player, Match, Tournament  # noqa: F401
     from database import Base
+    from models import Event, Match, Player, Tournament  # noqa: F401
     
     # Create all tables
     Base.metadata.create_all(bind=_test_engine)
     
-    # Create session factory
+    # Create session factories
     _TestingSessionLocal = sessionmaker(
         autocommit=False, autoflush=False, bind=_test_engine
     )
+    _TestingAsyncSessionLocal = async_sessionmaker(
+        _test_async_engine, autoflush=False, expire_on_commit=False
+    )
 
 
 @pytest.fixture(autouse=True, scope="function")
@@ -47,9 +68,12 @@ def setup_test_database_session():
     create_test_db()
     yield
     # Cleanup
-    global _test_engine
     if _test_engine:
         _test_engine.dispose()
+    if _test_async_engine:
+        asyncio.run(_test_async_engine.dispose())
+    if _test_dir:
+        _test_dir.cleanup()
 
 
 @pytest.fixture
@@ -66,8 +90,8 @@ def db_session():
 @pytest.fixture
 def client():
     """Create a test client with database dependency overridden"""
+    import database
     from main import app
-    from routers import events, players, matches, ranking, tournament
     
     def override_get_db():
         """Override database dependency with test session"""
@@ -77,12 +101,15 @@ def client():
         finally:
             db.close()
     
-    # Override get_db in all routers
-    app.dependency_overrides[events.get_db] = override_get_db
-    app.dependency_overrides[players.get_db] = override_get_db
-    app.dependency_overrides[matches.get_db] = override_get_db
-    app.dependency_overrides[ranking.get_db] = override_get_db
-    app.dependency_overrides[tournament.get_db] = override_get_db
+    async def override_get_async_db():
+        """Override async database dependency with test session"""
+        async with _TestingAsyncSessionLocal() as db:
+            yield db
+
+    # Every router gets its sessions from the database module's providers
+    # (one pool for reads and writes alike here)
+    app.dependency_overrides[database.get_db] = override_get_db
+    app.dependency_overrides[database.get_async_db] = override_get_async_db
     
     # Create and yield client
     test_client = TestClient(app)
@@ -416,3 +416,16 @@ class TestTournamentAPI:
             assert response.status_code == 200
             data = response.json()
             assert data["tournament_type"] == tournament_type
+
+    def test_async_reads_see_the_test_database(self, client, event, players):
+        """The async GET endpoints read the same test database the writes went to"""
+        event_id = event["id"]
+        assert client.get(f"/events/{event_id}").status_code == 200
+
+        response = client.get(f"/players?event_id={event_id}")
+        assert response.status_code == 200
+        assert {player["id"] for player in response.json()} == {player["id"] for player in players}
+
+        response = client.get(f"/ranking/{event_id}")
+        assert response.status_code == 200
+        assert len(response.json()) == len(players)
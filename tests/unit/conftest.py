@@ -1,44 +1,87 @@
 """Fixtures and test database setup"""
+import asyncio
+import os
+import sys
+import tempfile
+
 import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
-from fastapi.testclient import TestClient
-
-import sys
-import os
+from sqlalchemy.pool import NullPool, StaticPool
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 # Module-level test database setup
+_test_dir = None
 _test_engine = None
 _TestingSessionLocal = None
+_test_read_engine = None
+_TestingReadSessionLocal = None
+_test_async_engine = None
+_TestingAsyncSessionLocal = None
+_test_async_read_engine = None
+_TestingAsyncReadSessionLocal = None
 
 
 def create_test_db():
-    """Create in-memory test database with StaticPool for thread-safe access"""
-    global _test_engine, _TestingSessionLocal
-    
-    # Create in-memory engine with StaticPool to share connection across threads
-    # This is necessary for pytest with async and multi-threaded requests
+    """Create a temporary file database with write and read-only pools, sync and async (aiosqlite)"""
+    global _test_dir, _test_engine, _TestingSessionLocal, _test_read_engine, _TestingReadSessionLocal
+    global _test_async_engine, _TestingAsyncSessionLocal, _test_async_read_engine, _TestingAsyncReadSessionLocal
+    from database import SQLITE_PROFILES, configure_sqlite
+
+    pragmas = SQLITE_PROFILES["performance"]
+    read_pragmas = {**pragmas, "query_only": "ON"}
+
+    # A file (not :memory:) so that the async endpoints' aiosqlite connections
+    # see the same data; WAL lets them read while a test session writes
+    _test_dir = tempfile.TemporaryDirectory()
+    path = os.path.join(_test_dir.name, "test.db")
+
+    # StaticPool shares one connection across threads: the sync endpoints and
+    # db_session see each other's writes, as with the former in-memory database
     _test_engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{path}",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    configure_sqlite(_test_engine, pragmas)
+    # GET requests read through query_only connections, as in production
+    _test_read_engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        poolclass=NullPool,
+    )
+    configure_sqlite(_test_read_engine, read_pragmas)
+    # NullPool: each TestClient request runs on its own event loop
+    _test_async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    configure_sqlite(_test_async_engine.sync_engine, pragmas)
+    _test_async_read_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    configure_sqlite(_test_async_read_engine.sync_engine, read_pragmas)
     
     # Import models to register them with Base before creating tables
-    from models import Event, Player, Match, Tournament  # noqa: F401
     from database import Base
+    from models import Event, Match, Player, Tournament  # noqa: F401
     
     # Create all tables
     Base.metadata.create_all(bind=_test_engine)
     
-    # Create session factory
+    # Create session factories
     _TestingSessionLocal = sessionmaker(
         autocommit=False, autoflush=False, bind=_test_engine
     )
+    _TestingReadSessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, bind=_test_read_engine
+    )
+    _TestingAsyncSessionLocal = async_sessionmaker(
+        _test_async_engine, autoflush=False, expire_on_commit=False
+    )
+    _TestingAsyncReadSessionLocal = async_sessionmaker(
+        _test_async_read_engine, autoflush=False, expire_on_commit=False
+    )
 
 
 @pytest.fixture(autouse=True, scope="function")
@@ -47,9 +90,14 @@ def setup_test_database_session():
     create_test_db()
     yield
     # Cleanup
-    global _test_engine
-    if _test_engine:
-        _test_engine.dispose()
+    for engine in (_test_engine, _test_read_engine):
+        if engine:
+            engine.dispose()
+    for engine in (_test_async_engine, _test_async_read_engine):
+        if engine:
+            asyncio.run(engine.dispose())
+    if _test_dir:
+        _test_dir.cleanup()
 
 
 @pytest.fixture
@@ -65,23 +113,30 @@ def db_session():
 
 @pytest.fixture
 def client():
-    """Create a test client with database dependency overridden"""
+    """Create a test client with the database dependencies overridden"""
+    import database
     from main import app
-    from routers import events, players, matches, ranking
     
-    def override_get_db():
-        """Override database dependency with test session"""
-        db = _TestingSessionLocal()
+    def override_get_db(request: Request):
+        """Override database dependency with test sessions, routed by method"""
+        factory = _TestingReadSessionLocal if request.method in database.READ_METHODS else _TestingSessionLocal
+        db = factory()
         try:
             yield db
         finally:
             db.close()
-    
-    # Override get_db in all routers
-    app.dependency_overrides[events.get_db] = override_get_db
-    app.dependency_overrides[players.get_db] = override_get_db
-    app.dependency_overrides[matches.get_db] = override_get_db
-    app.dependency_overrides[ranking.get_db] = override_get_db
+
+    async def override_get_async_db(request: Request):
+        """Override async database dependency with test sessions, routed by method"""
+        factory = (
+            _TestingAsyncReadSessionLocal if request.method in database.READ_METHODS else _TestingAsyncSessionLocal
+        )
+        async with factory() as db:
+            yield db
+
+    # Every router gets its sessions from the database module's providers
+    app.dependency_overrides[database.get_db] = override_get_db
+    app.dependency_overrides[database.get_async_db] = override_get_async_db
     
     # Create and yield client
     test_client = TestClient(app)
@@ -90,3 +145,22 @@ def client():
     # Clear overrides after test
     app.dependency_overrides.clear()
 
+
+@pytest.fixture
+def league(client, db_session):
+    """Event with three ATIVO players, created through the API"""
+    from models import Membership, MembershipStatus
+
+    event_id = client.post(
+        "/events", json={"name": "League Night", "date": "2024-12-15", "time": "19:00"}
+    ).json()["id"]
+    player_ids = [
+        client.post("/players", json={"name": name, "event_id": event_id}).json()["id"]
+        for name in ["Ana", "Bia", "Caio"]
+    ]
+    db_session.add_all([
+        Membership(event_id=event_id, player_id=player_id, status=MembershipStatus.ATIVO)
+        for player_id in player_ids
+    ])
+    db_session.commit()
+    return event_id, player_ids
@@ -0,0 +1,61 @@
+"""Unit tests for the async (aiosqlite) read endpoints"""
+import asyncio
+import inspect
+
+import anyio
+import httpx
+import pytest
+from fastapi import status
+
+HOT_READS = [
+    "/events",
+    "/events/{event_id}",
+    "/players",
+    "/players/{player_id}",
+    "/matches",
+    "/matches/{match_id}",
+    "/ranking",
+    "/ranking/global",
+    "/ranking/{event_id}",
+]
+
+
+@pytest.mark.unit
+def test_hot_reads_are_async():
+    from routers import events, matches, players, ranking
+
+    endpoints = {
+        route.path: route.endpoint
+        for module in (events, players, matches, ranking)
+        for route in module.router.routes
+        if "GET" in getattr(route, "methods", ())
+    }
+    assert [path for path in HOT_READS if not inspect.iscoroutinefunction(endpoints[path])] == []
+
+
+@pytest.mark.unit
+@pytest.mark.api
+def test_reads_are_served_with_the_threadpool_busy(client, league):
+    """Concurrent GETs complete while every threadpool worker is taken"""
+    from main import app
+
+    event_id, (ana, _, _) = league
+    paths = [f"/events/{event_id}", f"/players?event_id={event_id}", f"/players/{ana}",
+             f"/matches?event_id={event_id}", f"/ranking?event_id={event_id}", "/ranking/global"]
+
+    async def run():
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        limiter.total_tokens = 1
+        release = anyio.Event()
+        async with anyio.create_task_group() as tg:
+            # Holds the only worker until the reads are done
+            tg.start_soon(anyio.to_thread.run_sync, lambda: anyio.from_thread.run(release.wait))
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                with anyio.fail_after(10):
+                    responses = await asyncio.gather(*(http.get(path) for path in paths * 10))
+            release.set()
+        return responses
+
+    responses = asyncio.run(run())
+    assert {response.status_code for response in responses} == {status.HTTP_200_OK}
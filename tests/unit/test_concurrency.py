@@ -0,0 +1,212 @@
+"""Unit tests for optimistic concurrency on player ratings"""
+import threading
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+from models import Player, RatingHistory
+from utils import concurrency
+from utils.concurrency import ConcurrentUpdateError, retry_on_conflict, write_player_ratings
+
+
+@pytest.fixture
+def other_session(db_session):
+    """A second session on the same database, standing for another worker"""
+    session = sessionmaker(autoflush=False, bind=db_session.get_bind())()
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.mark.unit
+class TestCompareAndSwap:
+    """Player updates only apply to the version they were computed from"""
+
+    def test_version_increments_on_update(self, client, db_session, league):
+        _, (ana, _, _) = league
+        player = db_session.get(Player, ana)
+        version = player.version
+        player.elo_rating += 10
+        db_session.commit()
+        assert player.version == version + 1
+
+    def test_stale_orm_update_is_rejected(self, db_session, other_session, league):
+        """Two workers read the same rating: the second write fails instead of overwriting"""
+        _, (ana, _, _) = league
+        mine = db_session.get(Player, ana)
+        theirs = other_session.get(Player, ana)
+
+        theirs.elo_rating += 16
+        other_session.commit()
+
+        mine.elo_rating -= 16
+        with pytest.raises(StaleDataError):
+            db_session.commit()
+
+    def test_stale_bulk_write_is_rejected(self, db_session, other_session, league):
+        _, (ana, bia, _) = league
+        rows = [
+            {"id": pid, "version": version, "elo_rating": 1300.0, "score": 1}
+            for pid, version in db_session.execute(select(Player.id, Player.version).where(Player.id.in_((ana, bia))))
+        ]
+        other_session.get(Player, bia).score = 5
+        other_session.commit()
+
+        with pytest.raises(StaleDataError):
+            write_player_ratings(db_session, rows)
+
+
+@pytest.mark.unit
+class TestRetryOnConflict:
+    """Conflicting units of work are started over, a bounded number of times"""
+
+    def test_retry_keeps_both_updates(self, db_session, other_session, league, monkeypatch):
+        monkeypatch.setattr(concurrency, "RETRY_BACKOFF", 0)
+        _, (ana, _, _) = league
+        start = db_session.get(Player, ana).elo_rating
+        attempts = []
+
+        def add_five():
+            player = db_session.get(Player, ana)
+            if not attempts:
+                # Another worker commits between our read and our write
+                other_session.get(Player, ana).elo_rating += 10
+                other_session.commit()
+            attempts.append(player.elo_rating)
+            player.elo_rating += 5
+            return player.elo_rating
+
+        assert retry_on_conflict(db_session, add_five) == start + 15
+        assert attempts == [start, start + 10]
+
+    def test_gives_up_after_max_attempts(self, db_session, other_session, league, monkeypatch):
+        monkeypatch.setattr(concurrency, "RETRY_BACKOFF", 0)
+        _, (ana, _, _) = league
+        calls = []
+
+        def always_conflicts():
+            calls.append(1)
+            player = db_session.get(Player, ana)
+            other_session.get(Player, ana).score += 1
+            other_session.commit()
+            player.score += 1
+
+        with pytest.raises(ConcurrentUpdateError):
+            retry_on_conflict(db_session, always_conflicts, attempts=3)
+        assert len(calls) == 3
+
+
+@pytest.fixture
+def result_lands_on_load(db_session, monkeypatch):
+    """
+    bump(player_id, times): the next `times` loads of the player are followed
+    by a result changing their rating (and version) before the request writes
+    """
+    from sqlalchemy import event, update
+
+    monkeypatch.setattr(concurrency, "RETRY_BACKOFF", 0)
+    pending = {}
+
+    def on_load(player, context):
+        if pending.get(player.id):
+            pending[player.id] -= 1
+            with db_session.get_bind().begin() as conn:
+                conn.execute(
+                    update(Player).where(Player.id == player.id)
+                    .values(elo_rating=Player.elo_rating + 10, version=Player.version + 1)
+                )
+
+    event.listen(Player, "load", on_load)
+    yield pending.__setitem__
+    event.remove(Player, "load", on_load)
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestPlayerWrites:
+    """Player edits retry when a result changes the player between their read and their commit"""
+
+    def test_update_is_retried(self, client, db_session, league, result_lands_on_load):
+        _, (ana, _, _) = league
+        rating = db_session.get(Player, ana).elo_rating
+        result_lands_on_load(ana, 1)
+
+        response = client.put(f"/players/{ana}", json={"name": "Ana Souza"})
+        assert response.status_code == 200
+        assert (response.json()["name"], response.json()["elo_rating"]) == ("Ana Souza", rating + 10)
+
+    def test_delete_is_retried(self, client, db_session, league, result_lands_on_load):
+        _, (ana, _, _) = league
+        result_lands_on_load(ana, 1)
+
+        assert client.delete(f"/players/{ana}").status_code == 200
+        db_session.expire_all()
+        player = db_session.get(Player, ana)
+        assert (player.active, player.ranking) == (False, 0)
+
+    def test_persistent_conflict_is_409(self, client, db_session, league, result_lands_on_load):
+        _, (ana, _, _) = league
+        result_lands_on_load(ana, concurrency.MAX_ATTEMPTS)
+
+        assert client.delete(f"/players/{ana}").status_code == 409
+        db_session.expire_all()
+        assert db_session.get(Player, ana).active
+
+
+@pytest.mark.unit
+def test_concurrent_reporting_loses_no_update(tmp_path, monkeypatch):
+    """Workers reporting results for the same players in parallel keep an unbroken rating history"""
+    from database import Base
+    from models import Event, Membership, MembershipStatus
+    from routers.matches import register_match
+    from schemas import MatchCreate
+
+    monkeypatch.setattr(concurrency, "MAX_ATTEMPTS", 50)
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'concurrency.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autoflush=False, bind=engine)
+    with Session() as db:
+        event = Event(name="League Night", date="2024-12-15", time="19:00")
+        db.add(event)
+        db.flush()
+        players = [Player(name=name, event_id=event.id) for name in ("Ana", "Bia", "Caio")]
+        db.add_all(players)
+        db.flush()
+        db.add_all([Membership(event_id=event.id, player_id=p.id, status=MembershipStatus.ATIVO) for p in players])
+        db.commit()
+        event_id, ids = event.id, [p.id for p in players]
+
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(8):
+                p1, p2 = ids[(offset + i) % 3], ids[(offset + i + 1) % 3]
+                with Session() as db:
+                    register_match(MatchCreate(event_id=event_id, player1_id=p1, player2_id=p2, winner_id=p1), db)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+    with Session() as db:
+        for player in db.scalars(select(Player)):
+            history = db.scalars(
+                select(RatingHistory).where(RatingHistory.player_id == player.id).order_by(RatingHistory.id)
+            ).all()
+            # Each result starts from the rating the previous one produced
+            for previous, entry in zip(history, history[1:]):
+                assert entry.rating_before == previous.rating_after
+            assert history[-1].rating_after == player.elo_rating
+            assert player.score == sum(1 for entry in history if entry.delta > 0)
+    engine.dispose()
@@ -3,14 +3,15 @@ Unit tests for the Elo rating system module.
 """
 
 import pytest
+
 from elo import (
-    calculate_win_probability,
-    calculate_new_rating,
-    update_ratings,
-    get_rating_change,
-    get_initial_rating,
     INITIAL_RATING,
     K_FACTOR,
+    calculate_new_rating,
+    calculate_win_probability,
+    get_initial_rating,
+    get_rating_change,
+    update_ratings,
 )
 
 
@@ -243,3 +244,74 @@ class TestIntegrationScenarios:
         # After alternating wins/losses against equal opponent,
         # should be close to 1600
         assert abs(rating - 1600) < 50
+
+
+class TestBatchApi:
+    """Tests for the vectorized (NumPy) Elo functions."""
+
+    @staticmethod
+    def _random_matches(size, seed=7):
+        import random
+
+        rng = random.Random(seed)
+        p1_ratings = [rng.uniform(800, 2600) for _ in range(size)]
+        p2_ratings = [rng.uniform(800, 2600) for _ in range(size)]
+        p1_ids = list(range(1, size + 1))
+        p2_ids = [size + i for i in p1_ids]
+        winners = [rng.choice(pair) for pair in zip(p1_ids, p2_ids)]
+        p1_counts = [rng.randrange(0, 12) for _ in range(size)]
+        p2_counts = [rng.randrange(0, 12) for _ in range(size)]
+        return p1_ratings, p2_ratings, winners, p1_ids, p2_ids, p1_counts, p2_counts
+
+    def test_win_probability_batch_identical_to_scalar(self):
+        """Vectorized probabilities are bit-for-bit equal to the scalar path."""
+        from elo import calculate_win_probability_batch
+
+        ratings_a, ratings_b, *_ = self._random_matches(5000)
+        batch_a, batch_b = calculate_win_probability_batch(ratings_a, ratings_b)
+        for i, (a, b) in enumerate(zip(ratings_a, ratings_b)):
+            assert (batch_a[i], batch_b[i]) == calculate_win_probability(a, b)
+
+    def test_k_factor_batch(self):
+        """Vectorized K-factor follows the novice/intermediate/master tiers."""
+        from elo import get_k_factor, get_k_factor_batch
+
+        ratings = [1200, 1200, 2300, 2300, 2200]
+        counts = [0, 10, 3, 10, 5]
+        assert list(get_k_factor_batch(ratings, counts)) == [
+            get_k_factor(r, c) for r, c in zip(ratings, counts)
+        ]
+
+    @pytest.mark.parametrize("k_factor", [None, 20])
+    def test_match_outcome_batch_identical_to_scalar(self, k_factor):
+        """Vectorized outcomes are identical to calculate_match_outcome per match."""
+        from elo import calculate_match_outcome, calculate_match_outcome_batch
+
+        p1_r, p2_r, winners, p1_ids, p2_ids, p1_c, p2_c = self._random_matches(5000)
+        batch = calculate_match_outcome_batch(
+            p1_r, p2_r, winners, p1_ids, p2_ids, k_factor=k_factor,
+            player1_match_counts=p1_c, player2_match_counts=p2_c
+        )
+        for i in range(len(p1_r)):
+            scalar = calculate_match_outcome(
+                p1_r[i], p2_r[i], winners[i], p1_ids[i], p2_ids[i], k_factor=k_factor,
+                player1_match_count=p1_c[i], player2_match_count=p2_c[i]
+            )
+            assert {key: batch[key][i] for key in scalar} == scalar
+
+    def test_match_outcome_batch_rounds_halves_like_scalar(self):
+        """Changes on a half (0.15, 0.35, ...) round like round(), not like np.round."""
+        import numpy as np
+
+        from elo import calculate_match_outcome, calculate_match_outcome_batch
+
+        # Equal ratings of 0 (expected score 0.5) keep the change exactly k / 2
+        k_factors = [round(0.1 + 0.2 * i, 1) for i in range(25)]
+        changes = []
+        for k_factor in k_factors:
+            batch = calculate_match_outcome_batch([0.0], [0.0], [1], [1], [2], k_factor=k_factor)
+            scalar = calculate_match_outcome(0.0, 0.0, 1, 1, 2, k_factor=k_factor)
+            assert {key: batch[key][0] for key in scalar} == scalar
+            changes.append(float(batch['player1_new_rating'][0]))
+        # The values do hit the halves np.round gets wrong
+        assert any(np.round(change, 1) != round(change, 1) for change in changes)
@@ -0,0 +1,138 @@
+"""Unit tests for the chronological Elo replay engine"""
+import pytest
+from fastapi import status
+
+from elo import INITIAL_RATING, calculate_match_outcome
+from utils.elo_replay import replay_ratings
+
+
+def _report(client, event_id, player1_id, player2_id, winner_id):
+    response = client.post("/matches", json={
+        "event_id": event_id, "player1_id": player1_id,
+        "player2_id": player2_id, "winner_id": winner_id,
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()["id"]
+
+
+def _ratings(client, player_ids):
+    return {pid: client.get(f"/players/{pid}").json() for pid in player_ids}
+
+
+@pytest.mark.unit
+class TestReplayRatings:
+    """Test the in-memory replay loop"""
+
+    def test_empty_history_keeps_initial_ratings(self):
+        ratings, scores = replay_ratings([1, 2], [], [], [])
+        assert ratings == [INITIAL_RATING, INITIAL_RATING]
+        assert scores == [0, 0]
+
+    def test_matches_sequential_scalar_calls(self):
+        """Replay gives exactly what applying calculate_match_outcome in order gives"""
+        history = [(1, 2, 1), (2, 3, 3), (1, 3, 1), (3, 2, 2), (1, 2, 2)]
+        ratings = {1: 1200.0, 2: 1200.0, 3: 1200.0}
+        scores = {1: 0, 2: 0, 3: 0}
+        for p1, p2, winner in history:
+            outcome = calculate_match_outcome(
+                ratings[p1], ratings[p2], winner, p1, p2,
+                player1_match_count=scores[p1], player2_match_count=scores[p2]
+            )
+            ratings[p1] = outcome['player1_new_rating']
+            ratings[p2] = outcome['player2_new_rating']
+            scores[winner] += 1
+
+        replayed, replayed_scores = replay_ratings([1, 2, 3], *zip(*history))
+        assert replayed == [ratings[1], ratings[2], ratings[3]]
+        assert replayed_scores == [scores[1], scores[2], scores[3]]
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestEventReplay:
+    """Test replaying an event through the API"""
+
+    def test_replay_of_unchanged_history_is_a_no_op(self, client, league):
+        """Incremental updates and a full replay agree"""
+        event_id, (ana, bia, caio) = league
+        _report(client, event_id, ana, bia, ana)
+        _report(client, event_id, bia, caio, caio)
+        _report(client, event_id, caio, ana, caio)
+        before = _ratings(client, [ana, bia, caio])
+
+        response = client.post(f"/events/{event_id}/replay-ratings")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"event_id": event_id, "matches_replayed": 3, "players_updated": 3}
+
+        after = _ratings(client, [ana, bia, caio])
+        for pid in (ana, bia, caio):
+            assert after[pid]["elo_rating"] == pytest.approx(before[pid]["elo_rating"])
+            assert after[pid]["score"] == before[pid]["score"]
+
+    def test_replay_unknown_event(self, client):
+        response = client.post("/events/999/replay-ratings")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_delete_match_rolls_back_its_rating_change(self, client, league):
+        """Deleting the only match restores initial ratings and scores"""
+        event_id, (ana, bia, _) = league
+        match_id = _report(client, event_id, ana, bia, ana)
+        assert client.get(f"/players/{ana}").json()["elo_rating"] > INITIAL_RATING
+
+        client.delete(f"/matches/{match_id}")
+
+        players = _ratings(client, [ana, bia])
+        assert players[ana]["elo_rating"] == INITIAL_RATING
+        assert players[bia]["elo_rating"] == INITIAL_RATING
+        assert players[ana]["score"] == 0
+
+    def test_delete_replays_remaining_history(self, client, league):
+        """Deleting a match in the middle gives the same ratings as never playing it"""
+        event_id, (ana, bia, caio) = league
+        _report(client, event_id, ana, bia, ana)
+        middle = _report(client, event_id, bia, caio, bia)
+        _report(client, event_id, caio, ana, caio)
+
+        client.delete(f"/matches/{middle}")
+
+        expected, expected_scores = replay_ratings(
+            [ana, bia, caio], [ana, caio], [bia, ana], [ana, caio]
+        )
+        players = _ratings(client, [ana, bia, caio])
+        for pid, rating, score in zip((ana, bia, caio), expected, expected_scores):
+            assert players[pid]["elo_rating"] == pytest.approx(rating)
+            assert players[pid]["score"] == score
+
+    def test_winner_correction_replays_event(self, client, league):
+        """Correcting a winner gives the same ratings as reporting it right the first time"""
+        event_id, (ana, bia, _) = league
+        match_id = _report(client, event_id, ana, bia, ana)
+
+        response = client.put(f"/matches/{match_id}", json={"winner_id": bia})
+        assert response.status_code == status.HTTP_200_OK
+
+        expected, _ = replay_ratings([ana, bia], [ana], [bia], [bia])
+        players = _ratings(client, [ana, bia])
+        assert players[ana]["elo_rating"] == pytest.approx(expected[0])
+        assert players[bia]["elo_rating"] == pytest.approx(expected[1])
+        assert players[ana]["score"] == 0
+        assert players[bia]["score"] == 1
+
+    def test_reopen_then_finish_again_restores_the_result(self, client, league):
+        """A reopened match finished again with the same winner counts in Elo and score again"""
+        event_id, (ana, bia, _) = league
+        match_id = _report(client, event_id, ana, bia, ana)
+        reported = _ratings(client, [ana, bia])
+
+        client.put(f"/matches/{match_id}", json={"finished": False})
+        reopened = _ratings(client, [ana, bia])
+        assert reopened[ana]["elo_rating"] == INITIAL_RATING
+        assert reopened[ana]["score"] == 0
+
+        response = client.put(f"/matches/{match_id}", json={"winner_id": ana})
+        assert response.status_code == status.HTTP_200_OK
+        players = _ratings(client, [ana, bia])
+        for pid in (ana, bia):
+            assert players[pid]["elo_rating"] == pytest.approx(reported[pid]["elo_rating"])
+            assert players[pid]["score"] == reported[pid]["score"]
+        assert client.get(f"/players/{ana}/stats").json()["wins"] == 1
@@ -0,0 +1,133 @@
+"""Unit tests for the event activity stream (GET /events/{id}/stream)"""
+import asyncio
+
+import pytest
+from fastapi import status
+
+from utils.broadcaster import broadcaster
+from utils.event_stream import event_channel, iter_event_stream, publish_event_change
+
+
+def _published(event_id, action):
+    """Run action in a thread (as a request would be) and return the messages it published for the event"""
+    async def collect():
+        with broadcaster.subscribe(event_channel(event_id)) as subscription:
+            await asyncio.to_thread(action)
+            messages = []
+            while True:
+                try:
+                    messages.append(await asyncio.wait_for(subscription.get(), 0.1))
+                except asyncio.TimeoutError:
+                    return messages
+    return asyncio.run(collect())
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestPublishedChanges:
+    """Committed changes reach the event's subscribers"""
+
+    def test_match_lifecycle(self, client, league):
+        event_id, (ana, bia, _) = league
+        created = {}
+
+        def register():
+            created.update(client.post("/matches", json={
+                "event_id": event_id, "player1_id": ana, "player2_id": bia, "winner_id": ana,
+            }).json())
+
+        messages = _published(event_id, register)
+        assert [m["type"] for m in messages] == ["match-created", "ranking-changed"]
+        assert messages[0]["data"]["matches"] == [created]
+
+        messages = _published(event_id, lambda: client.put(f"/matches/{created['id']}", json={"games_score": "11-3"}))
+        assert [m["type"] for m in messages] == ["match-updated"]
+        assert messages[0]["data"]["matches"][0]["games_score"] == "11-3"
+
+        messages = _published(event_id, lambda: client.delete(f"/matches/{created['id']}"))
+        assert messages == [
+            {"type": "match-deleted", "data": {"match_ids": [created["id"]]}},
+            {"type": "ranking-changed", "data": {}},
+        ]
+
+    def test_bulk_import_is_one_message(self, client, league):
+        event_id, (ana, bia, caio) = league
+        rows = [
+            {"event_id": event_id, "player1_id": ana, "player2_id": bia, "winner_id": bia},
+            {"event_id": event_id, "player1_id": bia, "player2_id": caio},
+        ]
+        messages = _published(event_id, lambda: client.post("/matches/bulk", json=rows))
+        assert [m["type"] for m in messages] == ["match-created", "ranking-changed"]
+        assert [m["player2_id"] for m in messages[0]["data"]["matches"]] == [bia, caio]
+
+    def test_membership_and_player_changes(self, client, league):
+        event_id, _ = league
+        player_id = {}
+
+        def register_player():
+            player_id["id"] = client.post("/players", json={"name": "Duda", "event_id": event_id}).json()["id"]
+
+        assert [m["type"] for m in _published(event_id, register_player)] == ["ranking-changed"]
+
+        messages = _published(event_id, lambda: client.post(
+            "/members", json={"event_id": event_id, "player_id": player_id["id"]}
+        ))
+        assert [m["type"] for m in messages] == ["membership-changed"]
+        assert messages[0]["data"]["player_id"] == player_id["id"]
+        assert messages[0]["data"]["status"] == "convidado"
+
+    def test_other_events_are_not_notified(self, client, league):
+        event_id, (ana, bia, _) = league
+        other_id = client.post("/events", json={"name": "Other", "date": "2024-12-16", "time": "19:00"}).json()["id"]
+        assert _published(other_id, lambda: client.post("/matches", json={
+            "event_id": event_id, "player1_id": ana, "player2_id": bia,
+        })) == []
+
+
+@pytest.mark.unit
+class TestEventStream:
+    """Server-Sent Events encoding of the stream"""
+
+    def test_unknown_event(self, client):
+        assert client.get("/events/999/stream").status_code == status.HTTP_404_NOT_FOUND
+
+    def test_stream_sends_changes_as_sse(self, client, db_session, league):
+        from routers import events
+
+        event_id, (ana, bia, _) = league
+        response = events.stream_event(event_id, db=db_session)
+        assert response.media_type == "text/event-stream"
+
+        async def read():
+            stream = response.body_iterator
+            try:
+                assert await stream.__anext__() == "retry: 3000\n\n"
+                await asyncio.to_thread(client.post, "/matches", json={
+                    "event_id": event_id, "player1_id": ana, "player2_id": bia,
+                })
+                return await asyncio.wait_for(stream.__anext__(), 1)
+            finally:
+                await stream.aclose()
+
+        message = asyncio.run(read())
+        assert message.startswith('event: match-created\ndata: {"matches":[{')
+        assert message.endswith("}\n\n")
+        assert broadcaster.subscriber_count(event_channel(event_id)) == 0
+
+    def test_keepalive_and_resync(self):
+        async def read():
+            stream = iter_event_stream(1, keepalive=0.01)
+            try:
+                await stream.__anext__()
+                keepalive = await stream.__anext__()
+                for _ in range(broadcaster.max_pending + 5):
+                    publish_event_change(1, "ranking-changed")
+                await asyncio.sleep(0.01)
+                return keepalive, await stream.__anext__(), await stream.__anext__()
+            finally:
+                await stream.aclose()
+
+        keepalive, first, second = asyncio.run(read())
+        assert keepalive == ": keep-alive\n\n"
+        assert first == "event: resync\ndata: {}\n\n"
+        assert second == "event: ranking-changed\ndata: {}\n\n"
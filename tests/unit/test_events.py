@@ -132,3 +132,53 @@ class TestEvents:
         """Test deleting non-existent event"""
         response = client.delete("/events/999")
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestWinMatrix:
+    """Test the event win-probability matrix"""
+
+    def _seed(self, db_session, ratings):
+        from models import Event, Player
+
+        event = Event(name="Seeding", date="2024-12-15", time="19:00")
+        db_session.add(event)
+        db_session.flush()
+        players = [Player(name=f"P{i}", event_id=event.id, elo_rating=r) for i, r in enumerate(ratings)]
+        inactive = Player(name="Gone", event_id=event.id, elo_rating=2000, active=False)
+        db_session.add_all(players + [inactive])
+        db_session.commit()
+        return event.id, [p.id for p in players]
+
+    def test_json_matches_scalar_probabilities(self, client, db_session):
+        from elo import calculate_win_probability
+
+        event_id, ids = self._seed(db_session, [1500, 1700, 1600])
+        response = client.get(f"/events/{event_id}/win-matrix")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert data["player_ids"] == [ids[1], ids[2], ids[0]]
+        assert data["ratings"] == [1700, 1600, 1500]
+        for i, rating_a in enumerate(data["ratings"]):
+            for j, rating_b in enumerate(data["ratings"]):
+                assert data["probabilities"][i][j] == calculate_win_probability(rating_a, rating_b)[0]
+
+    def test_binary_encoding(self, client, db_session):
+        import numpy as np
+
+        event_id, _ = self._seed(db_session, [1500, 1700, 1600])
+        data = client.get(f"/events/{event_id}/win-matrix").json()
+        response = client.get(f"/events/{event_id}/win-matrix?format=binary")
+        assert response.headers["content-type"] == "application/octet-stream"
+
+        body = response.content
+        n = int(np.frombuffer(body[:4], dtype="<u4")[0])
+        assert n == 3 and len(body) == 4 + 4 * n + 4 * n * n
+        assert np.frombuffer(body[4:4 + 4 * n], dtype="<i4").tolist() == data["player_ids"]
+        matrix = np.frombuffer(body[4 + 4 * n:], dtype="<f4").reshape(n, n)
+        assert np.allclose(matrix, data["probabilities"], atol=1e-6)
+
+    def test_unknown_event(self, client):
+        assert client.get("/events/99999/win-matrix").status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,127 @@
+"""Unit tests for Idempotency-Key support on write endpoints"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import status
+from sqlalchemy import event, func, select
+
+import config
+from models import IdempotencyKey, Match, RatingHistory
+from utils.idempotency import REPLAY_HEADER, evict_expired_keys
+
+
+def _key(value):
+    return {"Idempotency-Key": value}
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestIdempotentWrites:
+    """Retried requests get the first response back"""
+
+    def test_retried_match_is_registered_once(self, client, db_session, league):
+        event_id, (ana, bia, _) = league
+        payload = {"event_id": event_id, "player1_id": ana, "player2_id": bia, "winner_id": ana}
+
+        first = client.post("/matches", json=payload, headers=_key("match-1"))
+        retry = client.post("/matches", json=payload, headers=_key("match-1"))
+
+        assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+        assert retry.json() == first.json()
+        assert REPLAY_HEADER not in first.headers
+        assert retry.headers[REPLAY_HEADER] == "true"
+        assert db_session.scalar(select(func.count()).select_from(Match)) == 1
+        # Elo applied once: one history entry per player
+        assert db_session.scalar(select(func.count()).select_from(RatingHistory)) == 2
+
+    def test_replay_only_reads_the_key_table(self, client, db_session, league):
+        event_id, _ = league
+        payload = {"name": "Duda", "event_id": event_id}
+        client.post("/players", json=payload, headers=_key("player-1"))
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+        event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+        try:
+            retry = client.post("/players", json=payload, headers=_key("player-1"))
+        finally:
+            event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert statements
+        assert all("idempotency_keys" in statement for statement in statements)
+
+    def test_without_key_requests_are_not_deduplicated(self, client, league):
+        event_id, _ = league
+        first = client.post("/players", json={"name": "Duda", "event_id": event_id})
+        second = client.post("/players", json={"name": "Duda", "event_id": event_id})
+        assert first.json()["id"] != second.json()["id"]
+
+    def test_client_errors_are_replayed(self, client, league):
+        first = client.put("/players/999", json={"name": "Nobody"}, headers=_key("missing"))
+        retry = client.put("/players/999", json={"name": "Nobody"}, headers=_key("missing"))
+        assert first.status_code == retry.status_code == status.HTTP_404_NOT_FOUND
+        assert retry.headers[REPLAY_HEADER] == "true"
+
+    def test_key_reused_for_another_request(self, client, league):
+        event_id, _ = league
+        client.post("/players", json={"name": "Duda", "event_id": event_id}, headers=_key("reused"))
+        response = client.post("/players", json={"name": "Edu", "event_id": event_id}, headers=_key("reused"))
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_key_in_progress(self, client, db_session, league):
+        from utils.idempotency import request_hash
+
+        event_id, _ = league
+        body = b'{"name":"Duda","event_id":%d}' % event_id
+        db_session.add(IdempotencyKey(
+            key="running", request_hash=request_hash("POST", "/players", "", body),
+            created_at=datetime.now(timezone.utc),
+        ))
+        db_session.commit()
+
+        response = client.post("/players", content=body, headers={**_key("running"), "Content-Type": "application/json"})
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    def test_membership_transition_is_replayed(self, client, league):
+        event_id, _ = league
+        player_id = client.post("/players", json={"name": "Duda", "event_id": event_id}).json()["id"]
+        membership_id = client.post("/members", json={"event_id": event_id, "player_id": player_id}).json()["id"]
+
+        first = client.put(f"/members/{membership_id}/accept", headers=_key("accept"))
+        retry = client.put(f"/members/{membership_id}/accept", headers=_key("accept"))
+        # Without the key the retry would fail: the invite is no longer pending
+        assert first.status_code == retry.status_code == status.HTTP_200_OK
+        assert retry.json()["status"] == "ativo"
+
+
+@pytest.mark.unit
+class TestKeyExpiry:
+    """Keys are kept for IDEMPOTENCY_KEY_TTL seconds"""
+
+    def test_expired_key_runs_again(self, client, db_session, league):
+        event_id, _ = league
+        payload = {"name": "Duda", "event_id": event_id}
+        first = client.post("/players", json=payload, headers=_key("old"))
+        db_session.query(IdempotencyKey).update(
+            {"created_at": datetime.now(timezone.utc) - timedelta(seconds=config.IDEMPOTENCY_KEY_TTL + 1)}
+        )
+        db_session.commit()
+
+        retry = client.post("/players", json=payload, headers=_key("old"))
+        assert REPLAY_HEADER not in retry.headers
+        assert retry.json()["id"] != first.json()["id"]
+
+    def test_eviction_deletes_expired_keys(self, db_session):
+        now = datetime.now(timezone.utc)
+        db_session.add_all([
+            IdempotencyKey(key="fresh", request_hash="x", status_code=200, response="{}", created_at=now),
+            IdempotencyKey(
+                key="stale", request_hash="x", status_code=200, response="{}",
+                created_at=now - timedelta(seconds=config.IDEMPOTENCY_KEY_TTL + 1),
+            ),
+        ])
+        db_session.commit()
+
+        assert evict_expired_keys(db_session.get_bind(), force=True) == 1
+        assert db_session.scalars(select(IdempotencyKey.key)).all() == ["fresh"]
@@ -0,0 +1,233 @@
+"""Unit tests for live point-by-point scoring"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from starlette.websockets import WebSocketDisconnect
+
+import config
+from utils.live_scoring import LiveMatch, LiveScoreboard, game_winner, parse_games_score
+
+
+@pytest.fixture
+def scoreboard(client, db_session):
+    """Live scoreboard on the test database, used by the /matches/{id}/live channel"""
+    from main import app
+    from routers import matches
+
+    live_scores = LiveScoreboard(sessionmaker(autoflush=False, bind=db_session.get_bind()))
+    app.dependency_overrides[matches.get_live_scoreboard] = lambda: live_scores
+    return live_scores
+
+
+@pytest.fixture
+def open_match(client, league):
+    """Best-of-3 match between Ana and Bia, without result"""
+    event_id, (ana, bia, _) = league
+    match_id = client.post("/matches", json={
+        "event_id": event_id, "player1_id": ana, "player2_id": bia, "best_of": 3,
+    }).json()["id"]
+    return match_id, ana, bia
+
+
+def _score(websocket, player_id, points):
+    """Send points for a player and return the last broadcast score"""
+    for _ in range(points):
+        websocket.send_json({"action": "point", "player_id": player_id})
+        state = websocket.receive_json()
+    return state
+
+
+def _sync(websocket):
+    """Wait until the previous action (and its write) is done: actions are handled in order"""
+    websocket.send_json({"action": "undo"})
+    assert websocket.receive_json()["type"] == "error"
+
+
+@pytest.mark.unit
+class TestLiveMatch:
+    """In-memory score rules"""
+
+    def test_game_needs_two_points_lead(self):
+        assert game_winner((11, 9)) == 1
+        assert game_winner((10, 11)) is None
+        assert game_winner((12, 14)) == 2
+
+    def test_parse_games_score(self):
+        assert parse_games_score("11-9,10-12, 11-8") == [(11, 9), (10, 12), (11, 8)]
+        assert parse_games_score("11-9 11-8") == [(11, 9), (11, 8)]
+        assert parse_games_score(None) == []
+
+    def test_match_is_decided_by_majority_of_games(self):
+        live = LiveMatch(1, player1_id=10, player2_id=20, best_of=3, games=[(11, 7)])
+        for _ in range(10):
+            live.score_point(10)
+        for _ in range(12):
+            assert live.score_point(20) == (live.points == (0, 0))
+        assert live.games == [(11, 7), (10, 12)]
+        assert live.winner_id is None
+
+        for _ in range(11):
+            live.score_point(20)
+        assert live.winner_id == 20
+        assert live.games_score == "11-7,10-12,0-11"
+        with pytest.raises(ValueError):
+            live.score_point(10)
+
+    def test_undo_is_limited_to_the_current_game(self):
+        live = LiveMatch(1, player1_id=10, player2_id=20, best_of=5)
+        live.score_point(10)
+        live.score_point(20)
+        live.undo()
+        assert live.points == (1, 0)
+        live.undo()
+        with pytest.raises(ValueError):
+            live.undo()
+        with pytest.raises(ValueError):
+            live.score_point(30)
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestLiveScoringChannel:
+    """Test the /matches/{match_id}/live WebSocket"""
+
+    def test_points_are_broadcast_and_games_written(self, client, db_session, scoreboard, open_match):
+        match_id, ana, bia = open_match
+        commits = []
+        event.listen(db_session.get_bind(), "commit", lambda conn: commits.append(1))
+
+        with client.websocket_connect(f"/matches/{match_id}/live?role=umpire") as umpire, \
+                client.websocket_connect(f"/matches/{match_id}/live") as spectator:
+            assert umpire.receive_json()["points"] == [0, 0]
+            assert spectator.receive_json()["games"] == []
+
+            state = _score(umpire, bia, 3)
+            assert state["type"] == "score"
+            assert state["points"] == [0, 3]
+            umpire.send_json({"action": "undo"})
+            assert umpire.receive_json()["points"] == [0, 2]
+            for _ in range(4):
+                assert spectator.receive_json()["match_id"] == match_id
+            assert commits == []
+
+            state = _score(umpire, ana, 11)
+            assert state["games"] == [[11, 2]]
+            assert state["points"] == [0, 0]
+            _sync(umpire)
+            # The whole game is one write
+            assert len(commits) == 1
+            match = client.get(f"/matches/{match_id}").json()
+            assert (match["player1_games"], match["games_score"], match["finished"]) == (1, "11-2", False)
+            assert scoreboard.connections(match_id) == 2
+
+        # Nobody connected and everything written: the match leaves memory
+        assert scoreboard.get(match_id) is None
+
+    def test_decided_match_applies_result(self, client, scoreboard, open_match):
+        match_id, ana, bia = open_match
+        rating_before = client.get(f"/players/{ana}").json()["elo_rating"]
+
+        with client.websocket_connect(f"/matches/{match_id}/live?role=umpire") as umpire:
+            umpire.receive_json()
+            _score(umpire, ana, 11)
+            state = _score(umpire, ana, 11)
+            assert state["winner_id"] == ana
+            assert state["finished"] is True
+            _sync(umpire)
+
+            umpire.send_json({"action": "point", "player_id": bia})
+            assert umpire.receive_json() == {"type": "error", "detail": "Match is already finished"}
+
+        match = client.get(f"/matches/{match_id}").json()
+        assert match["winner_id"] == ana
+        assert match["games_score"] == "11-0,11-0"
+        assert (match["player1_games"], match["player2_games"]) == (2, 0)
+        assert client.get(f"/players/{ana}").json()["elo_rating"] > rating_before
+        assert scoreboard.get(match_id) is None
+
+    def test_scoring_resumes_from_stored_games(self, client, scoreboard, open_match):
+        match_id, _, bia = open_match
+        client.put(f"/matches/{match_id}", json={"games_score": "11-9", "player1_games": 1})
+
+        with client.websocket_connect(f"/matches/{match_id}/live?role=umpire") as umpire:
+            assert umpire.receive_json()["games"] == [[11, 9]]
+            state = _score(umpire, bia, 11)
+            assert (state["player1_games"], state["player2_games"]) == (1, 1)
+
+    def test_invalid_actions(self, client, scoreboard, open_match):
+        match_id, _, _ = open_match
+        with client.websocket_connect(f"/matches/{match_id}/live?role=umpire") as umpire:
+            umpire.receive_json()
+            umpire.send_json({"action": "point"})
+            assert umpire.receive_json()["detail"] == "player_id is required to score a point"
+            umpire.send_json({"action": "serve"})
+            assert umpire.receive_json()["type"] == "error"
+            umpire.send_text("not json")
+            assert umpire.receive_json()["type"] == "error"
+            umpire.send_json({"action": "point", "player_id": 999})
+            assert umpire.receive_json()["detail"] == "Player is not playing this match"
+
+    def test_unknown_match(self, client, scoreboard):
+        with client.websocket_connect("/matches/999/live") as websocket:
+            assert websocket.receive_json() == {"type": "error", "detail": "Match not found"}
+            with pytest.raises(WebSocketDisconnect) as closed:
+                websocket.receive_json()
+        assert closed.value.code == 4404
+
+    def test_spectators_cannot_score(self, client, scoreboard, open_match):
+        match_id, ana, _ = open_match
+        with client.websocket_connect(f"/matches/{match_id}/live") as spectator:
+            spectator.receive_json()
+            spectator.send_json({"action": "point", "player_id": ana})
+            assert spectator.receive_json() == {"type": "error", "detail": "Spectators can't send scoring actions"}
+            assert scoreboard.get(match_id).points == (0, 0)
+
+    def test_umpire_token(self, client, scoreboard, open_match, monkeypatch):
+        match_id, ana, _ = open_match
+        monkeypatch.setattr(config, "LIVE_UMPIRE_TOKEN", "secret")
+
+        with client.websocket_connect(f"/matches/{match_id}/live?role=umpire&token=wrong") as websocket:
+            assert websocket.receive_json() == {"type": "error", "detail": "Invalid umpire token"}
+            with pytest.raises(WebSocketDisconnect) as closed:
+                websocket.receive_json()
+        assert closed.value.code == 4403
+
+        with client.websocket_connect(f"/matches/{match_id}/live?role=umpire&token=secret") as umpire:
+            umpire.receive_json()
+            assert _score(umpire, ana, 1)["points"] == [1, 0]
+
+    def test_abandoned_match_leaves_memory(self, client, scoreboard, open_match):
+        match_id, ana, _ = open_match
+        with client.websocket_connect(f"/matches/{match_id}/live?role=umpire") as umpire:
+            umpire.receive_json()
+            _score(umpire, ana, 3)
+        # Points of the unfinished game are not kept once everybody left
+        assert scoreboard.get(match_id) is None
+        with client.websocket_connect(f"/matches/{match_id}/live") as spectator:
+            assert spectator.receive_json()["points"] == [0, 0]
+
+
+@pytest.mark.unit
+class TestLiveScoreboard:
+    """Connection references of the in-memory scoreboard"""
+
+    def test_last_release_forgets_the_match(self):
+        scoreboard = LiveScoreboard(session_factory=None)
+        loader = lambda: LiveMatch(1, player1_id=10, player2_id=20, best_of=3)  # noqa: E731
+        live = scoreboard.load(1, loader)
+        assert scoreboard.load(1, loader) is live
+
+        scoreboard.release(1)
+        assert scoreboard.get(1) is live
+        scoreboard.release(1)
+        assert scoreboard.get(1) is None
+
+    def test_unwritten_games_are_kept(self):
+        scoreboard = LiveScoreboard(session_factory=None)
+        live = scoreboard.load(1, lambda: LiveMatch(1, player1_id=10, player2_id=20, best_of=3))
+        for _ in range(11):
+            live.score_point(10)
+        assert live.dirty
+
+        scoreboard.release(1)
+        assert scoreboard.get(1) is live
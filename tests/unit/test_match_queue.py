@@ -0,0 +1,108 @@
+"""Unit tests for the write-behind match result queue"""
+import pytest
+from fastapi import status
+from sqlalchemy.orm import sessionmaker
+
+from utils.match_queue import MatchResultQueue
+
+
+def _make_queue(db_session, **overrides):
+    options = {"batch_size": 100, "batch_wait": 0.2, "max_depth": 100, "ticket_retention": 100}
+    options.update(overrides)
+    return MatchResultQueue(sessionmaker(autoflush=False, bind=db_session.get_bind()), **options)
+
+
+@pytest.fixture
+def match_queue(client, db_session):
+    """Queue writing to the test database, used by the /matches/queue endpoints"""
+    from main import app
+    from routers import matches
+
+    results = _make_queue(db_session)
+    app.dependency_overrides[matches.get_match_queue] = lambda: results
+    yield results
+    results.stop()
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestMatchQueue:
+    """Test POST /matches/queue and the single writer"""
+
+    def test_results_are_acknowledged_then_applied_in_order(self, client, league, match_queue):
+        from utils.elo_replay import replay_ratings
+
+        event_id, (ana, bia, caio) = league
+        results = [(ana, bia, ana), (bia, caio, caio), (ana, caio, ana)]
+        tickets = []
+        for p1, p2, winner in results:
+            response = client.post("/matches/queue", json={
+                "event_id": event_id, "player1_id": p1, "player2_id": p2, "winner_id": winner,
+            })
+            assert response.status_code == status.HTTP_202_ACCEPTED
+            assert response.json()["status"] == "queued"
+            tickets.append(response.json()["ticket_id"])
+
+        match_queue.join()
+        outcomes = [client.get(f"/matches/queue/{ticket}").json() for ticket in tickets]
+        assert [outcome["status"] for outcome in outcomes] == ["applied"] * 3
+        match_ids = [outcome["match_id"] for outcome in outcomes]
+        assert match_ids == sorted(match_ids)
+        assert client.get(f"/matches/{match_ids[0]}").json()["winner_id"] == ana
+
+        ratings, _ = replay_ratings([ana, bia, caio], *zip(*results))
+        for player_id, rating in zip([ana, bia, caio], ratings):
+            assert client.get(f"/players/{player_id}").json()["elo_rating"] == rating
+
+        metrics = client.get("/matches/queue/metrics").json()
+        assert metrics["queue_depth"] == 0
+        assert metrics["applied_total"] == 3
+        # Submitted within the batch wait: applied together
+        assert metrics["batches_total"] == 1
+        assert metrics["last_batch_size"] == 3
+        assert metrics["last_lag_seconds"] > 0
+
+    def test_invalid_result_is_rejected(self, client, league, match_queue):
+        event_id, (ana, _, _) = league
+        ticket = client.post("/matches/queue", json={
+            "event_id": event_id, "player1_id": ana, "player2_id": 999, "winner_id": ana,
+        }).json()["ticket_id"]
+        match_queue.join()
+
+        outcome = client.get(f"/matches/queue/{ticket}").json()
+        assert outcome["status"] == "rejected"
+        assert outcome["detail"] == "Player 2 not found in event"
+        assert outcome["match_id"] is None
+        assert client.get("/matches/queue/metrics").json()["rejected_total"] == 1
+
+    def test_unknown_ticket(self, client, match_queue):
+        assert client.get("/matches/queue/unknown").status_code == status.HTTP_404_NOT_FOUND
+
+    def test_full_queue_is_refused(self, client, db_session, league):
+        from main import app
+        from routers import matches
+
+        event_id, (ana, bia, _) = league
+        app.dependency_overrides[matches.get_match_queue] = lambda: _make_queue(db_session, max_depth=0)
+        response = client.post("/matches/queue", json={
+            "event_id": event_id, "player1_id": ana, "player2_id": bia,
+        })
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+@pytest.mark.unit
+def test_stop_drains_the_queue(db_session, league):
+    """Results queued before stop() are applied before the writer exits"""
+    from schemas import MatchCreate
+
+    event_id, (ana, bia, _) = league
+    results = _make_queue(db_session, batch_size=2, batch_wait=0)
+    tickets = [
+        results.submit(MatchCreate(event_id=event_id, player1_id=ana, player2_id=bia, winner_id=bia))
+        for _ in range(5)
+    ]
+    results.stop()
+
+    assert all(ticket.status == "applied" for ticket in tickets)
+    assert results.metrics()["writer_running"] is False
+    assert results.metrics()["applied_total"] == 5
@@ -1,4 +1,8 @@
 """Unit tests for Match endpoints"""
+import csv
+import io
+import json
+
 import pytest
 from fastapi import status
 
@@ -322,3 +326,218 @@ class TestMatches:
         """Test deleting non-existent match"""
         response = client.delete("/matches/999")
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestBulkMatches:
+    """Test POST /matches/bulk"""
+
+    def test_json_import_applies_results_in_order(self, client, db_session, league):
+        """A JSON batch gives the same ratings, ranks and stats as a chronological replay"""
+        from utils.elo_replay import replay_ratings
+        from utils.player_ranking import rerank_players
+        from utils.player_stats import find_player_stats_drift
+
+        event_id, (ana, bia, caio) = league
+        results = [(ana, bia, ana), (bia, caio, caio), (ana, caio, caio), (ana, bia, bia)]
+        response = client.post("/matches/bulk", json=[
+            {"event_id": event_id, "player1_id": p1, "player2_id": p2, "winner_id": winner,
+             "player1_games": 3, "player2_games": 1}
+            for p1, p2, winner in results
+        ] + [{"event_id": event_id, "player1_id": ana, "player2_id": caio}])
+
+        assert response.status_code == status.HTTP_200_OK
+        report = response.json()
+        assert report["received"] == 5
+        assert report["imported"] == 5
+        assert report["errors"] == []
+        assert report["match_ids"] == sorted(report["match_ids"])
+
+        ratings, scores = replay_ratings([ana, bia, caio], *zip(*results))
+        for player_id, rating, score in zip([ana, bia, caio], ratings, scores):
+            player = client.get(f"/players/{player_id}").json()
+            assert player["elo_rating"] == rating
+            assert player["score"] == score
+
+        pending = client.get(f"/matches/{report['match_ids'][-1]}").json()
+        assert pending["finished"] is False
+        assert find_player_stats_drift(db_session, event_id) == []
+        assert rerank_players(db_session, event_id) == 0
+        history = client.get(f"/players/{ana}/rating-history").json()
+        assert len(history["points"]) == 3
+
+    def test_csv_import_reports_invalid_rows(self, client, league):
+        """Invalid rows are skipped and reported; the valid ones are imported"""
+        event_id, (ana, bia, caio) = league
+        body = "\n".join([
+            "event_id,player1_id,player2_id,winner_id,best_of",
+            f"{event_id},{ana},{bia},{ana},5",
+            f"{event_id},{ana},999,,5",
+            f"{event_id},{ana},{ana},,5",
+            f"{event_id},{ana},{bia},{caio},5",
+            f"{event_id},{bia},{caio},,4",
+            f"999,{ana},{bia},,",
+            f"{event_id},{bia},{caio},{caio},",
+        ])
+        response = client.post("/matches/bulk", content=body, headers={"Content-Type": "text/csv"})
+
+        assert response.status_code == status.HTTP_200_OK
+        report = response.json()
+        assert report["received"] == 7
+        assert report["imported"] == 2
+        assert [error["row"] for error in report["errors"]] == [2, 3, 4, 5, 6]
+        assert report["errors"][0]["detail"] == "Player 2 not found in event"
+        assert report["errors"][1]["detail"] == "Player cannot play against themselves"
+        assert report["errors"][2]["detail"] == "Winner must be one of the match players"
+        assert "best_of" in report["errors"][3]["detail"]
+        assert report["errors"][4]["detail"] == "Event not found"
+        assert len(client.get(f"/matches?event_id={event_id}").json()) == 2
+
+    def test_import_requires_active_membership(self, client, db_session, league):
+        """Players without an ATIVO membership are rejected, as in POST /matches"""
+        from models import Membership, MembershipStatus
+
+        event_id, (ana, bia, _) = league
+        membership = db_session.query(Membership).filter_by(player_id=bia, event_id=event_id).one()
+        membership.status = MembershipStatus.SUSPENSO
+        db_session.commit()
+
+        response = client.post("/matches/bulk", json=[
+            {"event_id": event_id, "player1_id": ana, "player2_id": bia, "winner_id": ana},
+        ])
+        report = response.json()
+        assert report["imported"] == 0
+        assert "suspenso" in report["errors"][0]["detail"]
+
+    def test_malformed_body(self, client):
+        """Bodies that are not a JSON array or CSV are rejected"""
+        response = client.post("/matches/bulk", content="{not json", headers={"Content-Type": "application/json"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = client.post("/matches/bulk", json={"event_id": 1})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestMatchExport:
+    """Test GET /matches/export"""
+
+    def _import(self, client, event_id, player_ids):
+        ana, bia, caio = player_ids
+        return client.post("/matches/bulk", json=[
+            {"event_id": event_id, "player1_id": ana, "player2_id": bia, "winner_id": bia, "games_score": "11-9,8-11"},
+            {"event_id": event_id, "player1_id": bia, "player2_id": caio},
+        ]).json()["match_ids"]
+
+    def test_ndjson_export(self, client, league, monkeypatch):
+        """One JSON object per match, in ID order, across several fetch batches"""
+        from utils import match_export
+
+        monkeypatch.setattr(match_export, "EXPORT_BATCH_SIZE", 1)
+        event_id, player_ids = league
+        match_ids = self._import(client, event_id, player_ids)
+
+        response = client.get(f"/matches/export?event_id={event_id}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["id"] for row in rows] == match_ids
+        assert rows[0]["winner_id"] == player_ids[1]
+        assert rows[0]["finished"] is True
+        assert rows[0]["finished_at"] is not None
+        assert rows[0]["games_score"] == "11-9,8-11"
+        assert rows[1]["finished_at"] is None
+
+    def test_csv_export(self, client, league):
+        """CSV export has a header row and one line per match"""
+        event_id, player_ids = league
+        match_ids = self._import(client, event_id, player_ids)
+
+        response = client.get("/matches/export?format=csv")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="matches.csv"' in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [int(row["id"]) for row in rows] == match_ids
+        assert rows[0]["games_score"] == "11-9,8-11"
+        assert rows[1]["winner_id"] == ""
+
+    def test_export_empty_and_unknown_event(self, client, league):
+        """An event without matches exports only the header; unknown events are 404"""
+        event_id, _ = league
+        response = client.get(f"/matches/export?format=csv&event_id={event_id}")
+        assert response.text.strip() == "id,event_id,tournament_id,player1_id,player2_id,winner_id,best_of," \
+            "finished,finished_at,player1_games,player2_games,games_score"
+        assert client.get(f"/matches/export?event_id={event_id}").text == ""
+        assert client.get("/matches/export?event_id=999").status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestMatchPagination:
+    """Test keyset pagination and filters of the match listings"""
+
+    def _import(self, client, event_id, player_ids):
+        ana, bia, caio = player_ids
+        pairs = [(ana, bia), (bia, caio), (ana, caio), (ana, bia), (bia, caio)]
+        return client.post("/matches/bulk", json=[
+            {"event_id": event_id, "player1_id": p1, "player2_id": p2, "winner_id": p1 if i % 2 == 0 else None}
+            for i, (p1, p2) in enumerate(pairs)
+        ]).json()["match_ids"]
+
+    def _walk(self, client, url, limit):
+        """Follow X-Next-Cursor from the first to the last page"""
+        ids, after_id, pages = [], None, 0
+        while True:
+            params = f"&limit={limit}" + (f"&after_id={after_id}" if after_id is not None else "")
+            response = client.get(url + params)
+            assert response.status_code == status.HTTP_200_OK
+            ids += [match["id"] for match in response.json()]
+            pages += 1
+            after_id = response.headers.get("X-Next-Cursor")
+            if after_id is None:
+                return ids, pages
+
+    def test_pages_cover_all_matches_in_order(self, client, league):
+        """Pages are disjoint, ordered by ID in both directions, and the last one has no cursor"""
+        event_id, player_ids = league
+        match_ids = self._import(client, event_id, player_ids)
+
+        ids, pages = self._walk(client, f"/matches?event_id={event_id}", 2)
+        assert ids == match_ids
+        assert pages == 3
+        ids, _ = self._walk(client, f"/matches?event_id={event_id}&order=desc", 2)
+        assert ids == match_ids[::-1]
+        # Without limit, the whole listing (previous behavior)
+        response = client.get(f"/matches?event_id={event_id}")
+        assert [match["id"] for match in response.json()] == match_ids
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_filters(self, client, league):
+        """Player, finished and tournament filters combine with pagination"""
+        event_id, (ana, bia, caio) = league
+        match_ids = self._import(client, event_id, (ana, bia, caio))
+
+        ids, _ = self._walk(client, f"/matches?event_id={event_id}&player_id={caio}", 1)
+        assert ids == [match_ids[1], match_ids[2], match_ids[4]]
+        ids, _ = self._walk(client, f"/matches?event_id={event_id}&player_id={ana}&order=desc", 2)
+        assert ids == [match_ids[3], match_ids[2], match_ids[0]]
+        ids, _ = self._walk(client, f"/matches?event_id={event_id}&finished=false", 1)
+        assert ids == [match_ids[1], match_ids[3]]
+        ids, _ = self._walk(client, f"/matches?event_id={event_id}&tournament_id=1", 1)
+        assert ids == []
+
+        ids, _ = self._walk(client, "/matches/all/list?order=desc", 2)
+        assert ids == [match_ids[4], match_ids[2], match_ids[0]]
+        ids, _ = self._walk(client, f"/matches/all/list?player_id={bia}", 1)
+        assert ids == [match_ids[0], match_ids[4]]
+
+    def test_player_of_another_event(self, client, league):
+        """Filtering an event's matches by a player of another event returns nothing"""
+        event_id, player_ids = league
+        self._import(client, event_id, player_ids)
+        other_event = client.post(
+            "/events", json={"name": "Other", "date": "2024-12-16", "time": "19:00"}
+        ).json()["id"]
+        assert client.get(f"/matches?event_id={other_event}&player_id={player_ids[0]}").json() == []
@@ -0,0 +1,105 @@
+"""Unit tests for the materialized Player.ranking positions"""
+import random
+
+import pytest
+from fastapi import status
+
+from models import Event, Player
+from utils.player_ranking import move_player_rating, rank_player, rerank_players, unrank_player
+
+
+def _report(client, event_id, player1_id, player2_id, winner_id):
+    response = client.post("/matches", json={
+        "event_id": event_id, "player1_id": player1_id,
+        "player2_id": player2_id, "winner_id": winner_id,
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.unit
+class TestIncrementalRanking:
+    """Incremental maintenance must always agree with the DENSE_RANK repair"""
+
+    def _event(self, db_session):
+        event = Event(name="Ranked", date="2024-12-15", time="19:00")
+        db_session.add(event)
+        db_session.flush()
+        return event
+
+    def _add(self, db_session, event, rating):
+        player = Player(name=f"P{rating}", event_id=event.id, elo_rating=rating)
+        db_session.add(player)
+        rank_player(db_session, player)
+        return player
+
+    def test_ties_share_a_dense_rank(self, db_session):
+        event = self._event(db_session)
+        players = [self._add(db_session, event, rating) for rating in (1200, 1250, 1200, 1300, 1250)]
+
+        assert [p.ranking for p in players] == [3, 2, 3, 1, 2]
+        assert rerank_players(db_session, event.id) == 0
+
+    def test_move_shifts_players_in_between(self, db_session):
+        event = self._event(db_session)
+        low, mid, high = (self._add(db_session, event, rating) for rating in (1100, 1200, 1300))
+
+        move_player_rating(db_session, low, 1250)
+        db_session.flush()
+        assert (high.ranking, low.ranking, mid.ranking) == (1, 2, 3)
+
+        move_player_rating(db_session, low, 1300)  # Joins the top rating
+        db_session.flush()
+        assert (high.ranking, low.ranking, mid.ranking) == (1, 1, 2)
+
+    def test_unrank_closes_the_gap(self, db_session):
+        event = self._event(db_session)
+        low, mid, high = (self._add(db_session, event, rating) for rating in (1100, 1200, 1300))
+
+        unrank_player(db_session, mid)
+        mid.active = False
+        db_session.flush()
+        assert (high.ranking, low.ranking, mid.ranking) == (1, 2, 0)
+
+    def test_random_moves_match_repair(self, db_session):
+        rng = random.Random(7)
+        event = self._event(db_session)
+        ratings = [1180, 1200, 1210, 1220, 1250]
+        players = [self._add(db_session, event, rng.choice(ratings)) for _ in range(12)]
+
+        for _ in range(200):
+            move_player_rating(db_session, rng.choice(players), rng.choice(ratings))
+            db_session.flush()
+            assert rerank_players(db_session, event.id) == 0
+
+    def test_repair_fixes_corrupted_positions(self, db_session):
+        event = self._event(db_session)
+        players = [self._add(db_session, event, rating) for rating in (1100, 1200, 1300)]
+        players[0].ranking = 9
+        players[1].active = False
+        db_session.flush()
+
+        assert rerank_players(db_session, event.id) == 2
+        assert [p.ranking for p in players] == [2, 0, 1]
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestRankingThroughApi:
+    """Match results, deactivation and replays keep rankings exact"""
+
+    def test_match_results_update_rankings(self, client, db_session, league):
+        event_id, (ana, bia, caio) = league
+        assert {client.get(f"/players/{pid}").json()["ranking"] for pid in (ana, bia, caio)} == {1}
+
+        _report(client, event_id, ana, bia, ana)
+        ranking = {e["player_id"]: e["ranking"] for e in client.get(f"/ranking/{event_id}?sort=elo").json()}
+        assert ranking == {ana: 1, caio: 2, bia: 3}
+        assert rerank_players(db_session, event_id) == 0
+
+    def test_deleted_player_leaves_the_ranking(self, client, db_session, league):
+        event_id, (ana, bia, caio) = league
+        _report(client, event_id, ana, bia, ana)
+
+        client.delete(f"/players/{ana}")
+        assert client.get(f"/players/{ana}").json()["ranking"] == 0
+        assert rerank_players(db_session, event_id) == 0
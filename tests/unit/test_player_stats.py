@@ -0,0 +1,94 @@
+"""Unit tests for the materialized player_event_stats table"""
+import pytest
+from fastapi import status
+
+
+def _stats(client, player_id):
+    response = client.get(f"/players/{player_id}/stats")
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+@pytest.mark.unit
+@pytest.mark.db
+class TestPlayerStats:
+    """Test incremental maintenance of player statistics"""
+
+    def test_new_player_has_zeroed_stats(self, client, league):
+        """Registering a player creates an empty stats row"""
+        _, (ana, _, _) = league
+        stats = _stats(client, ana)
+        assert stats["wins"] == 0
+        assert stats["losses"] == 0
+        assert stats["matches_played"] == 0
+        assert stats["last_played_at"] is None
+
+    def test_stats_for_unknown_player(self, client):
+        """Unknown players return 404"""
+        response = client.get("/players/999/stats")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_register_update_and_delete_keep_stats_in_sync(self, client, db_session, league):
+        """Stats follow every match write and never drift from the matches table"""
+        from utils.player_stats import find_player_stats_drift
+
+        event_id, (ana, bia, caio) = league
+
+        # Result reported on creation
+        match1 = client.post("/matches", json={
+            "event_id": event_id, "player1_id": ana, "player2_id": bia,
+            "winner_id": ana, "player1_games": 3, "player2_games": 1,
+        }).json()
+        # Result reported later through update
+        match2 = client.post("/matches", json={
+            "event_id": event_id, "player1_id": bia, "player2_id": caio,
+        }).json()
+        assert _stats(client, caio)["matches_played"] == 0
+        client.put(f"/matches/{match2['id']}", json={
+            "winner_id": caio, "player1_games": 2, "player2_games": 3,
+        })
+
+        ana_stats = _stats(client, ana)
+        assert ana_stats["wins"] == 1
+        assert ana_stats["games_won"] == 3
+        assert ana_stats["games_lost"] == 1
+        assert ana_stats["win_rate"] == 1.0
+        assert ana_stats["last_played_at"] is not None
+        bia_stats = _stats(client, bia)
+        assert bia_stats["losses"] == 2
+        assert bia_stats["matches_played"] == 2
+        assert bia_stats["games_won"] == 3
+        assert find_player_stats_drift(db_session, event_id) == []
+
+        # Winner correction moves the win to the other player
+        client.put(f"/matches/{match1['id']}", json={"winner_id": bia})
+        assert _stats(client, ana)["wins"] == 0
+        assert _stats(client, bia)["wins"] == 1
+        assert find_player_stats_drift(db_session, event_id) == []
+
+        # Deleting a match removes its contribution
+        client.delete(f"/matches/{match2['id']}")
+        caio_stats = _stats(client, caio)
+        assert caio_stats["matches_played"] == 0
+        assert caio_stats["last_played_at"] is None
+        assert find_player_stats_drift(db_session, event_id) == []
+
+    def test_rebuild_reports_and_fixes_drift(self, client, db_session, league):
+        """Rebuild recomputes the table from matches and reports what was wrong"""
+        from models import Match, PlayerEventStats
+        from utils.player_stats import find_player_stats_drift, rebuild_player_stats
+
+        event_id, (ana, bia, _) = league
+        # A match inserted behind the endpoints' back
+        db_session.add(Match(event_id=event_id, player1_id=ana, player2_id=bia,
+                             winner_id=bia, finished=True))
+        db_session.commit()
+
+        drift = find_player_stats_drift(db_session, event_id)
+        assert {(d["player_id"], d["field"]) for d in drift} >= {(ana, "losses"), (bia, "wins")}
+
+        assert rebuild_player_stats(db_session, event_id) == drift
+        db_session.commit()
+        assert find_player_stats_drift(db_session, event_id) == []
+        stored = db_session.query(PlayerEventStats).filter(PlayerEventStats.player_id == bia).one()
+        assert stored.wins == 1
@@ -131,13 +131,24 @@ class TestPlayers:
         # Update player
         update_data = {
             "name": "João Silva Updated",
-            "score": 100
         }
         response = client.put(f"/players/{player_id}", json=update_data)
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["name"] == "João Silva Updated"
-        assert data["score"] == 100
+        assert data["score"] == 0
+
+    @pytest.mark.parametrize("field", ["score", "ranking"])
+    def test_update_player_rejects_derived_fields(self, client, field):
+        """Score and ranking are derived from the results and can't be set"""
+        event_id = client.post(
+            "/events", json={"name": "Test Event", "date": "2024-12-15", "time": "19:00"}
+        ).json()["id"]
+        player = client.post("/players", json={"name": "João Silva", "event_id": event_id}).json()
+
+        response = client.put(f"/players/{player['id']}", json={field: 100})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert client.get(f"/players/{player['id']}").json()[field] == player[field]
 
     def test_delete_player_success(self, client):
         """Test soft deleting a player"""
@@ -189,3 +200,55 @@ class TestPlayers:
         assert response.status_code == status.HTTP_200_OK
         players = response.json()
         assert len(players) == 2  # Both active and inactive
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestHeadToHead:
+    """Test head-to-head statistics"""
+
+    def _report(self, client, event_id, p1, p2, winner, games):
+        response = client.post("/matches", json={
+            "event_id": event_id, "player1_id": p1, "player2_id": p2, "winner_id": winner,
+            "player1_games": games[0], "player2_games": games[1],
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()["id"]
+
+    def test_pair_key_is_order_independent(self, client, db_session, league):
+        from models import Match
+
+        event_id, (ana, bia, _) = league
+        first = self._report(client, event_id, ana, bia, ana, (3, 1))
+        second = self._report(client, event_id, bia, ana, bia, (3, 2))
+
+        keys = {(m.pair_min_id, m.pair_max_id) for m in db_session.query(Match).filter(Match.id.in_((first, second)))}
+        assert keys == {(min(ana, bia), max(ana, bia))}
+
+    def test_head_to_head_totals_and_last_results(self, client, league):
+        event_id, (ana, bia, caio) = league
+        self._report(client, event_id, ana, bia, ana, (3, 1))
+        self._report(client, event_id, bia, ana, bia, (3, 2))
+        last = self._report(client, event_id, bia, ana, ana, (0, 3))
+        self._report(client, event_id, ana, caio, caio, (0, 3))  # Other pair
+        client.post("/matches", json={"event_id": event_id, "player1_id": ana, "player2_id": bia})  # Unfinished
+
+        response = client.get(f"/players/{ana}/vs/{bia}?last=2")
+        assert response.status_code == status.HTTP_200_OK
+        h2h = response.json()
+        assert h2h["matches_played"] == 3
+        assert (h2h["player_a_wins"], h2h["player_b_wins"]) == (2, 1)
+        assert (h2h["player_a_games"], h2h["player_b_games"]) == (8, 4)
+        assert h2h["player_a_elo_swing"] == pytest.approx(-h2h["player_b_elo_swing"])
+        assert [r["match_id"] for r in h2h["last_results"]] == [last, last - 1]
+        assert h2h["last_results"][0]["player_a_games"] == 3
+        assert h2h["last_results"][0]["player_a_elo_change"] > 0
+
+        reverse = client.get(f"/players/{bia}/vs/{ana}").json()
+        assert (reverse["player_a_wins"], reverse["player_b_wins"]) == (1, 2)
+        assert reverse["player_a_elo_swing"] == h2h["player_b_elo_swing"]
+
+    def test_head_to_head_errors(self, client, league):
+        _, (ana, _, _) = league
+        assert client.get(f"/players/{ana}/vs/{ana}").status_code == status.HTTP_400_BAD_REQUEST
+        assert client.get(f"/players/{ana}/vs/99999").status_code == status.HTTP_404_NOT_FOUND
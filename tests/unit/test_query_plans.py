@@ -0,0 +1,97 @@
+"""Query-plan regression tests: hot API paths must not fall back to full table scans"""
+import re
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Tables whose size grows with usage; a full scan of any of them on a hot path is a regression
+LARGE_TABLES = ("matches", "players", "memberships", "player_event_stats", "rating_history",
+                "rating_checkpoints", "global_player_stats")
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+def _capture_statements(engine):
+    """Record every (statement, parameters) executed on the engine"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "INSERT", "WITH")):
+            statements.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", record)
+
+
+def _full_scans(engine, statements):
+    """
+    Plan every statement and return the (plan step, statement) pairs that scan
+    a large table. Walking an index in order under a LIMIT (the first page of
+    a sorted listing) reads at most LIMIT entries and is not reported.
+    """
+    scans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+                step = row[3]
+                match = FULL_SCAN.match(step)
+                if not match or match.group(1) not in LARGE_TABLES:
+                    continue
+                if " INDEX " in step and re.search(r"\bLIMIT\b", statement):
+                    continue
+                scans.append((step, statement))
+    return scans
+
+
+HOT_PATHS = {
+    "register match": lambda c, e, p, m: c.post("/matches", json={
+        "event_id": e, "player1_id": p[0], "player2_id": p[1], "winner_id": p[0]}),
+    "report result": lambda c, e, p, m: c.put(f"/matches/{m[1]}", json={"winner_id": p[2]}),
+    "correct result": lambda c, e, p, m: c.put(f"/matches/{m[0]}", json={"winner_id": p[1]}),
+    "delete match": lambda c, e, p, m: c.delete(f"/matches/{m[0]}"),
+    "bulk import": lambda c, e, p, m: c.post("/matches/bulk", json=[
+        {"event_id": e, "player1_id": p[1], "player2_id": p[2], "winner_id": p[2]}]),
+    "get match": lambda c, e, p, m: c.get(f"/matches/{m[0]}"),
+    "event matches page": lambda c, e, p, m: c.get(f"/matches?event_id={e}&limit=2&after_id={m[0]}"),
+    "event matches by state": lambda c, e, p, m: c.get(f"/matches?event_id={e}&finished=true&limit=2"),
+    "player matches page": lambda c, e, p, m: c.get(f"/matches?event_id={e}&player_id={p[0]}&limit=2&order=desc"),
+    "all matches by player": lambda c, e, p, m: c.get(f"/matches/all/list?player_id={p[0]}&limit=2"),
+    "tournament matches": lambda c, e, p, m: c.get(f"/matches?event_id={e}&tournament_id=1&limit=2"),
+    "ranking by elo": lambda c, e, p, m: c.get(f"/ranking/{e}?sort=elo&limit=2"),
+    "ranking by wins": lambda c, e, p, m: c.get(f"/ranking/{e}?sort=wins&limit=2"),
+    "ranking by win rate": lambda c, e, p, m: c.get(f"/ranking/{e}?sort=win_rate&limit=2"),
+    "ranking around player": lambda c, e, p, m: c.get(f"/ranking/{e}/around/{p[1]}?window=1"),
+    "ranking as of": lambda c, e, p, m: c.get(f"/ranking/{e}?as_of={m[0]}"),
+    "global ranking": lambda c, e, p, m: c.get("/ranking/global?limit=2"),
+    "event players": lambda c, e, p, m: c.get(f"/players?event_id={e}"),
+    "player stats": lambda c, e, p, m: c.get(f"/players/{p[0]}/stats"),
+    "rating history": lambda c, e, p, m: c.get(f"/players/{p[0]}/rating-history"),
+    "head to head": lambda c, e, p, m: c.get(f"/players/{p[0]}/vs/{p[1]}"),
+    "win matrix": lambda c, e, p, m: c.get(f"/events/{e}/win-matrix"),
+}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("path", sorted(HOT_PATHS))
+def test_hot_path_uses_indexes(path, client, db_session, league):
+    """Every statement of a hot path is planned as index searches, never as a full scan"""
+    event_id, player_ids = league
+    ana, bia, caio = player_ids
+    match_ids = client.post("/matches/bulk", json=[
+        {"event_id": event_id, "player1_id": ana, "player2_id": bia, "winner_id": ana},
+        {"event_id": event_id, "player1_id": bia, "player2_id": caio},
+        {"event_id": event_id, "player1_id": ana, "player2_id": caio, "winner_id": caio},
+    ]).json()["match_ids"]
+
+    engine = db_session.get_bind()
+    # On every engine: the async read endpoints run on their own (aiosqlite) engine
+    statements, stop = _capture_statements(Engine)
+    try:
+        response = HOT_PATHS[path](client, event_id, player_ids, match_ids)
+    finally:
+        stop()
+    assert response.status_code < 400, response.text
+    assert statements
+
+    assert _full_scans(engine, statements) == []
@@ -199,3 +199,460 @@ class TestRanking:
         assert ranking[0]["wins"] == 2
         assert ranking[1]["wins"] == 1
         assert ranking[2]["wins"] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.db
+class TestRankingAggregation:
+    """Test the ranking read path over player_event_stats"""
+
+    def _seed(self, db_session):
+        from models import Event, Match, Player
+        from utils.player_stats import rebuild_player_stats
+
+        event = Event(name="League Night", date="2024-12-15", time="19:00")
+        other = Event(name="Other Night", date="2024-12-16", time="19:00")
+        db_session.add_all([event, other])
+        db_session.flush()
+
+        players = [Player(name=name, event_id=event.id) for name in ["Ana", "Bia", "Caio", "Davi"]]
+        players[3].active = False
+        outsider = Player(name="Eva", event_id=other.id)
+        db_session.add_all(players + [outsider])
+        db_session.flush()
+        ana, bia, caio, davi = players
+
+        db_session.add_all([
+            Match(event_id=event.id, player1_id=ana.id, player2_id=bia.id, winner_id=ana.id, finished=True),
+            Match(event_id=event.id, player1_id=caio.id, player2_id=ana.id, winner_id=ana.id, finished=True),
+            Match(event_id=event.id, player1_id=bia.id, player2_id=caio.id, winner_id=bia.id, finished=True),
+            Match(event_id=event.id, player1_id=caio.id, player2_id=bia.id, winner_id=caio.id, finished=True),
+            Match(event_id=event.id, player1_id=davi.id, player2_id=ana.id, winner_id=davi.id, finished=True),
+            # Unfinished and winner-less matches don't count
+            Match(event_id=event.id, player1_id=ana.id, player2_id=bia.id, winner_id=bia.id, finished=False),
+            Match(event_id=event.id, player1_id=ana.id, player2_id=caio.id, finished=True),
+            # Matches from other events don't count
+            Match(event_id=other.id, player1_id=outsider.id, player2_id=outsider.id,
+                  winner_id=outsider.id, finished=True),
+        ])
+        db_session.flush()
+        # Rows inserted directly bypass the match endpoints: rebuild the stats table
+        rebuild_player_stats(db_session)
+        db_session.commit()
+        return event, players
+
+    def test_ranking_counts_and_order(self, client, db_session):
+        """Wins, losses and win rate come from the stats table, ordered in SQL"""
+        event, (ana, bia, caio, davi) = self._seed(db_session)
+
+        response = client.get(f"/ranking/{event.id}")
+        assert response.status_code == status.HTTP_200_OK
+        ranking = response.json()
+
+        assert [entry["player_id"] for entry in ranking] == [ana.id, bia.id, caio.id]
+        assert ranking[0]["wins"] == 2 and ranking[0]["losses"] == 1
+        assert ranking[0]["win_rate"] == 0.67
+        assert ranking[1]["wins"] == 1 and ranking[1]["losses"] == 2
+        assert ranking[2]["wins"] == 1 and ranking[2]["losses"] == 2
+        assert ranking[2]["win_rate"] == 0.33
+
+    def test_ranking_is_a_single_select(self, client, db_session):
+        """Ranking cost doesn't grow with the number of players"""
+        from sqlalchemy import event as sa_event
+        from sqlalchemy.engine import Engine
+
+        event, _ = self._seed(db_session)
+        event_id = event.id
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        # On every engine: the ranking is served by the async (aiosqlite) engine
+        sa_event.listen(Engine, "before_cursor_execute", capture)
+        try:
+            response = client.get(f"/ranking?event_id={event_id}")
+        finally:
+            sa_event.remove(Engine, "before_cursor_execute", capture)
+
+        assert response.status_code == status.HTTP_200_OK
+        # One lookup for the event, one query for the whole ranking
+        assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 2
+
+
+class TestRankingPagination:
+    """Test keyset pagination and sort options of the ranking"""
+
+    def _seed(self, db_session, size=7):
+        from models import Event, Player
+
+        event = Event(name="Top Ten", date="2024-12-15", time="19:00")
+        db_session.add(event)
+        db_session.flush()
+        # Ties on elo so pages must break them on player id
+        players = [Player(name=f"P{i}", event_id=event.id, elo_rating=1600 - 10 * (i // 2)) for i in range(size)]
+        db_session.add_all(players)
+        db_session.commit()
+        return event.id, players
+
+    def _pages(self, client, url):
+        entries, cursor, pages = [], None, 0
+        while True:
+            response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+            assert response.status_code == status.HTTP_200_OK
+            entries.extend(response.json())
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return entries, pages
+
+    def test_players_get_a_stats_row_on_insert(self, db_session):
+        """Ranking inner-joins the stats table: every player needs a row"""
+        from models import PlayerEventStats
+
+        _, players = self._seed(db_session, size=2)
+        rows = db_session.query(PlayerEventStats).filter(
+            PlayerEventStats.player_id.in_([p.id for p in players])
+        ).all()
+        assert len(rows) == 2 and all(row.wins == 0 for row in rows)
+
+    def test_limit_returns_top_rows_and_cursor(self, client, db_session):
+        event_id, players = self._seed(db_session)
+
+        response = client.get(f"/ranking/{event_id}?sort=elo&limit=3")
+        assert response.status_code == status.HTTP_200_OK
+        assert [e["player_id"] for e in response.json()] == [p.id for p in players[:3]]
+        assert response.headers.get("X-Next-Cursor")
+
+    def test_pages_cover_the_full_ranking(self, client, db_session):
+        event_id, _ = self._seed(db_session)
+
+        for sort in ("elo", "wins", "win_rate"):
+            full = client.get(f"/ranking/{event_id}?sort={sort}").json()
+            paged, pages = self._pages(client, f"/ranking/{event_id}?sort={sort}&limit=2")
+            assert paged == full
+            assert pages == 4
+
+    def test_last_page_has_no_cursor(self, client, db_session):
+        event_id, _ = self._seed(db_session, size=3)
+
+        response = client.get(f"/ranking?event_id={event_id}&limit=3")
+        assert len(response.json()) == 3
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_invalid_cursor(self, client, db_session):
+        event_id, _ = self._seed(db_session)
+        cursor = client.get(f"/ranking/{event_id}?sort=elo&limit=2").headers["X-Next-Cursor"]
+
+        assert client.get(f"/ranking/{event_id}?limit=2&cursor=garbage").status_code == 400
+        # A cursor from another sort order is rejected
+        assert client.get(f"/ranking/{event_id}?sort=wins&limit=2&cursor={cursor}").status_code == 400
+
+
+class TestRankingAround:
+    """Test the "around me" ranking lookup"""
+
+    def _seed(self, db_session, size=9):
+        from models import Event, Player
+
+        event = Event(name="Around", date="2024-12-15", time="19:00")
+        db_session.add(event)
+        db_session.flush()
+        players = [Player(name=f"P{i}", event_id=event.id, elo_rating=1700 - 10 * (i // 2)) for i in range(size)]
+        db_session.add_all(players)
+        db_session.commit()
+        return event.id, [p.id for p in players]
+
+    def test_position_and_neighbors_match_full_ranking(self, client, db_session):
+        event_id, _ = self._seed(db_session)
+        full = [e["player_id"] for e in client.get(f"/ranking/{event_id}?sort=elo").json()]
+
+        for index, player_id in enumerate(full):
+            response = client.get(f"/ranking/{event_id}/around/{player_id}?sort=elo&window=2")
+            assert response.status_code == status.HTTP_200_OK
+            body = response.json()
+            assert body["position"] == index + 1
+            assert body["total"] == len(full)
+            start = max(0, index - 2)
+            assert [e["player_id"] for e in body["entries"]] == full[start:index + 3]
+            assert [e["position"] for e in body["entries"]] == list(range(start + 1, min(len(full), index + 3) + 1))
+
+    def test_default_sort_is_wins(self, client, db_session):
+        event_id, ids = self._seed(db_session, size=3)
+        full = [e["player_id"] for e in client.get(f"/ranking/{event_id}").json()]
+
+        body = client.get(f"/ranking/{event_id}/around/{full[1]}?window=0").json()
+        assert body["sort"] == "wins"
+        assert body["position"] == 2
+        assert [e["player_id"] for e in body["entries"]] == [full[1]]
+
+    def test_unknown_player_or_event(self, client, db_session):
+        event_id, _ = self._seed(db_session, size=2)
+
+        assert client.get(f"/ranking/{event_id}/around/99999").status_code == 404
+        assert client.get("/ranking/99999/around/1").status_code == 404
+
+
+class TestGlobalRanking:
+    """Test the cross-event leaderboard"""
+
+    def _event(self, client, db_session, names, keys=None):
+        from models import Membership, MembershipStatus
+
+        event_id = client.post("/events", json={"name": "Night", "date": "2024-12-20", "time": "19:00"}).json()["id"]
+        ids = []
+        for name in names:
+            body = {"name": name, "event_id": event_id}
+            if keys and name in keys:
+                body["player_key"] = keys[name]
+            ids.append(client.post("/players", json=body).json()["id"])
+        db_session.add_all([
+            Membership(event_id=event_id, player_id=pid, status=MembershipStatus.ATIVO) for pid in ids
+        ])
+        db_session.commit()
+        return event_id, ids
+
+    def _report(self, client, event_id, p1, p2, winner):
+        response = client.post("/matches", json={
+            "event_id": event_id, "player1_id": p1, "player2_id": p2, "winner_id": winner,
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()["id"]
+
+    def _snapshot(self, db_session):
+        from models import GlobalPlayerStats
+
+        db_session.expire_all()
+        return {
+            row.player_key: (row.wins, row.losses, row.win_rate, row.matches_played)
+            for row in db_session.query(GlobalPlayerStats)
+        }
+
+    def test_aggregates_players_across_events_by_name(self, client, db_session):
+        e1, (ana1, bia1) = self._event(client, db_session, ["Ana", "Bia"])
+        e2, (ana2, caio2) = self._event(client, db_session, [" ana ", "Caio"])
+        self._report(client, e1, ana1, bia1, ana1)
+        self._report(client, e2, ana2, caio2, ana2)
+        self._report(client, e2, caio2, ana2, caio2)
+
+        response = client.get("/ranking/global")
+        assert response.status_code == status.HTTP_200_OK
+        board = response.json()
+        assert [entry["player_key"] for entry in board] == ["ana", "caio", "bia"]
+        assert board[0]["name"] == "Ana"
+        assert (board[0]["wins"], board[0]["losses"], board[0]["win_rate"]) == (2, 1, 0.67)
+
+    def test_incremental_updates_match_rebuild(self, client, db_session):
+        from utils.player_stats import rebuild_global_stats
+
+        e1, (ana, bia, caio) = self._event(client, db_session, ["Ana", "Bia", "Caio"])
+        first = self._report(client, e1, ana, bia, ana)
+        self._report(client, e1, bia, caio, caio)
+        client.put(f"/matches/{first}", json={"winner_id": bia})
+        client.put(f"/players/{caio}", json={"player_key": " BIA "})  # Re-keying merges identities
+        client.delete(f"/matches/{first}")
+
+        incremental = self._snapshot(db_session)
+        rebuild_global_stats(db_session)
+        db_session.commit()
+        assert incremental == self._snapshot(db_session)
+        assert incremental == {"bia": (1, 1, 0.5, 2)}
+
+    def test_rename_keeps_the_history(self, client, db_session):
+        e1, (ana1, bia1) = self._event(client, db_session, ["Ana", "Bia"])
+        e2, (ana2, caio2) = self._event(client, db_session, ["Ana", "Caio"])
+        self._report(client, e1, ana1, bia1, ana1)
+        self._report(client, e2, ana2, caio2, ana2)
+
+        response = client.put(f"/players/{ana2}", json={"name": "Ana Souza"})
+        assert response.json()["player_key"] == "ana"
+        assert self._snapshot(db_session)["ana"] == (2, 0, 1.0, 2)
+
+    def test_namesakes_with_distinct_keys_stay_apart(self, client, db_session):
+        e1, (ana1, bia1) = self._event(client, db_session, ["Ana", "Bia"])
+        e2, (ana2, caio2) = self._event(client, db_session, ["Ana", "Caio"], keys={"Ana": "ana-recife"})
+        self._report(client, e1, ana1, bia1, ana1)
+        self._report(client, e2, caio2, ana2, caio2)
+
+        board = {entry["player_key"]: entry for entry in client.get("/ranking/global").json()}
+        assert (board["ana"]["wins"], board["ana"]["losses"]) == (1, 0)
+        assert (board["ana-recife"]["name"], board["ana-recife"]["wins"], board["ana-recife"]["losses"]) == ("Ana", 0, 1)
+
+    def test_inactive_players_are_not_counted(self, client, db_session):
+        from utils.player_stats import rebuild_global_stats
+
+        e1, (ana, bia, caio) = self._event(client, db_session, ["Ana", "Bia", "Caio"])
+        first = self._report(client, e1, ana, bia, ana)
+        self._report(client, e1, bia, caio, bia)
+        assert client.delete(f"/players/{bia}").status_code == status.HTTP_200_OK
+        client.put(f"/matches/{first}", json={"winner_id": bia})  # Results of an inactive player stay out
+
+        incremental = self._snapshot(db_session)
+        assert incremental == {"ana": (0, 1, 0.0, 1), "caio": (0, 1, 0.0, 1)}
+        rebuild_global_stats(db_session)
+        db_session.commit()
+        assert incremental == self._snapshot(db_session)
+
+    def test_pagination(self, client, db_session):
+        e1, ids = self._event(client, db_session, [f"P{i}" for i in range(6)])
+        for winner, loser in zip(ids, ids[1:]):
+            self._report(client, e1, winner, loser, winner)
+        full = client.get("/ranking/global?sort=win_rate").json()
+
+        paged, cursor = [], None
+        while True:
+            url = "/ranking/global?sort=win_rate&limit=4" + (f"&cursor={cursor}" if cursor else "")
+            response = client.get(url)
+            paged.extend(response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert paged == full and len(full) == 6
+
+        cursor = client.get("/ranking/global?limit=1").headers["X-Next-Cursor"]
+        assert client.get(f"/ranking/global?sort=win_rate&cursor={cursor}").status_code == 400
+
+
+class TestRankingAsOf:
+    """Test point-in-time rankings served from rating checkpoints"""
+
+    def _play(self, client, league, results):
+        event_id, (ana, bia, caio) = league
+        names = {"ana": ana, "bia": bia, "caio": caio}
+        match_ids = []
+        for p1, p2, winner in results:
+            response = client.post("/matches", json={
+                "event_id": event_id, "player1_id": names[p1], "player2_id": names[p2],
+                "winner_id": names[winner],
+            })
+            assert response.status_code == status.HTTP_201_CREATED
+            match_ids.append(response.json()["id"])
+        return match_ids
+
+    def _elo(self, client, url):
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        return {e["player_id"]: (e["elo"], e["wins"], e["losses"]) for e in response.json()}
+
+    RESULTS = [
+        ("ana", "bia", "ana"), ("bia", "caio", "caio"), ("caio", "ana", "caio"),
+        ("ana", "bia", "bia"), ("bia", "caio", "bia"), ("ana", "caio", "ana"), ("bia", "ana", "ana"),
+    ]
+
+    def test_as_of_match_matches_replay_of_prefix(self, client, league, monkeypatch):
+        import utils.elo_replay as elo_replay
+        from utils.elo_replay import replay_ratings
+
+        monkeypatch.setattr(elo_replay, "CHECKPOINT_INTERVAL", 3)
+        event_id, ids = league
+        match_ids = self._play(client, league, self.RESULTS)
+        names = dict(zip(("ana", "bia", "caio"), ids))
+
+        for k, match_id in enumerate(match_ids, start=1):
+            prefix = [(names[p1], names[p2], names[w]) for p1, p2, w in self.RESULTS[:k]]
+            ratings, wins = replay_ratings(ids, *zip(*prefix))
+            as_of = self._elo(client, f"/ranking/{event_id}?as_of={match_id}")
+            assert {pid: as_of[pid][:2] for pid in ids} == dict(zip(ids, zip(ratings, wins)))
+
+        # The last result gives the current ranking
+        assert self._elo(client, f"/ranking/{event_id}?as_of={match_ids[-1]}") == self._elo(
+            client, f"/ranking/{event_id}"
+        )
+
+    def test_checkpoints_do_not_change_results(self, client, db_session, league, monkeypatch):
+        import utils.elo_replay as elo_replay
+        from models import RatingCheckpoint
+
+        monkeypatch.setattr(elo_replay, "CHECKPOINT_INTERVAL", 2)  # Raised to 3, the number of players
+        event_id, _ = league
+        match_ids = self._play(client, league, self.RESULTS)
+
+        assert db_session.query(RatingCheckpoint).filter_by(event_id=event_id).count() == 2
+        with_checkpoints = [self._elo(client, f"/ranking/{event_id}?as_of={m}") for m in match_ids]
+
+        db_session.query(RatingCheckpoint).delete()
+        db_session.commit()
+        assert with_checkpoints == [self._elo(client, f"/ranking/{event_id}?as_of={m}") for m in match_ids]
+        # Point-in-time rankings only read checkpoints
+        assert db_session.query(RatingCheckpoint).count() == 0
+
+    def test_checkpoints_are_saved_as_results_are_recorded(self, client, db_session, league, monkeypatch):
+        import utils.elo_replay as elo_replay
+        from models import RatingCheckpoint
+
+        monkeypatch.setattr(elo_replay, "CHECKPOINT_INTERVAL", 3)
+        event_id, _ = league
+        counts = []
+        for result in self.RESULTS:
+            self._play(client, league, [result])
+            counts.append(db_session.query(RatingCheckpoint).filter_by(event_id=event_id).count())
+        assert counts == [0, 0, 1, 1, 1, 2, 2]
+        checkpoints = db_session.query(RatingCheckpoint).order_by(RatingCheckpoint.match_count).all()
+        assert [c.match_count for c in checkpoints] == [3, 6]
+
+        # A replay rewrites the same checkpoints
+        def saved():
+            keys = ("player_ids", "ratings", "wins", "played")
+            return [
+                (c.match_count, c.last_match_id, set(zip(*(c.state[key] for key in keys))))
+                for c in db_session.query(RatingCheckpoint).order_by(RatingCheckpoint.match_count)
+            ]
+
+        recorded = saved()
+        assert client.post(f"/events/{event_id}/replay-ratings").status_code == status.HTTP_200_OK
+        db_session.expire_all()
+        assert saved() == recorded
+
+    def test_bulk_import_saves_checkpoints(self, client, db_session, league, monkeypatch):
+        import utils.elo_replay as elo_replay
+        from models import RatingCheckpoint
+
+        monkeypatch.setattr(elo_replay, "CHECKPOINT_INTERVAL", 3)
+        event_id, (ana, bia, caio) = league
+        names = {"ana": ana, "bia": bia, "caio": caio}
+        response = client.post("/matches/bulk", json=[
+            {"event_id": event_id, "player1_id": names[p1], "player2_id": names[p2], "winner_id": names[winner]}
+            for p1, p2, winner in self.RESULTS
+        ])
+        assert response.status_code == status.HTTP_200_OK
+        checkpoints = db_session.query(RatingCheckpoint).filter_by(event_id=event_id).all()
+        assert sorted(c.match_count for c in checkpoints) == [3, 6]
+        match_ids = response.json()["match_ids"]
+        assert self._elo(client, f"/ranking/{event_id}?as_of={match_ids[-1]}") == self._elo(
+            client, f"/ranking/{event_id}"
+        )
+
+    def test_replay_rewrites_checkpoints(self, client, db_session, league, monkeypatch):
+        import utils.elo_replay as elo_replay
+        from models import RatingCheckpoint
+
+        monkeypatch.setattr(elo_replay, "CHECKPOINT_INTERVAL", 2)
+        event_id, _ = league
+        match_ids = self._play(client, league, self.RESULTS)
+
+        client.delete(f"/matches/{match_ids[0]}")
+        db_session.expire_all()
+        checkpoints = db_session.query(RatingCheckpoint).filter_by(event_id=event_id).all()
+        assert sorted(c.match_count for c in checkpoints) == [3, 6]
+        assert self._elo(client, f"/ranking/{event_id}?as_of={match_ids[-1]}") == self._elo(
+            client, f"/ranking/{event_id}"
+        )
+
+    def test_as_of_timestamp(self, client, league):
+        from elo import INITIAL_RATING
+
+        event_id, ids = league
+        self._play(client, league, self.RESULTS[:2])
+
+        before = self._elo(client, f"/ranking/{event_id}?as_of=2000-01-01T00:00:00Z")
+        assert before == {pid: (INITIAL_RATING, 0, 0) for pid in ids}
+        after = self._elo(client, f"/ranking/{event_id}?as_of=2999-01-01T00:00:00")
+        assert after == self._elo(client, f"/ranking/{event_id}")
+
+    def test_invalid_as_of(self, client, league):
+        event_id, _ = league
+        match_id = self._play(client, league, self.RESULTS[:1])[0]
+
+        assert client.get(f"/ranking/{event_id}?as_of=yesterday").status_code == 400
+        assert client.get(f"/ranking/{event_id}?as_of=99999").status_code == 400
+        assert client.get(f"/ranking/{event_id}?as_of={match_id}&cursor=abc").status_code == 400
@@ -0,0 +1,85 @@
+"""Unit tests for the rating history ledger"""
+import pytest
+from fastapi import status
+
+from elo import INITIAL_RATING
+
+
+def _report(client, event_id, player1_id, player2_id, winner_id):
+    response = client.post("/matches", json={
+        "event_id": event_id, "player1_id": player1_id,
+        "player2_id": player2_id, "winner_id": winner_id,
+    })
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()["id"]
+
+
+@pytest.mark.unit
+@pytest.mark.api
+class TestRatingHistory:
+    """Test ledger writes and the rating-history endpoint"""
+
+    def test_match_results_are_recorded(self, client, league):
+        """Each result appends before/after, delta and K-factor for both players"""
+        event_id, (ana, bia, caio) = league
+        match_id = _report(client, event_id, ana, bia, ana)
+        # Result set later through update
+        pending = client.post("/matches", json={
+            "event_id": event_id, "player1_id": ana, "player2_id": caio,
+        }).json()["id"]
+        client.put(f"/matches/{pending}", json={"winner_id": caio})
+
+        history = client.get(f"/players/{ana}/rating-history").json()
+        assert history["total_points"] == 2
+        first, second = history["points"]
+        assert first["match_id"] == match_id
+        assert first["reason"] == "match"
+        assert first["rating_before"] == INITIAL_RATING
+        assert first["k_factor"] == 32
+        assert first["delta"] == pytest.approx(first["rating_after"] - first["rating_before"])
+        assert second["match_id"] == pending
+        assert second["rating_before"] == first["rating_after"]
+        assert second["rating_after"] == client.get(f"/players/{ana}").json()["elo_rating"]
+
+        loser = client.get(f"/players/{bia}/rating-history").json()["points"][0]
+        assert loser["delta"] < 0
+
+    def test_replay_appends_corrections(self, client, league):
+        """Deleting a result keeps the ledger and appends a replay correction"""
+        event_id, (ana, bia, _) = league
+        match_id = _report(client, event_id, ana, bia, ana)
+        client.delete(f"/matches/{match_id}")
+
+        points = client.get(f"/players/{ana}/rating-history").json()["points"]
+        assert [p["reason"] for p in points] == ["match", "replay"]
+        assert points[-1]["match_id"] is None
+        assert points[-1]["rating_after"] == INITIAL_RATING
+
+    def test_downsampling_keeps_first_and_last(self, client, db_session, league):
+        """Large histories are reduced to the requested number of points"""
+        from models import RatingHistory
+
+        event_id, (ana, _, _) = league
+        db_session.add_all([
+            RatingHistory(player_id=ana, event_id=event_id, match_id=i, rating_before=1200.0 + i,
+                          rating_after=1201.0 + i, delta=1.0, k_factor=32)
+            for i in range(1000)
+        ])
+        db_session.commit()
+
+        history = client.get(f"/players/{ana}/rating-history?points=50").json()
+        assert history["total_points"] == 1000
+        points = history["points"]
+        assert 2 <= len(points) <= 50
+        assert points[0]["match_id"] == 0
+        assert points[-1]["match_id"] == 999
+        assert [p["id"] for p in points] == sorted(p["id"] for p in points)
+
+    def test_rating_history_unknown_player(self, client):
+        response = client.get("/players/999/rating-history")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_rating_history_points_validation(self, client, league):
+        _, (ana, _, _) = league
+        response = client.get(f"/players/{ana}/rating-history?points=1")
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,66 @@
+"""Unit tests for the read/write session routing of database.get_db"""
+import asyncio
+
+import pytest
+from fastapi import Request, status
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+import database
+from models import Match
+
+
+def _request(method):
+    return Request({"type": "http", "method": method, "headers": [], "query_string": b""})
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    """Tag the sessions of each pool (no connection is opened)"""
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(info={"pool": "read"}))
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(info={"pool": "write"}))
+    monkeypatch.setattr(database, "AsyncReadSessionLocal", async_sessionmaker(info={"pool": "read"}))
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(info={"pool": "write"}))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("method, pool", [
+    ("GET", "read"), ("HEAD", "read"), ("POST", "write"), ("PUT", "write"), ("DELETE", "write"),
+])
+def test_requests_are_routed_by_method(pools, method, pool):
+    sessions = database.get_db(_request(method))
+    assert next(sessions).info["pool"] == pool
+    sessions.close()
+
+    async def async_pool():
+        sessions = database.get_async_db(_request(method))
+        db = await sessions.__anext__()
+        await sessions.aclose()
+        return db.info["pool"]
+
+    assert asyncio.run(async_pool()) == pool
+
+
+@pytest.mark.unit
+def test_read_pool_refuses_writes_and_doesnt_block_them(client, db_session, league):
+    event_id, (ana, bia, _) = league
+    path = db_session.get_bind().url.database
+    read_engine = create_engine(f"sqlite:///{path}")
+    database.configure_sqlite(read_engine, {**database.sqlite_pragmas("performance"), "query_only": "ON"})
+    try:
+        with sessionmaker(bind=read_engine)() as reader:
+            with pytest.raises(OperationalError, match="readonly"):
+                reader.execute(text("DELETE FROM matches"))
+            reader.rollback()
+
+            # A reader holding its connection (a long report) while a result is written
+            assert reader.scalar(select(func.count()).select_from(Match)) == 0
+            response = client.post(
+                "/matches", json={"event_id": event_id, "player1_id": ana, "player2_id": bia, "winner_id": ana}
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+            assert reader.scalar(select(func.count()).select_from(Match)) == 1
+    finally:
+        read_engine.dispose()